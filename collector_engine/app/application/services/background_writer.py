@@ -0,0 +1,111 @@
+import asyncio
+import functools
+from collections import deque
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from types import TracebackType
+from typing import Self
+
+from collector_engine.app.application.services.flush_buffer import flush_buffer
+from collector_engine.app.domain.ports.out import DatasetStore, SpillLog
+from collector_engine.app.domain.pure.column_buffer import ColumnBuffer
+from collector_engine.app.domain.pure.flush_policy import ROWS_ONLY, FlushPolicy
+
+
+class BackgroundWriter:
+    """
+    Runs flush_buffer (Arrow conversion, sorting, zstd encoding, file write) on a
+    dedicated writer thread so the event loop keeps serving in-flight RPCs.
+
+    - flush(): same arguments and thresholds as flush_buffer; a full buffer is handed
+      off to the writer thread and a new empty buffer is returned right away,
+    - at most `max_pending` handed-off buffers are queued, flush() waits for a slot;
+      with a byte based FlushPolicy memory stays below (max_pending + 1) buffers,
+    - files are written one at a time in submission order, so resume points stay
+      consistent; a failed write is raised from the next flush() / drain(),
+    - drain(): flush barrier, returns once every queued file is written,
+    - spill (optional): the write-ahead spill of the buffer is checkpointed at hand-off
+      and released on the writer thread only after the file is committed.
+
+    Use as `async with BackgroundWriter() as writer:`; leaving the block drains.
+    """
+
+    def __init__(self, *, max_pending: int = 2):
+        if max_pending < 1:
+            raise ValueError("max_pending must be >= 1")
+        self._max_pending = max_pending
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="parquet-writer")
+        self._pending: deque[asyncio.Future[ColumnBuffer]] = deque()
+
+    async def __aenter__(self) -> Self:
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        try:
+            if exc is None:
+                await self.drain()
+            else:
+                # let queued files land, the original error wins over write errors
+                await asyncio.gather(*self._pending, return_exceptions=True)
+                self._pending.clear()
+        finally:
+            self._executor.shutdown(wait=True)
+
+    async def flush(
+        self,
+        *,
+        buffer: ColumnBuffer,
+        store: DatasetStore,
+        rows_per_file: int,
+        force: bool,
+        file_prefix: str,
+        block_field: str,
+        index_field: str | None = None,
+        policy: FlushPolicy = ROWS_ONLY,
+        spill: SpillLog | None = None,
+    ) -> ColumnBuffer:
+        """Non-blocking flush_buffer: returns the buffer to keep filling."""
+        if len(buffer) == 0 or not (
+            force or policy.should_flush(buffer, rows_per_file=rows_per_file)
+        ):
+            return buffer
+
+        await self._wait(self._max_pending - 1)
+
+        write = functools.partial(
+            flush_buffer,
+            buffer=buffer,
+            store=store,
+            rows_per_file=rows_per_file,
+            force=force,
+            file_prefix=file_prefix,
+            block_field=block_field,
+            index_field=index_field,
+            policy=policy,
+        )
+        job: Callable[[], ColumnBuffer] = write
+        if spill is not None:
+            job = functools.partial(_write_and_release, write, spill, spill.checkpoint())
+        self._pending.append(asyncio.get_running_loop().run_in_executor(self._executor, job))
+        return buffer.empty()
+
+    async def drain(self) -> None:
+        """Wait until every handed-off buffer is written; raises the first write error."""
+        await self._wait(0)
+
+    async def _wait(self, limit: int) -> None:
+        while len(self._pending) > limit:
+            await self._pending.popleft()
+
+
+def _write_and_release(
+    write: Callable[[], ColumnBuffer], spill: SpillLog, segment: int
+) -> ColumnBuffer:
+    out = write()
+    spill.release(segment)
+    return out
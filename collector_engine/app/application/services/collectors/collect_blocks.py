@@ -1,38 +1,15 @@
-import pyarrow.compute as pc
 from loguru import logger
 from typing import Any
 
-from collector_engine.app.domain.ports.out import EvmReader, DatasetStore
+from collector_engine.app.domain.ports.out import EvmReader, DatasetStore, SpillLog
 from collector_engine.app.domain.pure.block_ranges import block_ranges
 from collector_engine.app.domain.pure.blocks_timestamps import write_blocks_to_buffer
-from collector_engine.app.domain.pure.buffer_utils import rows_to_column_buffer
+from collector_engine.app.domain.pure.column_buffer import ColumnBuffer
+from collector_engine.app.domain.pure.flush_policy import FlushPolicy
 from collector_engine.app.infrastructure.parquet.schema import BLOCK_SCHEMA
-from collector_engine.app.infrastructure.parquet.constants import ROWS_PER_FILE
-from collector_engine.app.application.services.flush_buffer import flush_buffer
-
-
-TO_BLOCK_IDX = 1
-
-
-async def get_latest_block_from_store(store: DatasetStore) -> int | None:
-    """Get latest block number from Parquet store for blocks."""
-    f_names = store.list_names()
-
-    if not f_names:
-        return None
-
-    sorted_names = sorted(
-        f_names,
-        key=lambda f: int(f.split("_")[TO_BLOCK_IDX].removesuffix(".parquet")),
-    )
-    table = store.read_table(sorted_names[-1])
-    col = table["block_number"]
-    max_scalar = pc.max(col)
-
-    if max_scalar is None:
-        return None
-
-    return int(max_scalar.as_py())
+from collector_engine.app.infrastructure.parquet.constants import FLUSH_POLICIES, ROWS_PER_FILE
+from collector_engine.app.application.services.background_writer import BackgroundWriter
+from collector_engine.app.application.services.prefetch import prefetch_ordered
 
 
 async def collect_blocks(
@@ -42,10 +19,26 @@ async def collect_blocks(
     store: DatasetStore,
     batch_size: int = 1000,
     rows_per_file: int = ROWS_PER_FILE,
+    flush_policy: FlushPolicy | None = None,
+    prefetch: int = 2,
+    spill: SpillLog | None = None,
 ) -> None:
-    """Collect blocks for a given chain into a Parquet dataset."""
-    latest_stored_block = await get_latest_block_from_store(store)
+    """
+    Collect blocks for a given chain into a Parquet dataset.
+
+    Up to `prefetch` upcoming ranges are requested while the current one is normalized
+    and flushed; results are still committed in block order.
+
+    With spill set, ranges are spilled before they are buffered and a restart resumes
+    from the spill (see collect_logs).
+    """
+    latest_stored_block = store.max_block()
     from_block = 0 if latest_stored_block is None else latest_stored_block + 1
+    recovered: list[dict[str, Any]] = []
+    if spill is not None:
+        recovered, spilled_to = spill.replay(latest_stored_block)
+        if spilled_to is not None:
+            from_block = max(from_block, spilled_to + 1)
     to_block = await reader.latest_block_number()
 
     logger.info(
@@ -56,42 +49,60 @@ async def collect_blocks(
         latest_stored_block,
     )
 
-    buffer: dict[str, list] = {name: [] for name in BLOCK_SCHEMA.names}
-
-    for from_, to_ in block_ranges(from_block, to_block, batch_size):
-        blocks = await reader.get_blocks_range(from_block=from_, to_block=to_)
-
-        if not blocks:
-            logger.info("No blocks in range [{} - {}], skipping", from_, to_)
-            continue
-
-        rows: list[dict[str, Any]] = write_blocks_to_buffer(chain_id, list(blocks))
-        buffer = rows_to_column_buffer(rows, list(BLOCK_SCHEMA.names), buffer)
-        logger.info("Collected blocks in range [{} - {}]", from_, to_)
-        buffer = flush_buffer(
+    policy = flush_policy or FLUSH_POLICIES["blocks"]
+    buffer = ColumnBuffer(BLOCK_SCHEMA)
+    if recovered:
+        logger.info(
+            "Recovered {} spilled blocks, resuming from block {}", len(recovered), from_block
+        )
+        buffer.extend(recovered)
+
+    async with BackgroundWriter() as writer:
+        try:
+            async for (from_, to_), blocks in prefetch_ordered(
+                block_ranges(from_block, to_block, batch_size),
+                lambda r: reader.get_blocks_range(from_block=r[0], to_block=r[1]),
+                depth=prefetch,
+            ):
+                if not blocks:
+                    logger.info("No blocks in range [{} - {}], skipping", from_, to_)
+                    if spill is not None:
+                        spill.append([], to_block=to_)
+                    continue
+
+                rows: list[dict[str, Any]] = write_blocks_to_buffer(chain_id, list(blocks))
+                if spill is not None:
+                    spill.append(rows, to_block=to_)
+                buffer.extend(rows)
+                logger.info("Collected blocks in range [{} - {}]", from_, to_)
+                buffer = await writer.flush(
+                    buffer=buffer,
+                    store=store,
+                    rows_per_file=rows_per_file,
+                    force=False,
+                    policy=policy,
+                    file_prefix="blocks",
+                    block_field="block_number",
+                    index_field="block_number",
+                    spill=spill,
+                )
+        finally:
+            if spill is not None:
+                spill.close()  # a segment of empty ranges only is never checkpointed
+
+        buffer = await writer.flush(
             buffer=buffer,
             store=store,
             rows_per_file=rows_per_file,
-            force=False,
-            schema=BLOCK_SCHEMA,
+            force=True,
             file_prefix="blocks",
             block_field="block_number",
             index_field="block_number",
+            spill=spill,
         )
 
-    buffer = flush_buffer(
-        buffer=buffer,
-        store=store,
-        rows_per_file=rows_per_file,
-        force=True,
-        schema=BLOCK_SCHEMA,
-        file_prefix="blocks",
-        block_field="block_number",
-        index_field="block_number",
-    )
-
     logger.info(
         "Finished blocks collection for chain {}. Last block stored: {}",
         chain_id,
-        await get_latest_block_from_store(store),
+        store.max_block(),
     )
@@ -1,38 +1,135 @@
-import pyarrow.compute as pc
-from loguru import logger
+from collections.abc import AsyncIterator, Iterator, Sequence
 from typing import Any
-from collector_engine.app.infrastructure.registry.schemas import ContractInfo
-from collector_engine.app.domain.ports.out import EvmReader, DatasetStore
-from collector_engine.app.domain.pure.block_ranges import block_ranges
+
+from loguru import logger
+
+from collector_engine.app.application.services.background_writer import BackgroundWriter
+from collector_engine.app.application.services.prefetch import prefetch_ordered
+from collector_engine.app.application.services.streaming import (
+    FileCommitted,
+    HashBatch,
+    StreamQueue,
+)
+from collector_engine.app.domain.ports.out import DatasetStore, EvmReader, SpillLog
+from collector_engine.app.domain.pure.block_window import (
+    AdaptiveBlockWindow,
+    is_result_limit_error,
+)
+from collector_engine.app.domain.pure.column_buffer import ColumnBuffer
+from collector_engine.app.domain.pure.flush_policy import FlushPolicy
 from collector_engine.app.domain.pure.logs import write_logs_to_buffer
-from collector_engine.app.domain.pure.buffer_utils import rows_to_column_buffer
+from collector_engine.app.infrastructure.parquet.constants import FLUSH_POLICIES, ROWS_PER_FILE
 from collector_engine.app.infrastructure.parquet.schema import LOG_SCHEMA
-from collector_engine.app.infrastructure.parquet.constants import ROWS_PER_FILE
-from collector_engine.app.application.services.flush_buffer import flush_buffer
+from collector_engine.app.infrastructure.registry.schemas import ContractInfo
 
+WINDOW_PROFILE_KEY = "logs_window"
 
-TO_BLOCK_IDX = 1
 
+def load_window(
+    store: DatasetStore,
+    *,
+    key: str = WINDOW_PROFILE_KEY,
+    batch_size: int,
+    adaptive: bool,
+    max_batch_size: int,
+    target_results: int,
+) -> AdaptiveBlockWindow:
+    """
+    Build the get_logs window, starting from the stored density profile if any: the last
+    window size, capped to the blocks expected to hold target_results logs (the last window
+    may have grown over a sparse stretch, or target_results may have changed since).
+    """
+    if not adaptive:
+        return AdaptiveBlockWindow(size=batch_size, min_size=batch_size, max_size=batch_size)
+
+    profile = store.read_metadata(key) or {}
+    size = int(profile.get("window", batch_size))
+    if profile.get("logs_per_block"):
+        size = min(size, int(target_results / profile["logs_per_block"]))
+    return AdaptiveBlockWindow(
+        size=size,
+        max_size=max_batch_size,
+        target_results=target_results,
+    )
 
-async def get_latest_block_from_store(store: DatasetStore) -> int | None:
-    """Get latest block number from store."""
-    f_names = store.list_names()
 
-    if not f_names:
-        return None
+async def _get_logs_bisecting(
+    reader: EvmReader,
+    address: bytes | Sequence[bytes],
+    from_: int,
+    to_: int,
+    window: AdaptiveBlockWindow,
+) -> list[Any]:
+    """get_logs for [from_, to_]; on a provider result-limit error split the range in halves."""
+    blocks = to_ - from_ + 1
+    try:
+        logs = list(await reader.get_logs(address=address, from_block=from_, to_block=to_))
+    except Exception as exc:
+        if not (is_result_limit_error(str(exc)) and window.can_shrink(blocks)):
+            raise
+    else:
+        window.on_success(blocks, len(logs))
+        return logs
 
-    sorted_names = sorted(
-        f_names,
-        key=lambda f: int(f.split("_")[TO_BLOCK_IDX].removesuffix(".parquet")),
+    window.on_limit_error(blocks)
+    logger.warning(
+        "get_logs range [{} - {}] over provider limit, bisecting (window={})",
+        from_,
+        to_,
+        window.size,
     )
-    table = store.read_table(sorted_names[-1])
-    col = table["block_number"]
-    max_scalar = pc.max(col)
+    mid = from_ + blocks // 2 - 1
+    left = await _get_logs_bisecting(reader, address, from_, mid, window)
+    right = await _get_logs_bisecting(reader, address, mid + 1, to_, window)
+    return left + right
+
 
-    if max_scalar is None:
-        return None
+async def iter_log_ranges(
+    *,
+    reader: EvmReader,
+    address: bytes | Sequence[bytes],
+    from_block: int,
+    to_block: int,
+    window: AdaptiveBlockWindow,
+    prefetch: int = 0,
+) -> AsyncIterator[tuple[int, int, Sequence[Any]]]:
+    """
+    Yield (from_, to_, logs) for consecutive get_logs ranges covering [from_block, to_block],
+    in block order. The range size follows `window`; provider result-limit errors bisect
+    the range. Up to `prefetch` upcoming ranges are fetched while the caller processes
+    the current one.
+    """
+
+    def ranges() -> Iterator[tuple[int, int]]:
+        current = from_block
+        while current <= to_block:
+            from_, to_ = window.range_from(current, to_block)
+            yield from_, to_
+            current = to_ + 1
 
-    return int(max_scalar.as_py())
+    async for (from_, to_), logs in prefetch_ordered(
+        ranges(),
+        lambda r: _get_logs_bisecting(reader, address, r[0], r[1], window),
+        depth=prefetch,
+    ):
+        yield from_, to_, logs
+
+
+def save_window(
+    store: DatasetStore,
+    window: AdaptiveBlockWindow,
+    *,
+    blocks: int,
+    logs: int,
+    key: str = WINDOW_PROFILE_KEY,
+) -> None:
+    """Persist the density profile so the next run starts with a good window size."""
+    if blocks == 0:
+        return
+    store.write_metadata(
+        key,
+        {"window": window.size, "logs_per_block": logs / blocks},
+    )
 
 
 async def collect_logs(
@@ -43,64 +140,137 @@ async def collect_logs(
     store: DatasetStore,
     batch_size: int = 1000,
     rows_per_file: int = ROWS_PER_FILE,
+    flush_policy: FlushPolicy | None = None,
+    adaptive: bool = True,
+    max_batch_size: int = 50_000,
+    target_results: int = 5_000,
+    hash_queue: StreamQueue | None = None,
+    prefetch: int = 2,
+    spill: SpillLog | None = None,
 ) -> None:
-    """Collect logs for a specific contract."""
-    latest_stored_block = await get_latest_block_from_store(store)
-    from_block = (  # noqa: F841
+    """
+    Collect logs for a specific contract.
+
+    With adaptive=True batch_size is only the initial get_logs window: it grows while
+    responses are small, is bisected on provider result-limit errors and is remembered
+    per contract in the store metadata.
+
+    With hash_queue set (streaming pipeline) the unique tx hashes of every range are
+    put on the queue as soon as they are buffered, followed by FileCommitted once each
+    logs file is written and None at the end.
+
+    Up to `prefetch` upcoming ranges are requested while the current one is normalized
+    and flushed; results are still committed in block order.
+
+    With spill set every normalized range is spilled (write-ahead) before it enters the
+    buffer; a restart rebuilds the buffer from the spill and resumes after the last
+    spilled range instead of the last committed file.
+    """
+
+    policy = flush_policy or FLUSH_POLICIES["logs"]
+
+    async def _flush(writer: BackgroundWriter, buffer: ColumnBuffer, force: bool) -> ColumnBuffer:
+        buffered = len(buffer)
+        buffer = await writer.flush(
+            buffer=buffer,
+            store=store,
+            rows_per_file=rows_per_file,
+            force=force,
+            file_prefix="logs",
+            block_field="block_number",
+            index_field="log_index",
+            policy=policy,
+            spill=spill,
+        )
+        if hash_queue is not None and buffered and not len(buffer):
+            # downstream files are named after this one: signal once it is written
+            await writer.drain()
+            await hash_queue.put(FileCommitted())
+        return buffer
+
+    latest_stored_block = store.max_block()
+    from_block = (
         contract_info.genesis_block if latest_stored_block is None else latest_stored_block + 1
     )
+    recovered: list[dict[str, Any]] = []
+    if spill is not None:
+        recovered, spilled_to = spill.replay(latest_stored_block)
+        if spilled_to is not None:
+            from_block = max(from_block, spilled_to + 1)
     to_block = await reader.latest_block_number()
 
+    window = load_window(
+        store,
+        batch_size=batch_size,
+        adaptive=adaptive,
+        max_batch_size=max_batch_size,
+        target_results=target_results,
+    )
+
     logger.info(
-        "Starting logs collection for {} on chain {} (from_block={}, to_block={}, resume_from={})",
+        "Starting logs collection for {} on chain {} "
+        "(from_block={}, to_block={}, resume_from={}, window={})",
         contract_info.name,
         chain_id,
         from_block,
         to_block,
         latest_stored_block,
+        window.size,
     )
 
-    buffer: dict[str, list] = {name: [] for name in LOG_SCHEMA.names}
+    buffer = ColumnBuffer(LOG_SCHEMA)
+    if recovered:
+        logger.info("Recovered {} spilled logs, resuming from block {}", len(recovered), from_block)
+        buffer.extend(recovered)
+        if hash_queue is not None:
+            hashes = list(dict.fromkeys(r["transaction_hash"] for r in recovered))
+            await hash_queue.put(HashBatch(hashes))
+    scanned_blocks = 0
+    scanned_logs = 0
 
-    for from_, to_ in block_ranges(from_block, to_block, batch_size):
-        logs = await reader.get_logs(
-            address=contract_info.address,
-            from_block=from_,
-            to_block=to_,
-        )
+    async with BackgroundWriter() as writer:
+        try:
+            async for from_, to_, logs in iter_log_ranges(
+                reader=reader,
+                address=contract_info.address,
+                from_block=from_block,
+                to_block=to_block,
+                window=window,
+                prefetch=prefetch,
+            ):
+                scanned_blocks += to_ - from_ + 1
+                scanned_logs += len(logs)
 
-        if not logs:
-            logger.info("No logs in range [{} - {}], skipping", from_, to_)
-            continue
+                if not logs:
+                    logger.info("No logs in range [{} - {}], skipping", from_, to_)
+                    if spill is not None:
+                        spill.append([], to_block=to_)
+                    continue
 
-        rows: list[dict[str, Any]] = write_logs_to_buffer(chain_id, list(logs))
-        buffer = rows_to_column_buffer(rows, list(LOG_SCHEMA.names), buffer)
+                rows: list[dict[str, Any]] = write_logs_to_buffer(chain_id, list(logs))
+                if spill is not None:
+                    spill.append(rows, to_block=to_)
+                buffer.extend(rows)
 
-        buffer = flush_buffer(
-            buffer=buffer,
-            store=store,
-            rows_per_file=rows_per_file,
-            force=False,
-            schema=LOG_SCHEMA,
-            file_prefix="logs",
-            block_field="block_number",
-            index_field="log_index",
-        )
+                if hash_queue is not None:
+                    hashes = list(dict.fromkeys(r["transaction_hash"] for r in rows))
+                    await hash_queue.put(HashBatch(hashes))
 
-    buffer = flush_buffer(
-        buffer=buffer,
-        store=store,
-        rows_per_file=rows_per_file,
-        force=True,
-        schema=LOG_SCHEMA,
-        file_prefix="logs",
-        block_field="block_number",
-        index_field="log_index",
-    )
+                buffer = await _flush(writer, buffer, force=False)
+        finally:
+            if adaptive:
+                save_window(store, window, blocks=scanned_blocks, logs=scanned_logs)
+            if spill is not None:
+                spill.close()  # a segment of empty ranges only is never checkpointed
+
+        buffer = await _flush(writer, buffer, force=True)
+
+    if hash_queue is not None:
+        await hash_queue.put(None)
 
     logger.info(
         "Finished logs collection for {} on chain {}. Last block stored: {}",
         contract_info.name,
         chain_id,
-        await get_latest_block_from_store(store),
+        store.max_block(),
     )
@@ -0,0 +1,183 @@
+from typing import Any
+
+from loguru import logger
+
+from collector_engine.app.application.services.background_writer import BackgroundWriter
+from collector_engine.app.application.services.collectors.collect_logs import (
+    iter_log_ranges,
+    load_window,
+    save_window,
+)
+from collector_engine.app.domain.ports.out import DatasetStore, EvmReader
+from collector_engine.app.domain.pure.column_buffer import ColumnBuffer
+from collector_engine.app.domain.pure.flush_policy import FlushPolicy
+from collector_engine.app.domain.pure.logs import write_logs_to_buffer
+from collector_engine.app.infrastructure.parquet.constants import FLUSH_POLICIES, ROWS_PER_FILE
+from collector_engine.app.infrastructure.parquet.schema import LOG_SCHEMA
+from collector_engine.app.infrastructure.registry.schemas import ContractInfo
+
+CHECKPOINT_KEY = "logs_checkpoint"
+PROTOCOL_WINDOW_PROFILE_KEY = "protocol_logs_window"
+
+
+def _resume_block(contract_info: ContractInfo, store: DatasetStore) -> int:
+    """
+    First block still to scan for a contract: after the newest stored log or after
+    the last range a protocol scan fully committed for it, whichever is later.
+    """
+    latest_stored_block = store.max_block()
+    checkpoint = (store.read_metadata(CHECKPOINT_KEY) or {}).get("scanned_to")
+
+    candidates = [b for b in (latest_stored_block, checkpoint) if b is not None]
+    if not candidates:
+        return contract_info.genesis_block
+    return max(max(candidates) + 1, contract_info.genesis_block)
+
+
+def _segments(starts: dict[str, int], to_block: int) -> list[tuple[int, int, list[str]]]:
+    """
+    Split [min(start), to_block] into segments with a constant set of active contracts.
+    A contract is active from its own resume block on.
+    """
+    bounds = sorted({b for b in starts.values() if b <= to_block})
+    out: list[tuple[int, int, list[str]]] = []
+    for i, seg_from in enumerate(bounds):
+        seg_to = bounds[i + 1] - 1 if i + 1 < len(bounds) else to_block
+        active = [name for name, start in starts.items() if start <= seg_from]
+        out.append((seg_from, seg_to, active))
+    return out
+
+
+async def _flush(
+    writer: BackgroundWriter,
+    buffer: ColumnBuffer,
+    store: DatasetStore,
+    rows_per_file: int,
+    force: bool,
+    policy: FlushPolicy,
+) -> ColumnBuffer:
+    return await writer.flush(
+        buffer=buffer,
+        store=store,
+        rows_per_file=rows_per_file,
+        force=force,
+        file_prefix="logs",
+        block_field="block_number",
+        index_field="log_index",
+        policy=policy,
+    )
+
+
+async def collect_protocol_logs(
+    *,
+    chain_id: int,
+    contracts: list[ContractInfo],
+    reader: EvmReader,
+    stores: dict[str, DatasetStore],
+    batch_size: int = 1000,
+    rows_per_file: int = ROWS_PER_FILE,
+    flush_policy: FlushPolicy | None = None,
+    max_batch_size: int = 50_000,
+    target_results: int = 5_000,
+    prefetch: int = 2,
+) -> None:
+    """
+    Collect logs for all contracts of a protocol with one eth_getLogs address-array
+    query per block range, routing each log by address into its contract's store.
+
+    - stores: contract name -> logs DatasetStore
+    - resume points are kept per contract, a contract joins the scan at its own
+      resume block; ranges use the adaptive window and prefetching from collect_logs.
+    """
+    names = {c.name for c in contracts}
+    if names - stores.keys():
+        raise ValueError(f"Missing logs stores for contracts: {sorted(names - stores.keys())}")
+
+    routes: dict[bytes, str] = {c.address: c.name for c in contracts}
+    starts = {c.name: _resume_block(c, stores[c.name]) for c in contracts}
+    to_block = await reader.latest_block_number()
+
+    window_store = stores[contracts[0].name]
+    window = load_window(
+        window_store,
+        key=PROTOCOL_WINDOW_PROFILE_KEY,
+        batch_size=batch_size,
+        adaptive=True,
+        max_batch_size=max_batch_size,
+        target_results=target_results,
+    )
+
+    logger.info(
+        "Starting protocol logs collection for {} contracts on chain {} "
+        "(resume_from={}, to_block={}, window={})",
+        len(contracts),
+        chain_id,
+        starts,
+        to_block,
+        window.size,
+    )
+
+    policy = flush_policy or FLUSH_POLICIES["logs"]
+    buffers = {c.name: ColumnBuffer(LOG_SCHEMA) for c in contracts}
+    scanned_blocks = 0
+    scanned_logs = 0
+
+    async with BackgroundWriter() as writer:
+        try:
+            for seg_from, seg_to, active in _segments(starts, to_block):
+                addresses = [c.address for c in contracts if c.name in active]
+                async for from_, to_, logs in iter_log_ranges(
+                    reader=reader,
+                    address=addresses,
+                    from_block=seg_from,
+                    to_block=seg_to,
+                    window=window,
+                    prefetch=prefetch,
+                ):
+                    scanned_blocks += to_ - from_ + 1
+                    scanned_logs += len(logs)
+
+                    if not logs:
+                        logger.info("No logs in range [{} - {}], skipping", from_, to_)
+                        continue
+
+                    rows_by_contract: dict[str, list[dict[str, Any]]] = {}
+                    for row in write_logs_to_buffer(chain_id, list(logs)):
+                        name = routes.get(row["address"])
+                        if name is None:
+                            logger.warning(
+                                "Skipping log from unexpected address 0x{}", row["address"].hex()
+                            )
+                            continue
+                        rows_by_contract.setdefault(name, []).append(row)
+
+                    for name, rows in rows_by_contract.items():
+                        buffers[name].extend(rows)
+                        buffers[name] = await _flush(
+                            writer, buffers[name], stores[name], rows_per_file, False, policy
+                        )
+        finally:
+            save_window(
+                window_store,
+                window,
+                blocks=scanned_blocks,
+                logs=scanned_logs,
+                key=PROTOCOL_WINDOW_PROFILE_KEY,
+            )
+
+        for c in contracts:
+            buffers[c.name] = await _flush(
+                writer, buffers[c.name], stores[c.name], rows_per_file, True, policy
+            )
+
+    # checkpoints only once every file is on disk
+    for c in contracts:
+        if starts[c.name] <= to_block:
+            stores[c.name].write_metadata(CHECKPOINT_KEY, {"scanned_to": to_block})
+
+    logger.info(
+        "Finished protocol logs collection for {} contracts on chain {} up to block {}",
+        len(contracts),
+        chain_id,
+        to_block,
+    )
@@ -1,36 +1,29 @@
 from typing import Any
 from loguru import logger
-import pyarrow.compute as pc
 
 from collector_engine.app.infrastructure.registry.schemas import ContractInfo
 from collector_engine.app.domain.ports.out import EvmReader, DatasetStore
-from collector_engine.app.infrastructure.parquet.constants import ROWS_PER_FILE
+from collector_engine.app.infrastructure.parquet.constants import FLUSH_POLICIES, ROWS_PER_FILE
 from collector_engine.app.infrastructure.parquet.schema import RECEIPT_SCHEMA
-from collector_engine.app.domain.pure.buffer_utils import rows_to_column_buffer
+from collector_engine.app.domain.pure.column_buffer import ColumnBuffer
+from collector_engine.app.domain.pure.derived_files import hashes_by_block, pending_inputs
+from collector_engine.app.domain.pure.flush_policy import FlushPolicy
 from collector_engine.app.domain.pure.receipts import write_receipts_to_buffer
-from collector_engine.app.application.services.flush_buffer import flush_buffer
+from collector_engine.app.application.services.background_writer import BackgroundWriter
+from collector_engine.app.application.services.streaming import (
+    FileCommitted,
+    HashBatch,
+    StreamQueue,
+)
 
 
-def _get_tx_files_to_process(
-    tx_names: list[str],
-    receipt_names: list[str],
-) -> list[str]:
-    """
-    Returns a list of txs_*.parquet files for which there are no corresponding
-    receipts_*.parquet.
-    """
-    processed_suffixes = {
-        name.removeprefix("receipts_").removesuffix(".parquet")
-        for name in receipt_names
-        if name.endswith(".parquet")
-    }
-
-    return [
-        name
-        for name in tx_names
-        if name.endswith(".parquet")
-        and name.removeprefix("txs_").removesuffix(".parquet") not in processed_suffixes
-    ]
+async def _fetch_receipt_rows(
+    chain_id: int, reader: EvmReader, hashes: list[bytes]
+) -> list[dict[str, Any]]:
+    receipts = await reader.get_receipts(hashes)
+    if not receipts:
+        return []
+    return write_receipts_to_buffer(chain_id, list(receipts))
 
 
 async def collect_receipts(
@@ -41,11 +34,16 @@ async def collect_receipts(
     tx_store: DatasetStore,
     receipts_store: DatasetStore,
     batch_size: int = 100,
-    rows_per_file: int = ROWS_PER_FILE,
+    flush_policy: FlushPolicy | None = None,
 ) -> None:
     """
     For collected txs_*.parquet files, fetch corresponding receipts and store them.
+
+    As for transactions, the receipts of one txs file are written as one file or, past
+    the receipts flush policy, as pieces cut on block boundaries inside its FROM_TO range.
     """
+    policy = flush_policy or FLUSH_POLICIES["receipts"]
+
     logger.info(
         "Starting receipts collection for {} on chain {}",
         contract_info.name,
@@ -69,7 +67,7 @@ async def collect_receipts(
         )
         return
 
-    files_to_process = _get_tx_files_to_process(tx_names, receipt_names)
+    files_to_process = pending_inputs(tx_names, "txs", receipt_names, "receipts")
 
     if not files_to_process:
         logger.info(
@@ -86,62 +84,92 @@ async def collect_receipts(
         len(files_to_process),
     )
 
-    buffer: dict[str, list] = {name: [] for name in RECEIPT_SCHEMA.names}
+    buffer = ColumnBuffer(RECEIPT_SCHEMA)
 
-    for name in sorted(files_to_process):
-        logger.info("Processing tx parquet file: {}", name)
+    async with BackgroundWriter() as writer:
+        for name, done_to in files_to_process:
+            logger.info("Processing tx parquet file: {} (after={})", name, done_to)
 
-        table = tx_store.read_table(name)  # pyarrow.Table
+            table = tx_store.read_table(name, columns=["block_number", "hash"])
+            hashes, blocks = hashes_by_block(table, "hash", after=done_to)
 
-        hashes_col = table["hash"]
-        unique_hashes_arr = pc.unique(hashes_col)
-        hashes: list[bytes] = [val.as_py() for val in unique_hashes_arr]
+            logger.info(
+                "File {} has {} unique transaction hashes, batch_size={}",
+                name,
+                len(hashes),
+                batch_size,
+            )
 
-        logger.info(
-            "File {} has {} unique transaction hashes, batch_size={}",
-            name,
-            len(hashes),
-            batch_size,
-        )
+            for i in range(0, len(hashes), batch_size):
+                chunk_hashes = hashes[i : i + batch_size]
+                rows = await _fetch_receipt_rows(chain_id, reader, chunk_hashes)
+                if rows:
+                    buffer.extend(rows)
 
-        _hashes_len = len(hashes)
-        for i in range(0, len(hashes), batch_size):
-            chunk_hashes = hashes[i : i + batch_size]
-            receipts = await reader.get_receipts(chunk_hashes)
-
-            if not receipts:
-                continue
-
-            rows: list[dict[str, Any]] = write_receipts_to_buffer(chain_id, list(receipts))
-            buffer = rows_to_column_buffer(rows, list(RECEIPT_SCHEMA.names), buffer)
-
-            _hashes_len = _hashes_len - len(chunk_hashes)
-            logger.info("Chunk processed, left {} hashes for file {}.", _hashes_len, name)
-
-            buffer = flush_buffer(
-                buffer=buffer,
-                store=receipts_store,
-                rows_per_file=rows_per_file,
-                force=False,
-                schema=RECEIPT_SCHEMA,
-                file_prefix="receipts",
-                block_field="block_number",
-                index_field="transaction_index",
-            )
+                left = len(hashes) - i - len(chunk_hashes)
+                logger.info("Chunk processed, left {} hashes for file {}.", left, name)
 
-        buffer = flush_buffer(
-            buffer=buffer,
-            store=receipts_store,
-            rows_per_file=rows_per_file,
-            force=True,
-            schema=RECEIPT_SCHEMA,
-            file_prefix="receipts",
-            block_field="block_number",
-            index_field="transaction_index",
-        )
+                if left and blocks[-left] != blocks[-left - 1]:  # never split a block
+                    buffer = await _flush(writer, buffer, receipts_store, policy, force=False)
+
+            buffer = await _flush(writer, buffer, receipts_store, policy, force=True)
 
     logger.info(
         "Finished receipts collection for {} on chain {}.",
         contract_info.name,
         chain_id,
     )
+
+
+async def stream_receipts(
+    *,
+    chain_id: int,
+    reader: EvmReader,
+    receipts_store: DatasetStore,
+    inbox: StreamQueue,
+    batch_size: int = 100,
+    flush_policy: FlushPolicy | None = None,
+) -> None:
+    """
+    Streaming counterpart of collect_receipts.
+
+    Fetches receipts for every HashBatch from `inbox` as it arrives. The buffer is
+    written on FileCommitted (a txs file was written) and, past the receipts flush
+    policy, after a HashBatch (one block range), so pieces never cross a txs file.
+    """
+    policy = flush_policy or FLUSH_POLICIES["receipts"]
+    buffer = ColumnBuffer(RECEIPT_SCHEMA)
+
+    async with BackgroundWriter() as writer:
+        while (item := await inbox.get()) is not None:
+            if isinstance(item, HashBatch):
+                for i in range(0, len(item.hashes), batch_size):
+                    rows = await _fetch_receipt_rows(
+                        chain_id, reader, item.hashes[i : i + batch_size]
+                    )
+                    if rows:
+                        buffer.extend(rows)
+
+            buffer = await _flush(
+                writer, buffer, receipts_store, policy, force=isinstance(item, FileCommitted)
+            )
+
+
+async def _flush(
+    writer: BackgroundWriter,
+    buffer: ColumnBuffer,
+    store: DatasetStore,
+    policy: FlushPolicy,
+    *,
+    force: bool,
+) -> ColumnBuffer:
+    return await writer.flush(
+        buffer=buffer,
+        store=store,
+        rows_per_file=ROWS_PER_FILE,
+        force=force,
+        file_prefix="receipts",
+        block_field="block_number",
+        index_field="transaction_index",
+        policy=policy,
+    )
@@ -1,52 +1,28 @@
-import pyarrow.compute as pc
-import pyarrow as pa
 from loguru import logger
 from typing import Any
 from collector_engine.app.infrastructure.registry.schemas import ContractInfo
 from collector_engine.app.domain.ports.out import EvmReader, DatasetStore
-from collector_engine.app.infrastructure.parquet.constants import ROWS_PER_FILE
+from collector_engine.app.infrastructure.parquet.constants import FLUSH_POLICIES, ROWS_PER_FILE
 from collector_engine.app.infrastructure.parquet.schema import TX_SCHEMA
+from collector_engine.app.domain.pure.derived_files import hashes_by_block, pending_inputs
+from collector_engine.app.domain.pure.flush_policy import FlushPolicy
 from collector_engine.app.domain.pure.transactions import write_transactions_to_buffer
-from collector_engine.app.domain.pure.buffer_utils import rows_to_column_buffer
-from collector_engine.app.application.services.flush_buffer import flush_buffer
+from collector_engine.app.domain.pure.column_buffer import ColumnBuffer
+from collector_engine.app.application.services.background_writer import BackgroundWriter
+from collector_engine.app.application.services.streaming import (
+    FileCommitted,
+    HashBatch,
+    StreamQueue,
+)
 
 
-def _get_logs_files_to_processing(
-    logs_names: list[str],
-    tx_names: list[str],
-) -> list[str]:
-    """
-    Return list of logs_*.parquet files for which there is not yet a corresponding txs_*.parquet file.
-    We assume the names:
-      - logs_FROM_TO.parquet
-      - txs_FROM_TO.parquet
-    """
-    tx_suffixes = {name.removeprefix("txs_").removesuffix(".parquet") for name in tx_names}
-
-    return [
-        name
-        for name in logs_names
-        if name.removeprefix("logs_").removesuffix(".parquet") not in tx_suffixes
-    ]
-
-
-def _extract_unique_tx_hashes(table: pa.Table) -> list[bytes]:
-    """
-    Extracts unique transaction_hash as list[bytes] from logs_*.parquet table.
-    We assume that 'transaction_hash' column is binary/fixed_size_binary.
-    """
-
-    col = table["transaction_hash"]
-    unique = pc.unique(col)  # -> ChunkedArray
-    return [bytes(v) for v in unique.to_pylist()]
-
-
-def _sort_by_from_block(names: list[str], prefix: str) -> list[str]:
-    def from_block(name: str) -> int:
-        # logs_123_456.parquet / txs_123_456.parquet
-        return int(name.removeprefix(prefix).removesuffix(".parquet").split("_")[0])
-
-    return sorted(names, key=from_block)
+async def _fetch_tx_rows(
+    chain_id: int, reader: EvmReader, hashes: list[bytes]
+) -> list[dict[str, Any]]:
+    txs = await reader.get_transactions(hashes)
+    if not txs:
+        return []
+    return write_transactions_to_buffer(chain_id, list(txs))
 
 
 async def collect_transactions(
@@ -57,11 +33,16 @@ async def collect_transactions(
     logs_store: DatasetStore,
     tx_store: DatasetStore,
     batch_size: int = 100,
-    rows_per_file: int = ROWS_PER_FILE,
+    flush_policy: FlushPolicy | None = None,
 ) -> None:
     """
     For collected logs_*.parquet files, fetch corresponding transactions and store them.
+
+    The txs of one logs file are written as one file, or as several pieces inside the
+    logs FROM_TO range once the buffer reaches the txs flush policy. Pieces are cut on
+    block boundaries only, so an interrupted logs file resumes after its last piece.
     """
+    policy = flush_policy or FLUSH_POLICIES["txs"]
 
     log_files = logs_store.list_names()
     tx_files = tx_store.list_names()
@@ -75,10 +56,7 @@ async def collect_transactions(
         )
         return
 
-    pq_names_for_processing = _sort_by_from_block(
-        _get_logs_files_to_processing(log_files, tx_files),
-        prefix="logs_",
-    )
+    pq_names_for_processing = pending_inputs(log_files, "logs", tx_files, "txs")
 
     if not pq_names_for_processing:
         logger.info(
@@ -93,65 +71,109 @@ async def collect_transactions(
         "Starting transactions collection for {} on chain {}. " "Files to process: {}",
         contract_info.name,
         chain_id,
-        pq_names_for_processing,
+        [name for name, _ in pq_names_for_processing],
     )
 
-    buffer: dict[str, list] = {name: [] for name in TX_SCHEMA.names}
+    buffer = ColumnBuffer(TX_SCHEMA)
 
-    for name in pq_names_for_processing:
-        logger.info(
-            "Processing transactions for logs file: {} (contract={}, chain_id={})",
-            name,
-            contract_info.name,
-            chain_id,
-        )
+    async with BackgroundWriter() as writer:
+        for name, done_to in pq_names_for_processing:
+            logger.info(
+                "Processing transactions for logs file: {} (contract={}, chain_id={}, after={})",
+                name,
+                contract_info.name,
+                chain_id,
+                done_to,
+            )
 
-        table = logs_store.read_table(name)
-        hashes = _extract_unique_tx_hashes(table)
+            table = logs_store.read_table(name, columns=["block_number", "transaction_hash"])
+            hashes, blocks = hashes_by_block(table, "transaction_hash", after=done_to)
 
-        if not hashes:
-            logger.info("No transaction hashes in logs file {}, skipping", name)
-            continue
+            if not hashes:
+                logger.info("No transaction hashes in logs file {}, skipping", name)
+                continue
 
-        _hashes_len = len(hashes)
-        for i in range(0, len(hashes), batch_size):
-            chunk_hashes = hashes[i : i + batch_size]
+            for i in range(0, len(hashes), batch_size):
+                chunk_hashes = hashes[i : i + batch_size]
 
-            txs = await reader.get_transactions(chunk_hashes)
+                rows = await _fetch_tx_rows(chain_id, reader, chunk_hashes)
+                if rows:
+                    buffer.extend(rows)
 
-            if not txs:
-                continue
+                left = len(hashes) - i - len(chunk_hashes)
+                logger.info("Chunk processed, left {} hashes for file {}.", left, name)
 
-            rows: list[dict[str, Any]] = write_transactions_to_buffer(chain_id, list(txs))
-            buffer = rows_to_column_buffer(rows, list(TX_SCHEMA.names), buffer)
-
-            _hashes_len = _hashes_len - len(chunk_hashes)
-            logger.info("Chunk processed, left {} hashes for file {}.", _hashes_len, name)
-
-            buffer = flush_buffer(
-                buffer=buffer,
-                store=tx_store,
-                rows_per_file=rows_per_file,
-                force=False,
-                schema=TX_SCHEMA,
-                file_prefix="txs",
-                block_field="block_number",
-                index_field="transaction_index",
-            )
+                if left and blocks[-left] != blocks[-left - 1]:  # never split a block
+                    buffer = await _flush(writer, buffer, tx_store, policy, force=False)
 
-        buffer = flush_buffer(
-            buffer=buffer,
-            store=tx_store,
-            rows_per_file=rows_per_file,
-            force=True,
-            schema=TX_SCHEMA,
-            file_prefix="txs",
-            block_field="block_number",
-            index_field="transaction_index",
-        )
+            buffer = await _flush(writer, buffer, tx_store, policy, force=True)
 
     logger.info(
         "Finished transactions collection for {} on chain {}.",
         contract_info.name,
         chain_id,
     )
+
+
+async def stream_transactions(
+    *,
+    chain_id: int,
+    reader: EvmReader,
+    tx_store: DatasetStore,
+    inbox: StreamQueue,
+    outbox: StreamQueue | None = None,
+    batch_size: int = 100,
+    flush_policy: FlushPolicy | None = None,
+) -> None:
+    """
+    Streaming counterpart of collect_transactions.
+
+    Fetches transactions for every HashBatch from `inbox` as it arrives. The buffer is
+    written on FileCommitted and, past the txs flush policy, after a HashBatch (one
+    block range), so the pieces match the staged mode. The tx hashes of every HashBatch
+    are forwarded to `outbox`, followed by FileCommitted once a txs file is written.
+    """
+    policy = flush_policy or FLUSH_POLICIES["txs"]
+    buffer = ColumnBuffer(TX_SCHEMA)
+
+    async with BackgroundWriter() as writer:
+        while (item := await inbox.get()) is not None:
+            force = isinstance(item, FileCommitted)
+            if isinstance(item, HashBatch):
+                hashes: list[bytes] = []
+                for i in range(0, len(item.hashes), batch_size):
+                    rows = await _fetch_tx_rows(chain_id, reader, item.hashes[i : i + batch_size])
+                    if rows:
+                        buffer.extend(rows)
+                        hashes.extend(r["hash"] for r in rows)
+                if outbox is not None and hashes:
+                    await outbox.put(HashBatch(hashes))
+
+            buffered = len(buffer)
+            buffer = await _flush(writer, buffer, tx_store, policy, force=force)
+            if outbox is not None and buffered and not len(buffer):
+                await writer.drain()  # receipts follow a txs file that exists
+                await outbox.put(FileCommitted())
+
+    if outbox is not None:
+        await outbox.put(None)
+
+
+async def _flush(
+    writer: BackgroundWriter,
+    buffer: ColumnBuffer,
+    store: DatasetStore,
+    policy: FlushPolicy,
+    *,
+    force: bool,
+) -> ColumnBuffer:
+    return await writer.flush(
+        buffer=buffer,
+        store=store,
+        rows_per_file=ROWS_PER_FILE,
+        force=force,
+        file_prefix="txs",
+        block_field="block_number",
+        index_field="transaction_index",
+        policy=policy,
+    )
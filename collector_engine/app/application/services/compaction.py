@@ -0,0 +1,175 @@
+from dataclasses import dataclass
+from pathlib import PurePosixPath
+from typing import Any
+
+from loguru import logger
+
+from collector_engine.app.domain.ports.out import DatasetStore
+from collector_engine.app.domain.pure.derived_files import block_range, derived_by_input
+from collector_engine.app.infrastructure.parquet.constants import ROWS_PER_FILE
+
+COMPACTION_JOURNAL_KEY = "compaction_journal"
+
+
+@dataclass(frozen=True)
+class LinkedDataset:
+    """
+    A dataset taking part in compaction; the first one is the root. Files of derived
+    datasets are paired with the root file whose FROM_TO range contains theirs
+    (logs_A_B <-> txs_A_B or txs_A_C + txs_D_B pieces); merged files share the suffix.
+    """
+
+    store: DatasetStore
+    prefix: str  # "logs" / "txs" / "receipts" / "blocks"
+
+    def file_name(self, suffix: str) -> str:
+        return f"{self.prefix}_{suffix}"
+
+    def files_within(self, suffix: str) -> list[str]:
+        """Names of the files inside the FROM_TO range `suffix`."""
+        from_block, to_block = _bounds(suffix)
+        return [
+            e.name
+            for e in self.store.list_files()
+            if e.name.startswith(f"{self.prefix}_")
+            and from_block <= block_range(e.name, self.prefix)[0]
+            and block_range(e.name, self.prefix)[1] <= to_block
+        ]
+
+
+def _suffix(name: str, prefix: str) -> str:
+    # logs_FROM_TO.parquet -> FROM_TO
+    return name.removeprefix(f"{prefix}_").removesuffix(".parquet")
+
+
+def _bounds(suffix: str) -> tuple[int, int]:
+    from_block, to_block = suffix.split("_")
+    return int(from_block), int(to_block)
+
+
+def _merged_suffix(suffixes: list[str]) -> str:
+    return f"{suffixes[0].split('_')[0]}_{suffixes[-1].split('_')[1]}"
+
+
+def _linked_files(datasets: list[LinkedDataset]) -> dict[str, list[list[Any]]]:
+    """Root suffix -> manifest entries of every linked dataset for it, root first."""
+    root, *derived = datasets
+    roots = {e.name: e for e in root.store.list_files() if e.name.startswith(f"{root.prefix}_")}
+    linked = {name: [[e]] for name, e in roots.items()}  # list_files is in block order
+
+    for d in derived:
+        entries = {e.name: e for e in d.store.list_files() if e.name.startswith(f"{d.prefix}_")}
+        pieces = derived_by_input(roots, root.prefix, entries, d.prefix)
+        for name, names in pieces.items():
+            linked[name].append([entries[n] for n in names])
+
+    return {_suffix(name, root.prefix): files for name, files in linked.items()}
+
+
+def _complete(suffix: str, pieces: list[Any], prefix: str) -> bool:
+    # derived pieces are cut on block boundaries: the last one ends at the root's TO
+    return bool(pieces) and block_range(pieces[-1].name, prefix)[1] == _bounds(suffix)[1]
+
+
+def plan_compaction(datasets: list[LinkedDataset], *, target_rows: int) -> list[list[str]]:
+    """
+    Groups of adjacent FROM_TO suffixes to merge, in block order.
+
+    - a suffix takes part only if every linked dataset has its files (derived datasets
+      not collected yet keep their root files untouched),
+    - files already at target_rows are left alone, a group stays <= target_rows rows
+      in each dataset and never spans two partition directories,
+    - single-file groups are dropped (nothing to merge).
+    """
+    groups: list[list[str]] = []
+    current: list[str] = []
+    current_rows = 0
+    current_dirs: frozenset[PurePosixPath] | None = None
+
+    for suffix, files in _linked_files(datasets).items():
+        complete = all(_complete(suffix, f, d.prefix) for f, d in zip(files, datasets))
+        rows = max(sum(e.rows for e in f) for f in files)
+        if not complete or rows >= target_rows:
+            groups.append(current)
+            current, current_rows, current_dirs = [], 0, None
+            continue
+
+        dirs = frozenset(PurePosixPath(e.path).parent for f in files for e in f)
+        if current and (current_rows + rows > target_rows or dirs != current_dirs):
+            groups.append(current)
+            current, current_rows = [], 0
+
+        current.append(suffix)
+        current_rows += rows
+        current_dirs = dirs
+
+    groups.append(current)
+    return [g for g in groups if len(g) > 1]
+
+
+def _recover(datasets: list[LinkedDataset]) -> None:
+    """Finish (all merged files exist) or roll back an interrupted compaction step."""
+    root = datasets[0].store
+    journal = root.read_metadata(COMPACTION_JOURNAL_KEY) or {}
+    sources: list[str] = journal.get("sources", [])
+    if not sources:
+        return
+
+    merged = journal["merged"]
+    done = all(f"{d.file_name(merged)}.parquet" in d.store.list_names() for d in datasets)
+    logger.warning(
+        "Recovering interrupted compaction of {} -> {} ({})",
+        sources,
+        merged,
+        "roll forward" if done else "roll back",
+    )
+    for d in datasets:
+        if done:
+            merged_name = f"{d.file_name(merged)}.parquet"
+            d.store.delete_files([n for n in d.files_within(merged) if n != merged_name])
+        else:
+            d.store.delete_files([f"{d.file_name(merged)}.parquet"])
+    root.write_metadata(COMPACTION_JOURNAL_KEY, {})
+
+
+def compact_datasets(
+    datasets: list[LinkedDataset],
+    *,
+    target_rows: int = ROWS_PER_FILE,
+) -> int:
+    """
+    Coalesce adjacent small files into files of up to `target_rows` rows, keeping
+    sorted order, the {prefix}_{FROM}_{TO} naming and the file pairing between linked
+    datasets. Returns the number of merged groups.
+
+    Every group is swapped as one journaled step: derived datasets are merged before
+    the root (a merged logs file never lacks its txs file), then the sources are
+    deleted. An interrupted step is completed or rolled back on the next run.
+    Hot tier files are promoted to parquet first.
+    Must not run concurrently with collectors writing the same datasets.
+    """
+    _recover(datasets)
+    for d in datasets:
+        d.store.promote()
+
+    root = datasets[0].store
+    groups = plan_compaction(datasets, target_rows=target_rows)
+    for suffixes in groups:
+        merged = _merged_suffix(suffixes)
+        root.write_metadata(COMPACTION_JOURNAL_KEY, {"merged": merged, "sources": suffixes})
+
+        sources = [d.files_within(merged) for d in datasets]
+        for d, names in reversed(list(zip(datasets, sources))):
+            d.store.merge_files(names=names, file_name=d.file_name(merged))
+        for d, names in zip(datasets, sources):
+            d.store.delete_files(names)
+
+        root.write_metadata(COMPACTION_JOURNAL_KEY, {})
+        logger.info(
+            "Compacted {} files into {} for {}",
+            len(suffixes),
+            merged,
+            [d.prefix for d in datasets],
+        )
+
+    return len(groups)
@@ -1,61 +1,84 @@
-from typing import Any, Optional
+from typing import Optional
+
+import pyarrow as pa
+import pyarrow.compute as pc
 from loguru import logger
 
 from collector_engine.app.domain.ports.out import DatasetStore
+from collector_engine.app.domain.pure.column_buffer import ColumnBuffer
+from collector_engine.app.domain.pure.flush_policy import ROWS_ONLY, FlushPolicy
+
+
+def is_sorted(table: pa.Table, fields: list[str]) -> bool:
+    """
+    True if rows are in ascending lexicographic order of `fields`.
+    Vectorized neighbour comparison, no Python per-row work.
+    """
+    if table.num_rows < 2:
+        return True
+
+    ties: pa.Array | None = None  # rows equal to their predecessor on the previous fields
+    for field in fields:
+        col = table[field]
+        head, tail = col.slice(0, len(col) - 1), col.slice(1)
+        descending = pc.less(tail, head)
+        if ties is not None:
+            descending = pc.and_(ties, descending)
+        if pc.any(descending).as_py():
+            return False
+        equal = pc.equal(tail, head)
+        ties = equal if ties is None else pc.and_(ties, equal)
+    return True
 
 
 def flush_buffer(
     *,
-    buffer: dict[str, list],
+    buffer: ColumnBuffer,
     store: DatasetStore,
     rows_per_file: int,
     force: bool,
-    schema: Any,
     file_prefix: str,  # "logs" / "txs" / "receipts"
     block_field: str,
     index_field: Optional[str] = None,  # "log_index", "transaction_index" etc.
-) -> dict[str, list]:
+    policy: FlushPolicy = ROWS_ONLY,
+) -> ColumnBuffer:
     """
     buffer flush:
     - if buffer is empty → does nothing,
-    - if buffer has fewer than rows_per_file and force=False → does nothing,
-    - if buffer has >= rows_per_file or force=True:
-        - sorts by block_field (+ index_field if present),
+    - if force=False and the policy says not yet (rows_per_file rows, buffer bytes,
+      estimated file bytes) → does nothing,
+    - otherwise:
+        - sorts by block_field (+ index_field if present) unless already in order,
         - writes to file: {file_prefix}_{min_block}_{max_block}.parquet
-        - returns new buffer (from store adapter).
+        - returns a new empty buffer.
     """
-    rows = len(buffer.get(block_field, []))
+    rows = len(buffer)
     if rows == 0:
         return buffer
 
-    should_flush = force or rows >= rows_per_file
+    should_flush = force or policy.should_flush(buffer, rows_per_file=rows_per_file)
     if not should_flush:
         return buffer
+    nbytes = buffer.nbytes
 
-    if index_field is not None:
-        order = sorted(
-            range(rows),
-            key=lambda i: (buffer[block_field][i], buffer[index_field][i]),
+    table = buffer.to_table()
+    sort_fields = [block_field] if index_field is None else [block_field, index_field]
+    if not is_sorted(table, sort_fields):
+        table = table.take(
+            pc.sort_indices(table, sort_keys=[(f, "ascending") for f in sort_fields])
         )
-    else:
-        order = sorted(range(rows), key=lambda i: buffer[block_field][i])
 
-    buffer = {k: [buffer[k][i] for i in order] for k in buffer}
-
-    file_name = f"{file_prefix}_{buffer[block_field][0]}_{buffer[block_field][-1]}"
+    blocks = table[block_field]
+    file_name = f"{file_prefix}_{blocks[0].as_py()}_{blocks[-1].as_py()}"
 
     logger.info(
-        "Writing {} parquet file: {} (rows: {}, force={})",
+        "Writing {} parquet file: {} (rows: {}, buffer MB: {:.1f}, force={})",
         file_prefix,
         file_name,
         rows,
+        nbytes / (1 << 20),
         force,
     )
 
-    return store.write_buffer(
-        buffer=buffer,
-        schema=schema,
-        file_name=file_name,
-        rows_per_file=rows_per_file,
-        force=force,
-    )
+    store.write_table(table=table, file_name=file_name)
+    return buffer.empty()
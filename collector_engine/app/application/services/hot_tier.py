@@ -0,0 +1,26 @@
+import asyncio
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+
+from loguru import logger
+
+from collector_engine.app.domain.ports.out import DatasetStore
+
+
+async def promote_hot_files(*stores: DatasetStore) -> None:
+    """Rewrite hot tier files as parquet, off the event loop (no-op without a hot tier)."""
+    promoted = await asyncio.gather(*(asyncio.to_thread(s.promote) for s in stores))
+    if any(promoted):
+        logger.info("Promoted {} hot files to parquet", sum(promoted))
+
+
+@asynccontextmanager
+async def promoted_on_exit(*stores: DatasetStore) -> AsyncIterator[None]:
+    """
+    Promote the hot files of `stores` when the block exits, failed or not: a collector
+    run on its own leaves no Arrow IPC files behind (the pipeline promotes as it goes).
+    """
+    try:
+        yield
+    finally:
+        await promote_hot_files(*stores)
@@ -1,9 +1,17 @@
 from __future__ import annotations
 
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from pathlib import Path
 
-from collector_engine.app.domain.ports.out import DatasetLoader
+from collector_engine.app.domain.ports.out import DatasetLoader, DatasetName
+
+# (directory, dataset, file prefix) of the contract-scoped datasets
+CONTRACT_SCOPED_DATASETS: list[tuple[str, DatasetName, str]] = [
+    ("logs", "logs", "logs_"),
+    ("transactions", "txs", "txs_"),
+    ("receipts", "receipts", "receipts_"),
+]
 
 
 @dataclass(frozen=True)
@@ -17,18 +25,19 @@ def load_contract_scoped_data_to_sql(
     cfg: LoadContractScopedToSqlConfig,
     loader: DatasetLoader,
 ) -> None:
-    loader.load_parquet_dir(
-        parquet_dir=cfg.contract_base_path / "logs",
-        dataset="logs",
-        file_prefix="logs_",
-    )
-    loader.load_parquet_dir(
-        parquet_dir=cfg.contract_base_path / "transactions",
-        dataset="txs",
-        file_prefix="txs_",
-    )
-    loader.load_parquet_dir(
-        parquet_dir=cfg.contract_base_path / "receipts",
-        dataset="receipts",
-        file_prefix="receipts_",
-    )
+    """
+    Load logs, txs and receipts concurrently (the loader bounds the connections).
+    Every dataset is loaded even if another one fails; the first error is raised after.
+    """
+    with ThreadPoolExecutor(len(CONTRACT_SCOPED_DATASETS), thread_name_prefix="sql-load") as ex:
+        futures = [
+            ex.submit(
+                loader.load_parquet_dir,
+                parquet_dir=cfg.contract_base_path / directory,
+                dataset=dataset,
+                file_prefix=file_prefix,
+            )
+            for directory, dataset, file_prefix in CONTRACT_SCOPED_DATASETS
+        ]
+    for future in futures:
+        future.result()
@@ -0,0 +1,45 @@
+import asyncio
+from collections import deque
+from collections.abc import AsyncIterator, Awaitable, Callable, Iterable
+from typing import TypeVar
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+async def prefetch_ordered(
+    items: Iterable[T],
+    fetch: Callable[[T], Awaitable[R]],
+    depth: int,
+) -> AsyncIterator[tuple[T, R]]:
+    """
+    Yield (item, await fetch(item)) in input order while keeping up to `depth`
+    upcoming fetches in flight during the caller's processing of the current one.
+
+    `items` is consumed lazily, only when a fetch slot frees up, so a generator can
+    base the next item on state updated by the caller (e.g. an adaptive window).
+    depth=0 is plain sequential fetching. Pending fetches are cancelled and awaited on error/exit.
+    """
+    it = iter(items)
+    pending: deque[tuple[T, asyncio.Task[R]]] = deque()
+
+    def fill() -> None:
+        while len(pending) <= depth:
+            try:
+                item = next(it)
+            except StopIteration:
+                return
+            pending.append((item, asyncio.ensure_future(fetch(item))))
+
+    try:
+        fill()
+        while pending:
+            item, task = pending.popleft()
+            result = await task
+            yield item, result
+            fill()
+    finally:
+        tasks = [task for _, task in pending]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
@@ -1,14 +1,22 @@
+import asyncio
 from dataclasses import dataclass
 from loguru import logger
 
 from collector_engine.app.infrastructure.registry.schemas import ContractInfo
-from collector_engine.app.domain.ports.out import EvmReader, DatasetStore
+from collector_engine.app.domain.ports.out import EvmReader, DatasetStore, SpillLog
+from collector_engine.app.domain.pure.flush_policy import FlushPolicy
 
 from collector_engine.app.application.services.collectors.collect_logs import collect_logs
 from collector_engine.app.application.services.collectors.collect_transactions import (
     collect_transactions,
+    stream_transactions,
 )
-from collector_engine.app.application.services.collectors.collect_receipts import collect_receipts
+from collector_engine.app.application.services.collectors.collect_receipts import (
+    collect_receipts,
+    stream_receipts,
+)
+from collector_engine.app.application.services.hot_tier import promote_hot_files
+from collector_engine.app.application.services.streaming import StreamQueue
 
 
 @dataclass(frozen=True)
@@ -17,6 +25,7 @@ class PipelineDeps:
     logs_store: DatasetStore
     tx_store: DatasetStore
     receipts_store: DatasetStore
+    logs_spill: SpillLog | None = None
 
 
 @dataclass(frozen=True)
@@ -24,22 +33,102 @@ class PipelineConfig:
     chain_id: int
     protocol: str
     contract_info: ContractInfo
+    # streaming: logs -> txs -> receipts run concurrently, connected by bounded queues
+    streaming: bool = False
+    queue_size: int = 8
+    logs_flush_policy: FlushPolicy | None = None  # None: FLUSH_POLICIES["logs"]
+    txs_flush_policy: FlushPolicy | None = None  # None: FLUSH_POLICIES["txs"]
+    receipts_flush_policy: FlushPolicy | None = None  # None: FLUSH_POLICIES["receipts"]
+
+
+async def _run_streaming(*, cfg: PipelineConfig, deps: PipelineDeps) -> None:
+    """
+    Overlapped logs -> transactions -> receipts.
+
+    Tx hashes of each block range flow to the transaction and receipt stages through
+    bounded queues (backpressure) as soon as the logs arrive; derived files are written
+    when the upstream file is committed or past their flush policy after a block range,
+    so they stay inside the upstream file range as in the staged mode. Leftovers of an
+    interrupted run (logs without txs, txs without receipts) are caught up first.
+    """
+    logger.info("Catch-up: derived datasets for already committed files")
+    await collect_transactions(
+        chain_id=cfg.chain_id,
+        contract_info=cfg.contract_info,
+        reader=deps.reader,
+        logs_store=deps.logs_store,
+        tx_store=deps.tx_store,
+        flush_policy=cfg.txs_flush_policy,
+    )
+    await collect_receipts(
+        chain_id=cfg.chain_id,
+        contract_info=cfg.contract_info,
+        reader=deps.reader,
+        tx_store=deps.tx_store,
+        receipts_store=deps.receipts_store,
+        flush_policy=cfg.receipts_flush_policy,
+    )
+
+    logger.info("Streaming logs -> transactions -> receipts (queue_size={})", cfg.queue_size)
+    tx_queue: StreamQueue = asyncio.Queue(maxsize=cfg.queue_size)
+    receipts_queue: StreamQueue = asyncio.Queue(maxsize=cfg.queue_size)
+
+    async with asyncio.TaskGroup() as tg:
+        tg.create_task(
+            collect_logs(
+                chain_id=cfg.chain_id,
+                contract_info=cfg.contract_info,
+                reader=deps.reader,
+                store=deps.logs_store,
+                hash_queue=tx_queue,
+                spill=deps.logs_spill,
+                flush_policy=cfg.logs_flush_policy,
+            )
+        )
+        tg.create_task(
+            stream_transactions(
+                chain_id=cfg.chain_id,
+                reader=deps.reader,
+                tx_store=deps.tx_store,
+                inbox=tx_queue,
+                outbox=receipts_queue,
+                flush_policy=cfg.txs_flush_policy,
+            )
+        )
+        tg.create_task(
+            stream_receipts(
+                chain_id=cfg.chain_id,
+                reader=deps.reader,
+                receipts_store=deps.receipts_store,
+                inbox=receipts_queue,
+                flush_policy=cfg.receipts_flush_policy,
+            )
+        )
 
 
 async def run_pipeline(*, cfg: PipelineConfig, deps: PipelineDeps) -> None:
     logger.info(
-        "Pipeline start: chain_id={}, protocol={}, contract={}",
+        "Pipeline start: chain_id={}, protocol={}, contract={}, streaming={}",
         cfg.chain_id,
         cfg.protocol,
         cfg.contract_info.name,
+        cfg.streaming,
     )
 
+    if cfg.streaming:
+        await _run_streaming(cfg=cfg, deps=deps)
+        await promote_hot_files(deps.logs_store, deps.tx_store, deps.receipts_store)
+        logger.info("Pipeline finished successfully.")
+        return
+
     logger.info("Step 1/3: collect logs")
     await collect_logs(
         chain_id=cfg.chain_id,
         contract_info=cfg.contract_info,
         reader=deps.reader,
         store=deps.logs_store,
+        spill=deps.logs_spill,
+        flush_policy=cfg.logs_flush_policy,
     )
 
     logger.info("Step 2/3: collect transactions")
@@ -49,15 +138,24 @@ async def run_pipeline(*, cfg: PipelineConfig, deps: PipelineDeps) -> None:
         reader=deps.reader,
         logs_store=deps.logs_store,
         tx_store=deps.tx_store,
+        flush_policy=cfg.txs_flush_policy,
     )
 
-    logger.info("Step 3/3: collect receipts")
-    await collect_receipts(
-        chain_id=cfg.chain_id,
-        contract_info=cfg.contract_info,
-        reader=deps.reader,
-        tx_store=deps.tx_store,
-        receipts_store=deps.receipts_store,
-    )
+    # logs are sealed once their txs exist: promote them while receipts are collected
+    promote_logs = asyncio.create_task(promote_hot_files(deps.logs_store))
+
+    try:
+        logger.info("Step 3/3: collect receipts")
+        await collect_receipts(
+            chain_id=cfg.chain_id,
+            contract_info=cfg.contract_info,
+            reader=deps.reader,
+            tx_store=deps.tx_store,
+            receipts_store=deps.receipts_store,
+            flush_policy=cfg.receipts_flush_policy,
+        )
+        await promote_hot_files(deps.tx_store, deps.receipts_store)
+    finally:
+        await promote_logs
 
     logger.info("Pipeline finished successfully.")
@@ -0,0 +1,19 @@
+import asyncio
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class HashBatch:
+    """Transaction hashes of one collected block range."""
+
+    hashes: list[bytes]
+
+
+@dataclass(frozen=True)
+class FileCommitted:
+    """The upstream stage committed a parquet file; downstream flushes its buffer (force)."""
+
+
+# None marks the end of the stream.
+StreamItem = HashBatch | FileCommitted | None
+StreamQueue = asyncio.Queue[StreamItem]
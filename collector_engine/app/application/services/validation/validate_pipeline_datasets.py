@@ -8,6 +8,8 @@ import pyarrow.compute as pc
 from loguru import logger
 
 from collector_engine.app.domain.ports.out import DatasetStore
+from collector_engine.app.domain.pure.bytes_utils import unique_binary_values
+from collector_engine.app.domain.pure.derived_files import derived_by_input
 
 
 @dataclass
@@ -93,18 +95,17 @@ def _to_bytes_list(arr: pa.Array | pa.ChunkedArray) -> list[bytes]:
 
 
 def _unique_bytes(arr: pa.Array | pa.ChunkedArray) -> list[bytes]:
-    u = pc.unique(arr)  # Array
-    return _to_bytes_list(u)
+    return unique_binary_values(arr)
 
 
 def _validate_file_schema(
     report: ValidationReport,
     *,
-    table: pa.Table,
+    schema: pa.Schema,
     expected_schema: pa.Schema,
     file_name: str,
 ) -> None:
-    ok, reason = _schema_equal(table.schema, expected_schema)
+    ok, reason = _schema_equal(schema, expected_schema)
     if not ok:
         report.error(
             "SCHEMA_MISMATCH",
@@ -238,7 +239,7 @@ async def validate_pipeline_datasets(
     """
     Validates:
       - per-file schema + uniqueness
-      - suffix pairing: logs <-> txs <-> receipts
+      - range pairing: logs <-> txs <-> receipts (derived files inside the logs FROM_TO)
       - coverage: logs.transaction_hash ⊆ txs.hash, txs.hash ⊆ receipts.transaction_hash
       - consistency: tx.block_number == receipt.block_number for shared hashes
     """
@@ -255,18 +256,25 @@ async def validate_pipeline_datasets(
         return report
 
     logs_by = _names_by_suffix(log_files, "logs_")
-    tx_by = _names_by_suffix(tx_files, "txs_")
-    rc_by = _names_by_suffix(rc_files, "receipts_")
+    # txs / receipts of a logs file may be split in several pieces inside its range
+    tx_by = derived_by_input(log_files, "logs", tx_files, "txs")
+    rc_by = derived_by_input(log_files, "logs", rc_files, "receipts")
 
     # Per-file validation + cross-file validation per suffix
     for suf, log_name in sorted(logs_by.items(), key=lambda x: x[0]):
-        tx_name = tx_by.get(suf)
-        rc_name = rc_by.get(suf)
+        tx_names = tx_by[log_name]
+        rc_names = rc_by[log_name]
 
-        log_table = logs_store.read_table(log_name)
+        # footer schema + the key columns only
         _validate_file_schema(
-            report, table=log_table, expected_schema=log_schema, file_name=log_name
+            report,
+            schema=logs_store.read_schema(log_name),
+            expected_schema=log_schema,
+            file_name=log_name,
         )
+        log_table = logs_store.scan(
+            names=[log_name], columns=["block_number", "log_index", "transaction_hash"]
+        ).read_all()
         _validate_uniqueness(
             report,
             table=log_table,
@@ -275,7 +283,7 @@ async def validate_pipeline_datasets(
             key_name="(block_number, log_index)",
         )
 
-        if tx_name is None:
+        if not tx_names:
             report.error(
                 "MISSING_TX_FILE",
                 f"Missing txs file for logs suffix={suf}",
@@ -285,12 +293,18 @@ async def validate_pipeline_datasets(
             )
             continue
 
-        tx_table = tx_store.read_table(tx_name)
-        _validate_file_schema(report, table=tx_table, expected_schema=tx_schema, file_name=tx_name)
+        for tx_name in tx_names:
+            _validate_file_schema(
+                report,
+                schema=tx_store.read_schema(tx_name),
+                expected_schema=tx_schema,
+                file_name=tx_name,
+            )
+        tx_table = tx_store.scan(names=tx_names, columns=["hash", "block_number"]).read_all()
         _validate_uniqueness(
             report,
             table=tx_table,
-            file_name=tx_name,
+            file_name=", ".join(tx_names),
             columns=["hash"],
             key_name="hash",
         )
@@ -308,7 +322,7 @@ async def validate_pipeline_datasets(
         )
 
         # receipts checks if receipts file exists (optional if not collected yet)
-        if rc_name is None:
+        if not rc_names:
             report.warn(
                 "MISSING_RECEIPTS_FILE",
                 f"Missing receipts file for suffix={suf} (ok if receipts not collected yet)",
@@ -317,14 +331,20 @@ async def validate_pipeline_datasets(
             )
             continue
 
-        rc_table = receipts_store.read_table(rc_name)
-        _validate_file_schema(
-            report, table=rc_table, expected_schema=receipt_schema, file_name=rc_name
-        )
+        for rc_name in rc_names:
+            _validate_file_schema(
+                report,
+                schema=receipts_store.read_schema(rc_name),
+                expected_schema=receipt_schema,
+                file_name=rc_name,
+            )
+        rc_table = receipts_store.scan(
+            names=rc_names, columns=["transaction_hash", "block_number"]
+        ).read_all()
         _validate_uniqueness(
             report,
             table=rc_table,
-            file_name=rc_name,
+            file_name=", ".join(rc_names),
             columns=["transaction_hash"],
             key_name="transaction_hash",
         )
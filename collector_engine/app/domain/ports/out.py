@@ -9,26 +9,44 @@ from web3.types import LogReceipt, TxReceipt, TxData, BlockData
 class EvmReader(Protocol):
     async def latest_block_number(self) -> int: ...
     async def get_logs(
-        self, *, address: bytes, from_block: int, to_block: int
+        self, *, address: bytes | Sequence[bytes], from_block: int, to_block: int
     ) -> Sequence[LogReceipt]: ...
     async def get_transactions(self, hashes: Iterable[bytes]) -> Sequence[TxData]: ...
     async def get_receipts(self, hashes: Iterable[bytes]) -> Sequence[TxReceipt]: ...
     async def get_block(self, number: int) -> BlockData: ...
     async def get_blocks_range(self, from_block: int, to_block: int) -> Sequence[BlockData]: ...
+    async def close(self) -> None: ...
 
 
 class DatasetStore(Protocol):
     def list_names(self) -> list[str]: ...
-    def read_table(self, name: str) -> Any: ...
-    def write_buffer(
+    def read_table(self, name: str, columns: list[str] | None = None) -> Any: ...
+    def read_schema(self, name: str) -> Any: ...
+    def scan(
         self,
         *,
-        buffer: dict[str, list],
-        schema: Any,
-        file_name: str,
-        rows_per_file: int,
-        force: bool = False,
-    ) -> dict[str, list]: ...
+        columns: list[str] | None = None,
+        block_range: tuple[int, int] | None = None,
+        filter: Any = None,
+        names: list[str] | None = None,
+    ) -> Any: ...
+    def read_metadata(self, key: str) -> dict[str, Any] | None: ...
+    def write_metadata(self, key: str, data: dict[str, Any]) -> None: ...
+    def max_block(self) -> int | None: ...
+    def files_overlapping(self, from_block: int, to_block: int) -> list[Any]: ...
+    def list_files(self) -> list[Any]: ...
+    def merge_files(self, *, names: list[str], file_name: str) -> None: ...
+    def delete_files(self, names: list[str]) -> None: ...
+    def promote(self, *, min_age: float = 0.0) -> int: ...
+    def write_table(self, *, table: Any, file_name: str) -> None: ...
+
+
+class SpillLog(Protocol):
+    def append(self, rows: list[dict[str, Any]], *, to_block: int) -> None: ...
+    def checkpoint(self) -> int: ...
+    def release(self, segment: int) -> None: ...
+    def close(self) -> None: ...
+    def replay(self, committed_block: int | None) -> tuple[list[dict[str, Any]], int | None]: ...
 
 
 DatasetName = Literal["logs", "txs", "receipts", "blocks"]
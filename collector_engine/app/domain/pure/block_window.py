@@ -0,0 +1,61 @@
+from dataclasses import dataclass
+
+# Substrings of provider errors meaning "the eth_getLogs range returned too much".
+# Infura / Alchemy / QuickNode / geth / erigon wordings.
+RESULT_LIMIT_MARKERS: tuple[str, ...] = (
+    "more than 10000 results",
+    "too many results",
+    "response size exceeded",
+    "response size should not greater than",
+    "log response size exceeded",
+    "query returned more than",
+    "exceed maximum block range",
+    "block range is too large",
+    "block range too large",
+    "query timeout exceeded",
+)
+
+
+def is_result_limit_error(message: str) -> bool:
+    """True if an RPC error message says the requested log range was too large."""
+    msg = message.lower()
+    return any(marker in msg for marker in RESULT_LIMIT_MARKERS)
+
+
+@dataclass
+class AdaptiveBlockWindow:
+    """
+    Block-window controller for range queries such as eth_getLogs.
+
+    - on_success: grows the window while responses stay below half of target_results,
+      shrinks it proportionally when a response was above target_results,
+    - on_limit_error: bisects the window (the caller retries the same start block).
+    With min_size == max_size the window is fixed.
+    """
+
+    size: int
+    min_size: int = 1
+    max_size: int = 50_000
+    target_results: int = 5_000
+    grow_factor: float = 2.0
+
+    def __post_init__(self) -> None:
+        self.size = self._clamp(self.size)
+
+    def _clamp(self, size: int) -> int:
+        return max(self.min_size, min(self.max_size, size))
+
+    def range_from(self, from_block: int, to_block: int) -> tuple[int, int]:
+        return from_block, min(from_block + self.size - 1, to_block)
+
+    def can_shrink(self, blocks: int) -> bool:
+        return blocks > self.min_size
+
+    def on_success(self, blocks: int, results: int) -> None:
+        if results > self.target_results:
+            self.size = self._clamp(blocks * self.target_results // results)
+        elif results * 2 < self.target_results and blocks >= self.size:
+            self.size = self._clamp(int(self.size * self.grow_factor))
+
+    def on_limit_error(self, blocks: int) -> None:
+        self.size = self._clamp(blocks // 2)
@@ -1,3 +1,5 @@
+import pyarrow as pa
+import pyarrow.compute as pc
 from hexbytes import HexBytes
 from typing import Callable
 
@@ -38,3 +40,19 @@ def make_bytes_validator(expected_length: int) -> Callable[[BytesLike | None, st
 b32_validate = make_bytes_validator(32)
 b20_validate = make_bytes_validator(20)
 b256_validate = make_bytes_validator(256)
+
+
+def unique_binary_values(values: pa.Array | pa.ChunkedArray) -> list[bytes]:
+    """
+    Distinct non-null values of a binary column as bytes. For fixed_size_binary
+    (hashes, addresses) they are sliced straight out of the Arrow data buffer, without
+    going through per-value scalars / to_pylist().
+    """
+    unique = pc.unique(values).drop_null()
+    if not pa.types.is_fixed_size_binary(unique.type):
+        return [bytes(v) for v in unique.to_pylist()]
+
+    width = unique.type.byte_width
+    start = unique.offset * width
+    raw = memoryview(unique.buffers()[1])[start : start + len(unique) * width].tobytes()
+    return [raw[i : i + width] for i in range(0, len(raw), width)]
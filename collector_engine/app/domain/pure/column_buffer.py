@@ -0,0 +1,311 @@
+from __future__ import annotations
+
+import array
+from abc import ABC, abstractmethod
+from collections.abc import Iterable
+from decimal import Decimal
+from typing import Any
+
+import numpy as np
+import pyarrow as pa
+
+# array.array typecodes for the integer widths used by the parquet schemas
+_INT_TYPECODES: dict[pa.DataType, str] = {
+    pa.int8(): "b",
+    pa.int16(): "h",
+    pa.int32(): "i",
+    pa.int64(): "q",
+}
+
+
+class _Validity:
+    """One byte per row, allocated on the first null only."""
+
+    def __init__(self) -> None:
+        self._mask: bytearray | None = None
+
+    def append(self, rows_before: int, valid: bool) -> None:
+        if self._mask is None:
+            if valid:
+                return
+            self._mask = bytearray(b"\x01" * rows_before)
+        self._mask.append(1 if valid else 0)
+
+    def truncate(self, length: int) -> None:
+        if self._mask is not None:
+            del self._mask[length:]
+
+    @property
+    def nbytes(self) -> int:
+        return 0 if self._mask is None else len(self._mask)
+
+    def bitmap(self) -> pa.Buffer | None:
+        if self._mask is None:
+            return None
+        bits = np.packbits(np.frombuffer(self._mask, dtype=np.uint8), bitorder="little")
+        return pa.py_buffer(bits)
+
+
+class _Column(ABC):
+    """Storage of one schema field; truncate() drops the rows of a failed append."""
+
+    def __init__(self, name: str, type_: pa.DataType, nullable: bool):
+        self.name = name
+        self.type = type_
+        self.nullable = nullable
+        self.length = 0
+        self.validity = _Validity()
+
+    def append(self, value: Any) -> None:
+        if value is None:
+            if not self.nullable:
+                raise ValueError(f"Column '{self.name}' is declared non-nullable but got None")
+            self._append_null()
+        else:
+            self._append(value)
+        self.validity.append(self.length, value is not None)
+        self.length += 1
+
+    def truncate(self, length: int) -> None:
+        if length < self.length:
+            self._truncate(length)
+            self.validity.truncate(length)
+            self.length = length
+
+    @abstractmethod
+    def _append(self, value: Any) -> None: ...
+
+    @abstractmethod
+    def _append_null(self) -> None: ...
+
+    @abstractmethod
+    def _truncate(self, length: int) -> None: ...
+
+    @property
+    @abstractmethod
+    def nbytes(self) -> int: ...
+
+    @abstractmethod
+    def to_arrow(self) -> pa.Array: ...
+
+
+class _IntColumn(_Column):
+    def __init__(self, name: str, type_: pa.DataType, nullable: bool):
+        super().__init__(name, type_, nullable)
+        self.values = array.array(_INT_TYPECODES[type_])
+
+    def _append(self, value: Any) -> None:
+        self.values.append(value)
+
+    def _append_null(self) -> None:
+        self.values.append(0)
+
+    def _truncate(self, length: int) -> None:
+        del self.values[length:]
+
+    @property
+    def nbytes(self) -> int:
+        return len(self.values) * self.values.itemsize + self.validity.nbytes
+
+    def to_arrow(self) -> pa.Array:
+        return pa.Array.from_buffers(
+            self.type, self.length, [self.validity.bitmap(), pa.py_buffer(self.values)]
+        )
+
+
+class _BoolColumn(_Column):
+    def __init__(self, name: str, type_: pa.DataType, nullable: bool):
+        super().__init__(name, type_, nullable)
+        self.values = bytearray()
+
+    def _append(self, value: Any) -> None:
+        self.values.append(1 if value else 0)
+
+    def _append_null(self) -> None:
+        self.values.append(0)
+
+    def _truncate(self, length: int) -> None:
+        del self.values[length:]
+
+    @property
+    def nbytes(self) -> int:
+        return len(self.values) + self.validity.nbytes
+
+    def to_arrow(self) -> pa.Array:
+        bits = np.packbits(np.frombuffer(self.values, dtype=np.uint8), bitorder="little")
+        return pa.Array.from_buffers(
+            self.type, self.length, [self.validity.bitmap(), pa.py_buffer(bits)]
+        )
+
+
+class _FixedBinaryColumn(_Column):
+    """Hashes / addresses: one contiguous arena of `byte_width` slots."""
+
+    def __init__(self, name: str, type_: pa.FixedSizeBinaryType, nullable: bool):
+        super().__init__(name, type_, nullable)
+        self.width = type_.byte_width
+        self.arena = bytearray()
+        self._zero = bytes(self.width)
+
+    def _append(self, value: Any) -> None:
+        if len(value) != self.width:
+            raise ValueError(f"Column '{self.name}' expects {self.width} bytes, got {len(value)}")
+        self.arena += value
+
+    def _append_null(self) -> None:
+        self.arena += self._zero
+
+    def _truncate(self, length: int) -> None:
+        del self.arena[length * self.width :]
+
+    @property
+    def nbytes(self) -> int:
+        return len(self.arena) + self.validity.nbytes
+
+    def to_arrow(self) -> pa.Array:
+        return pa.Array.from_buffers(
+            self.type, self.length, [self.validity.bitmap(), pa.py_buffer(self.arena)]
+        )
+
+
+class _VarBinaryColumn(_Column):
+    """binary / string: data arena + int32 offsets (Arrow layout)."""
+
+    def __init__(self, name: str, type_: pa.DataType, nullable: bool):
+        super().__init__(name, type_, nullable)
+        self.data = bytearray()
+        self.offsets = array.array("i", [0])
+        self._is_string = pa.types.is_string(type_)
+
+    def _append(self, value: Any) -> None:
+        self.data += value.encode() if self._is_string else value
+        self.offsets.append(len(self.data))
+
+    def _append_null(self) -> None:
+        self.offsets.append(len(self.data))
+
+    def _truncate(self, length: int) -> None:
+        del self.data[self.offsets[length] :]
+        del self.offsets[length + 1 :]
+
+    @property
+    def nbytes(self) -> int:
+        return len(self.data) + len(self.offsets) * self.offsets.itemsize + self.validity.nbytes
+
+    def to_arrow(self) -> pa.Array:
+        return pa.Array.from_buffers(
+            self.type,
+            self.length,
+            [self.validity.bitmap(), pa.py_buffer(self.offsets), pa.py_buffer(self.data)],
+        )
+
+
+def _approx_size(value: Any) -> int:
+    if value is None:
+        return 0
+    if isinstance(value, (bytes, bytearray, str)):
+        return len(value)
+    if isinstance(value, dict):
+        return sum(_approx_size(v) for v in value.values())
+    if isinstance(value, (list, tuple)):
+        return sum(_approx_size(v) for v in value)
+    if isinstance(value, Decimal):
+        return 16
+    return 8
+
+
+class _ObjectColumn(_Column):
+    """Decimals and nested types (access_list, receipt logs): converted by pa.array."""
+
+    def __init__(self, name: str, type_: pa.DataType, nullable: bool):
+        super().__init__(name, type_, nullable)
+        self.values: list[Any] = []
+        self._nbytes = 0
+
+    def append(self, value: Any) -> None:
+        # no validity mask: pa.array takes the Nones as they are
+        if value is None:
+            if not self.nullable:
+                raise ValueError(f"Column '{self.name}' is declared non-nullable but got None")
+            self._append_null()
+        else:
+            self._append(value)
+        self.length += 1
+
+    def _append(self, value: Any) -> None:
+        self.values.append(value)
+        self._nbytes += _approx_size(value)
+
+    def _append_null(self) -> None:
+        self.values.append(None)
+
+    def _truncate(self, length: int) -> None:
+        self._nbytes -= sum(_approx_size(v) for v in self.values[length:])
+        del self.values[length:]
+
+    @property
+    def nbytes(self) -> int:
+        return self._nbytes
+
+    def to_arrow(self) -> pa.Array:
+        return pa.array(self.values, type=self.type)
+
+
+def _column_for(field: pa.Field) -> _Column:
+    t = field.type
+    if t in _INT_TYPECODES:
+        return _IntColumn(field.name, t, field.nullable)
+    if pa.types.is_boolean(t):
+        return _BoolColumn(field.name, t, field.nullable)
+    if pa.types.is_fixed_size_binary(t):
+        return _FixedBinaryColumn(field.name, t, field.nullable)
+    if pa.types.is_binary(t) or pa.types.is_string(t):
+        return _VarBinaryColumn(field.name, t, field.nullable)
+    return _ObjectColumn(field.name, t, field.nullable)
+
+
+class ColumnBuffer:
+    """
+    Append-only, schema-typed row buffer for one dataset file.
+
+    - ints / bools: array-backed, hashes / addresses: contiguous fixed-width arenas,
+      variable binary: data arena + offsets; decimals and nested types stay Python
+      objects until conversion,
+    - to_table() wraps the storage as Arrow buffers without copying; the buffer must
+      not be appended to afterwards (flush hands out a fresh buffer instead),
+    - nbytes: bytes held by the column storage (estimated for object columns).
+    """
+
+    def __init__(self, schema: pa.Schema):
+        self.schema = schema
+        self._columns = [_column_for(field) for field in schema]
+        self._rows = 0
+
+    def __len__(self) -> int:
+        return self._rows
+
+    @property
+    def nbytes(self) -> int:
+        return sum(c.nbytes for c in self._columns)
+
+    def extend(self, rows: Iterable[dict[str, Any]]) -> None:
+        """
+        Append rows; a row that fails (missing field, None in a non-nullable column, wrong
+        width) is rolled back from the columns it reached, so all keep the same length.
+        """
+        for row in rows:
+            try:
+                for col in self._columns:
+                    col.append(row[col.name])
+            except Exception:
+                for col in self._columns:
+                    col.truncate(self._rows)
+                raise
+            self._rows += 1
+
+    def empty(self) -> ColumnBuffer:
+        """New empty buffer with the same schema."""
+        return ColumnBuffer(self.schema)
+
+    def to_table(self) -> pa.Table:
+        return pa.Table.from_arrays([c.to_arrow() for c in self._columns], schema=self.schema)
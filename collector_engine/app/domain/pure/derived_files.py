@@ -0,0 +1,76 @@
+from bisect import bisect_right
+from collections.abc import Iterable
+
+import pyarrow as pa
+import pyarrow.compute as pc
+
+from collector_engine.app.domain.pure.bytes_utils import unique_binary_values
+
+
+def block_range(name: str, prefix: str) -> tuple[int, int]:
+    # logs_FROM_TO.parquet -> (FROM, TO)
+    from_block, to_block = name.removeprefix(f"{prefix}_").removesuffix(".parquet").split("_")
+    return int(from_block), int(to_block)
+
+
+def derived_by_input(
+    inputs: Iterable[str],
+    input_prefix: str,
+    derived: Iterable[str],
+    derived_prefix: str,
+) -> dict[str, list[str]]:
+    """
+    Derived files (txs of logs, receipts of txs) of every input file, in block order.
+
+    A derived dataset is written from one input file at a time, in one or more pieces
+    named after their own rows, so a piece belongs to the input whose FROM_TO range
+    contains its own. Pieces inside no input range are left out.
+    """
+    ranges = sorted((block_range(name, input_prefix), name) for name in inputs)
+    starts = [from_block for (from_block, _), _ in ranges]
+    out: dict[str, list[str]] = {name: [] for _, name in ranges}
+
+    for name in sorted(derived, key=lambda n: block_range(n, derived_prefix)):
+        from_block, to_block = block_range(name, derived_prefix)
+        i = bisect_right(starts, from_block) - 1
+        if i >= 0 and to_block <= ranges[i][0][1]:
+            out[ranges[i][1]].append(name)
+    return out
+
+
+def pending_inputs(
+    inputs: Iterable[str],
+    input_prefix: str,
+    derived: Iterable[str],
+    derived_prefix: str,
+) -> list[tuple[str, int | None]]:
+    """
+    Input files whose derived files are missing or incomplete, in block order, with the
+    last block already derived (None: nothing yet).
+
+    Derived pieces are only cut on block boundaries, so an input is complete once a
+    piece ends at its TO block, and an interrupted one resumes after its last piece.
+    """
+    out: list[tuple[str, int | None]] = []
+    for name, pieces in derived_by_input(inputs, input_prefix, derived, derived_prefix).items():
+        done_to = block_range(pieces[-1], derived_prefix)[1] if pieces else None
+        if done_to != block_range(name, input_prefix)[1]:
+            out.append((name, done_to))
+    return out
+
+
+def hashes_by_block(
+    table: pa.Table, hash_field: str, *, after: int | None = None
+) -> tuple[list[bytes], list[int]]:
+    """
+    Distinct `hash_field` values of `table` in block order, with the block of each
+    (a transaction lives in one block). Rows up to block `after` are skipped.
+    """
+    if after is not None:
+        table = table.filter(pc.greater(table["block_number"], after))
+    pairs = (
+        table.group_by(["block_number", hash_field], use_threads=False)
+        .aggregate([])
+        .sort_by("block_number")
+    )
+    return unique_binary_values(pairs[hash_field]), pairs["block_number"].to_pylist()
@@ -0,0 +1,46 @@
+from dataclasses import dataclass
+
+from collector_engine.app.domain.pure.column_buffer import ColumnBuffer
+
+MB = 1 << 20
+
+
+@dataclass(frozen=True)
+class FlushPolicy:
+    """
+    When a collector buffer becomes a file, driven by bytes rather than rows.
+
+    - max_buffer_bytes: Arrow memory held by the buffer (ColumnBuffer.nbytes); bounds
+      memory on dense contracts (receipts with nested logs),
+    - target_file_bytes: estimated parquet size, buffer bytes * encoded_ratio
+      (zstd + dictionary ratio of the dataset, measured on real files),
+    - rows_per_file passed by the caller stays as a secondary cap.
+    None disables a limit.
+    """
+
+    max_buffer_bytes: int | None = 512 * MB
+    target_file_bytes: int | None = 128 * MB
+    encoded_ratio: float = 0.35
+
+    def __post_init__(self) -> None:
+        if not 0 < self.encoded_ratio <= 1:
+            raise ValueError("encoded_ratio must be in (0, 1]")
+
+    def estimated_file_bytes(self, buffer: ColumnBuffer) -> int:
+        return int(buffer.nbytes * self.encoded_ratio)
+
+    def should_flush(self, buffer: ColumnBuffer, *, rows_per_file: int) -> bool:
+        if len(buffer) == 0:
+            return False
+        if len(buffer) >= rows_per_file:
+            return True
+        if self.max_buffer_bytes is not None and buffer.nbytes >= self.max_buffer_bytes:
+            return True
+        return (
+            self.target_file_bytes is not None
+            and self.estimated_file_bytes(buffer) >= self.target_file_bytes
+        )
+
+
+# rows only, the behaviour before byte based flushing
+ROWS_ONLY = FlushPolicy(max_buffer_bytes=None, target_file_bytes=None)
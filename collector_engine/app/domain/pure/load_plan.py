@@ -0,0 +1,57 @@
+from collections.abc import Sequence
+
+
+def group_files(sizes: Sequence[int], *, target_bytes: int) -> list[list[int]]:
+    """
+    Indexes of consecutive files grouped into load transactions: a group is closed once
+    its files add up to target_bytes. target_bytes <= 0 gives one file per group.
+    """
+    groups: list[list[int]] = []
+    current: list[int] = []
+    current_bytes = 0
+    for i, size in enumerate(sizes):
+        current.append(i)
+        current_bytes += size
+        if current_bytes >= target_bytes:
+            groups.append(current)
+            current, current_bytes = [], 0
+    if current:
+        groups.append(current)
+    return groups
+
+
+def partition_starts(from_block: int, to_block: int, *, width: int) -> list[int]:
+    """First block of every `width` wide block partition covering [from_block, to_block]."""
+    return list(range(from_block - from_block % width, to_block + 1, width))
+
+
+def split_attachable(
+    ranges: Sequence[tuple[int, int, int]],
+    *,
+    width: int,
+    existing: set[tuple[int, int]],
+) -> tuple[dict[tuple[int, int], list[int]], list[int]]:
+    """
+    Files (chain_id, from_block, to_block) that can be bulk loaded into a partition of
+    their own and attached: the file lies within one block partition that does not
+    exist yet and no other file of the load reaches into that partition.
+    Returns ({(chain_id, partition start): file indexes}, other file indexes).
+    """
+    candidates: dict[tuple[int, int], list[int]] = {}
+    others: list[int] = []
+    touched: set[tuple[int, int]] = set()  # partitions written through the parent
+    for i, (chain_id, from_block, to_block) in enumerate(ranges):
+        starts = partition_starts(from_block, to_block, width=width)
+        if len(starts) == 1 and (chain_id, starts[0]) not in existing:
+            candidates.setdefault((chain_id, starts[0]), []).append(i)
+        else:
+            others.append(i)
+            touched.update((chain_id, start) for start in starts)
+
+    attachable: dict[tuple[int, int], list[int]] = {}
+    for key, indexes in candidates.items():
+        if key in touched:
+            others.extend(indexes)
+        else:
+            attachable[key] = indexes
+    return attachable, sorted(others)
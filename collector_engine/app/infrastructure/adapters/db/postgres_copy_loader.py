@@ -1,17 +1,162 @@
 from __future__ import annotations
 
-from datetime import datetime, timezone
+import queue
+import re
+import threading
+import time
+from collections.abc import Iterator, Mapping
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from dataclasses import dataclass
+from datetime import datetime, timezone
 from decimal import Decimal
 from pathlib import Path
-from typing import Any, Iterator
+from typing import Any
 
+import psycopg
 import pyarrow as pa
 import pyarrow.parquet as pq
-import psycopg
+from loguru import logger
 from psycopg.types.json import Jsonb
 
 from collector_engine.app.domain.ports.out import DatasetLoader, DatasetName
+from collector_engine.app.domain.pure.load_plan import (
+    group_files,
+    partition_starts,
+    split_attachable,
+)
+from collector_engine.app.infrastructure.adapters.db.pg_binary_copy import (
+    COPY_BINARY_HEADER,
+    COPY_BINARY_TRAILER,
+    PG_TYPES,
+    encode_batch,
+    json_safe,
+)
+from collector_engine.app.infrastructure.helpers.parquet import (
+    column_range_from_footer,
+    list_parquet_files,
+    parquet_fingerprint,
+)
+
+LOAD_LEDGER_TABLE = "raw._load_ledger"
+# UNLOGGED staging tables, <schema>.<target table>_<backend pid> (003_staging_schema.sql)
+STAGING_SCHEMA = "staging"
+
+# loading workers (connections) per dataset, overridden by the `parallelism` argument
+DEFAULT_LOAD_PARALLELISM: dict[str, int] = {"logs": 4, "txs": 2, "receipts": 2, "blocks": 2}
+# parquet bytes staged per transaction: small files share one INSERT into the target
+DEFAULT_GROUP_BYTES = 64 << 20
+
+# block range partitions of the raw.* tables (004_partitioned_raw.sql):
+# <table>_c<chain_id> / <table>_c<chain_id>_b<first block>
+_BLOCK_PARTITION = re.compile(r"_c(\d+)_b(\d+)$")
+
+
+class ParquetLoadError(Exception):
+    """
+    Raised by load_parquet_dir when some file groups failed. Every other group is
+    committed (and in the ledger), so a rerun retries only the failed files.
+
+    - errors: file name (relative to parquet_dir) -> exception of its group
+    """
+
+    def __init__(self, dataset: str, parquet_dir: Path, errors: dict[str, BaseException]) -> None:
+        self.dataset = dataset
+        self.parquet_dir = parquet_dir
+        self.errors = errors
+        first = errors[min(errors)]
+        super().__init__(
+            f"{dataset}: {len(errors)} files of {parquet_dir} failed to load, first: {first!r}"
+        )
+
+
+@dataclass(frozen=True)
+class _PendingFile:
+    path: Path
+    name: str  # relative to the loaded directory, ledger key
+    stamp: tuple[int, str]  # (size_bytes, fingerprint)
+
+
+@dataclass(frozen=True)
+class _LoadGroup:
+    files: list[_PendingFile]
+    # (chain_id, first block, end block) of a partition to create from these files alone
+    partition: tuple[int, int, int] | None = None
+
+
+def _file_blocks(path: Path, file_prefix: str) -> tuple[int, int, int] | None:
+    """
+    (chain_id, from_block, to_block) of a parquet file: the blocks from its FROM_TO
+    name (footer statistics for other names), the chain from the footer. None if the
+    file has no rows; raises ValueError if the rows cannot be placed in a partition.
+    """
+    metadata = pq.read_metadata(path)
+    if metadata.num_rows == 0:
+        return None
+    missing = {"chain_id", "block_number"} - set(metadata.schema.names)
+    if missing:
+        raise ValueError(f"{path} has no {sorted(missing)} column, cannot pick its partitions")
+    chains = column_range_from_footer(path, "chain_id")
+    if chains is None:
+        raise ValueError(f"{path} has no chain_id values, cannot pick its partitions")
+    if chains[0] != chains[1]:
+        raise ValueError(f"{path} holds rows of several chains {chains}")
+    try:
+        from_block, to_block = map(
+            int, path.name.removeprefix(file_prefix).removesuffix(".parquet").split("_")
+        )
+    except ValueError:
+        blocks = column_range_from_footer(path, "block_number")
+        if blocks is None:
+            raise ValueError(f"{path} has no block_number values, cannot pick its partitions")
+        from_block, to_block = blocks
+    return chains[0], from_block, to_block
+
+
+class _LoadProgress:
+    """Counters of one load_parquet_dir call, updated by its workers, logged per group."""
+
+    def __init__(self, *, dataset: str, table: str, total_files: int) -> None:
+        self.dataset = dataset
+        self.table = table
+        self.total_files = total_files
+        self.files = 0
+        self.rows = 0
+        self.inserted = 0
+        self.errors: dict[str, BaseException] = {}
+        self._started = time.monotonic()
+        self._lock = threading.Lock()
+
+    def done(self, names: list[str], rows: int, inserted: int) -> None:
+        with self._lock:
+            self.files += len(names)
+            self.rows += rows
+            self.inserted += inserted
+            files, total_rows, total_inserted = self.files, self.rows, self.inserted
+        elapsed = max(time.monotonic() - self._started, 1e-9)
+        logger.info(
+            "{} -> {}: {}/{} files, {} rows ({} new, {:.0f} rows/s)",
+            self.dataset,
+            self.table,
+            files,
+            self.total_files,
+            total_rows,
+            total_inserted,
+            total_rows / elapsed,
+        )
+
+    def failed(self, names: list[str], exc: BaseException) -> None:
+        with self._lock:
+            for name in names:
+                self.errors[name] = exc
+        logger.error(
+            "{} -> {}: rolled back {} files ({}): {!r}",
+            self.dataset,
+            self.table,
+            len(names),
+            ", ".join(names),
+            exc,
+        )
 
 
 @dataclass(frozen=True)
@@ -19,10 +164,12 @@ class CopySpec:
     table: str
     columns: list[str]
     kinds: dict[str, str]
+    key: list[str]  # primary key columns in index order (004_partitioned_raw.sql)
 
 
 LOGS_COPY_SPEC = CopySpec(
     table="raw.logs",
+    key=["chain_id", "block_number", "transaction_hash", "log_index"],
     columns=[
         "chain_id",
         "block_number",
@@ -55,6 +202,7 @@ LOGS_COPY_SPEC = CopySpec(
 
 TXS_COPY_SPEC = CopySpec(
     table="raw.transactions",
+    key=["chain_id", "block_number", "hash"],
     columns=[
         "chain_id",
         "block_hash",
@@ -103,6 +251,7 @@ TXS_COPY_SPEC = CopySpec(
 
 RECEIPTS_COPY_SPEC = CopySpec(
     table="raw.receipts",
+    key=["chain_id", "block_number", "transaction_hash"],
     columns=[
         "chain_id",
         "block_hash",
@@ -141,6 +290,7 @@ RECEIPTS_COPY_SPEC = CopySpec(
 
 BLOCKS_COPY_SPEC = CopySpec(
     table="analytics.blocks",
+    key=["chain_id", "block_number"],
     columns=[
         "chain_id",
         "block_number",
@@ -168,12 +318,50 @@ BLOCKS_COPY_SPEC = CopySpec(
 
 class PostgresCopyLoader(DatasetLoader):
     """
-    DatasetLoader implementation using PostgreSQL COPY ... FORMAT text
-    + temporary table  and INSERT ... ON CONFLICT.
+    DatasetLoader implementation using PostgreSQL COPY into UNLOGGED staging tables
+    and a set based INSERT of the new rows (_insert_new_rows).
+
+    copy_format="binary" (default) encodes whole RecordBatches column by column
+    (pg_binary_copy) into COPY ... FORMAT binary for the column types of the target
+    table; "text" keeps the per row path (_iter_py_rows + write_row).
+
+    Loaded files are recorded in raw._load_ledger (same transaction as their rows);
+    a file whose size and footer fingerprint match its ledger row is skipped, so
+    reruns only touch new or rewritten files.
+
+    Files are loaded by `parallelism[dataset]` workers, each with its own connection,
+    staging table and one transaction per file group (consecutive files up to
+    group_bytes, 0: one file per group). At most max_connections are open across all
+    datasets loaded concurrently through the same loader. A failed group is rolled back
+    alone; the others are committed and ParquetLoadError lists the failed files.
+
+    Block partitioned tables (004_partitioned_raw.sql) get the partitions covering the
+    FROM_TO range of the files before loading. With attach_partitions the files of a
+    block range that has no partition yet are loaded into a standalone table, indexed,
+    committed and then attached (_attach_partition) instead of inserted through the
+    parent.
     """
 
-    def __init__(self, dsn: str) -> None:
+    def __init__(
+        self,
+        dsn: str,
+        *,
+        copy_format: str = "binary",
+        max_connections: int = 8,
+        parallelism: Mapping[str, int] | None = None,
+        group_bytes: int = DEFAULT_GROUP_BYTES,
+        attach_partitions: bool = True,
+    ) -> None:
+        if copy_format not in ("binary", "text"):
+            raise ValueError(f"Unknown COPY format: {copy_format!r}")
+        if max_connections < 1:
+            raise ValueError("max_connections must be >= 1")
         self._dsn = dsn
+        self._copy_format = copy_format
+        self._slots = threading.BoundedSemaphore(max_connections)
+        self._parallelism = {**DEFAULT_LOAD_PARALLELISM, **(parallelism or {})}
+        self._group_bytes = group_bytes
+        self._attach_partitions = attach_partitions
 
     def load_parquet_dir(
         self,
@@ -185,6 +373,7 @@ class PostgresCopyLoader(DatasetLoader):
         spec = self._spec_for(dataset)
         self._copy_parquet_dir(
             parquet_dir=parquet_dir,
+            dataset=dataset,
             file_prefix=file_prefix,
             spec=spec,
             on_conflict="DO NOTHING",
@@ -205,73 +394,590 @@ class PostgresCopyLoader(DatasetLoader):
         self,
         *,
         parquet_dir: Path,
+        dataset: DatasetName,
         file_prefix: str,
         spec: CopySpec,
         on_conflict: str,
         batch_rows: int = 50_000,
     ) -> None:
+        # recursive: hive-partitioned datasets keep files in chain_id=/block_bucket= dirs
         files = sorted(
-            p
-            for p in parquet_dir.iterdir()
-            if p.is_file() and p.name.startswith(file_prefix) and p.suffix == ".parquet"
+            (parquet_dir / rel for rel in list_parquet_files(parquet_dir)),
+            key=lambda p: (p.name, p.as_posix()),
         )
+        files = [p for p in files if p.name.startswith(file_prefix)]
         if not files:
             return
 
-        with psycopg.connect(self._dsn) as conn:
-            for fp in files:
-                self._copy_one_file(
+        source_dir = parquet_dir.as_posix()
+        with self._connection() as conn:
+            self._drop_orphan_stages(conn)
+            loaded = self._read_ledger(conn, dataset=dataset, source_dir=source_dir)
+        pending: list[_PendingFile] = []
+        for fp in files:
+            file_name = fp.relative_to(parquet_dir).as_posix()
+            stamp = (fp.stat().st_size, parquet_fingerprint(fp))
+            if loaded.get(file_name) != stamp:
+                pending.append(_PendingFile(path=fp, name=file_name, stamp=stamp))
+        skipped = len(files) - len(pending)
+
+        groups: queue.SimpleQueue[_LoadGroup] = queue.SimpleQueue()
+        planned = self._plan_groups(pending, spec=spec, file_prefix=file_prefix) if pending else []
+        for group in planned:
+            groups.put(group)
+        workers = min(self._parallelism.get(dataset, 1), len(planned))
+        progress = _LoadProgress(dataset=dataset, table=spec.table, total_files=len(pending))
+
+        if workers:
+            with ThreadPoolExecutor(workers, thread_name_prefix=f"load-{dataset}") as executor:
+                futures = [
+                    executor.submit(
+                        self._load_groups,
+                        groups,
+                        dataset=dataset,
+                        source_dir=source_dir,
+                        spec=spec,
+                        on_conflict=on_conflict,
+                        batch_rows=batch_rows,
+                        progress=progress,
+                    )
+                    for _ in range(workers)
+                ]
+            for future in futures:
+                future.result()  # connection errors, not per group failures
+
+        logger.info(
+            "Loaded {} {} files from {} into {} ({} already loaded, {} failed, {} connections)",
+            progress.files,
+            dataset,
+            parquet_dir,
+            spec.table,
+            skipped,
+            len(progress.errors),
+            workers,
+        )
+        if progress.errors:
+            raise ParquetLoadError(dataset, parquet_dir, progress.errors)
+
+    def _plan_groups(
+        self, pending: list[_PendingFile], *, spec: CopySpec, file_prefix: str
+    ) -> list[_LoadGroup]:
+        """
+        Load groups of the pending files. On a block partitioned table the partitions
+        the files need are created here, in their own transaction (creating a partition
+        locks the parent, never done while holding rows of a load transaction).
+        A file with rows but no readable chain / block range fails the whole plan
+        (ValueError) before anything is loaded.
+        """
+        regular = list(range(len(pending)))
+        new_partitions: list[_LoadGroup] = []
+        with self._connection() as conn:
+            width = self._partition_width(conn, spec)
+            if width is not None:
+                # empty files need no partition, the ledger still records them
+                blocks = {
+                    i: r
+                    for i, f in enumerate(pending)
+                    if (r := _file_blocks(f.path, file_prefix)) is not None
+                }
+                known = list(blocks)
+                if self._attach_partitions:
+                    by_partition, _ = split_attachable(
+                        [blocks[i] for i in known],
+                        width=width,
+                        existing=self._existing_partitions(conn, spec),
+                    )
+                    attached = {known[i] for indexes in by_partition.values() for i in indexes}
+                    regular = [i for i in regular if i not in attached]
+                    new_partitions = [
+                        _LoadGroup(
+                            files=[pending[known[i]] for i in indexes],
+                            partition=(chain_id, start, start + width),
+                        )
+                        for (chain_id, start), indexes in sorted(by_partition.items())
+                    ]
+                needed = {
+                    (blocks[i][0], start)
+                    for i in regular
+                    if i in blocks
+                    for start in partition_starts(blocks[i][1], blocks[i][2], width=width)
+                }
+                self._ensure_partitions(
                     conn,
-                    fp,
-                    spec=spec,
-                    on_conflict=on_conflict,
-                    batch_rows=batch_rows,
+                    spec,
+                    chains={g.partition[0] for g in new_partitions if g.partition is not None},
+                    partitions=needed,
                 )
-            conn.commit()
 
-    def _copy_one_file(
+        sizes = [pending[i].stamp[0] for i in regular]
+        # whole new block ranges first: they are the big ones
+        return new_partitions + [
+            _LoadGroup(files=[pending[regular[j]] for j in indexes])
+            for indexes in group_files(sizes, target_bytes=self._group_bytes)
+        ]
+
+    def _partition_width(self, conn: psycopg.Connection, spec: CopySpec) -> int | None:
+        """Block range width of a table partitioned by 004_partitioned_raw.sql, else None."""
+        with conn.cursor() as cur:
+            cur.execute("SELECT relkind FROM pg_class WHERE oid = %s::regclass", (spec.table,))
+            row = cur.fetchone()
+            if row is None or row[0] != "p":
+                return None
+            cur.execute("SELECT raw.block_partition_width()")
+            width = cur.fetchone()
+            assert width is not None
+            return int(width[0])
+
+    def _existing_partitions(
+        self, conn: psycopg.Connection, spec: CopySpec
+    ) -> set[tuple[int, int]]:
+        """(chain_id, first block) of the block partitions of the table."""
+        with conn.cursor() as cur:
+            cur.execute(
+                """
+                SELECT c.relname FROM pg_partition_tree(%s::regclass) p
+                JOIN pg_class c ON c.oid = p.relid
+                WHERE p.isleaf
+                """,
+                (spec.table,),
+            )
+            names = [name for (name,) in cur.fetchall()]
+        return {
+            (int(m.group(1)), int(m.group(2)))
+            for m in map(_BLOCK_PARTITION.search, names)
+            if m is not None
+        }
+
+    def _ensure_partitions(
         self,
         conn: psycopg.Connection,
-        parquet_file: Path,
+        spec: CopySpec,
         *,
+        chains: set[int],
+        partitions: set[tuple[int, int]],
+    ) -> None:
+        with conn.cursor() as cur:
+            for chain_id in sorted(chains):
+                cur.execute(
+                    "SELECT raw.ensure_chain_partition(%s::regclass, %s)", (spec.table, chain_id)
+                )
+            for chain_id, start in sorted(partitions):
+                cur.execute(
+                    "SELECT raw.ensure_block_partition(%s::regclass, %s, %s)",
+                    (spec.table, chain_id, start),
+                )
+        conn.commit()
+        if partitions:
+            logger.info("Ensured {} block partitions of {}", len(partitions), spec.table)
+
+    @contextmanager
+    def _connection(self) -> Iterator[psycopg.Connection]:
+        """A connection counted against max_connections, shared by concurrent loads."""
+        with self._slots, psycopg.connect(self._dsn) as conn:
+            yield conn
+
+    def _load_groups(
+        self,
+        groups: queue.SimpleQueue[_LoadGroup],
+        *,
+        dataset: str,
+        source_dir: str,
         spec: CopySpec,
         on_conflict: str,
         batch_rows: int,
+        progress: _LoadProgress,
     ) -> None:
-        tmp = f"tmp_{spec.table.replace('.', '_')}"
+        """
+        Worker: takes file groups off the queue until it is empty and loads them
+        (_load_group) through the worker's staging table. A failed group is rolled back
+        and recorded in `progress`; a broken connection is replaced.
+        """
+        while not groups.empty():
+            with self._connection() as conn:
+                stage = self._create_stage(conn, spec)
+                pg_types = self._column_types(conn, spec) if self._copy_format == "binary" else []
+                # end the catalog reads: in a transaction, conn.transaction() below would
+                # only open a savepoint and every group would commit with the connection
+                conn.commit()
+                while not conn.broken:
+                    try:
+                        group = groups.get_nowait()
+                    except queue.Empty:
+                        break
+                    names = [f.name for f in group.files]
+                    try:
+                        rows, inserted = self._load_group(
+                            conn,
+                            group,
+                            dataset=dataset,
+                            source_dir=source_dir,
+                            stage=stage,
+                            spec=spec,
+                            on_conflict=on_conflict,
+                            pg_types=pg_types,
+                            batch_rows=batch_rows,
+                        )
+                    except Exception as exc:  # noqa: BLE001 - fails the group only
+                        progress.failed(names, exc)
+                    else:
+                        progress.done(names, rows, inserted)
+                if not conn.broken:
+                    self._drop_stage(conn, stage)
 
-        # cytation np. "from"
-        cols_sql = ", ".join(f'"{c}"' for c in spec.columns)
+    def _load_group(
+        self,
+        conn: psycopg.Connection,
+        group: _LoadGroup,
+        *,
+        dataset: str,
+        source_dir: str,
+        stage: str,
+        spec: CopySpec,
+        on_conflict: str,
+        pg_types: list[str],
+        batch_rows: int,
+    ) -> tuple[int, int]:
+        """
+        Load one file group; returns (rows staged, rows inserted).
 
-        create_tmp = f"""
-            DROP TABLE IF EXISTS {tmp};
-            CREATE TEMP TABLE {tmp}
-            (LIKE {spec.table} INCLUDING DEFAULTS)
-            ON COMMIT DROP;
+        Regular groups: files COPYed into the stage, new rows inserted and ledger rows in
+        one transaction. Groups of a new block range: the standalone partition table is
+        built and committed first, ATTACH (it locks the parent) and the ledger rows follow
+        in a short transaction of their own. A session lock on the partition keeps other
+        loaders off the range in between; an unattached table left by a failed ATTACH is
+        rebuilt by the next load of the range.
         """
+        if group.partition is not None:
+            self._lock_partition(conn, spec, group.partition, lock=True)
+        try:
+            built: int | None = None
+            with conn.transaction():
+                file_rows = [
+                    self._copy_to_stage(
+                        conn,
+                        f.path,
+                        stage=stage,
+                        spec=spec,
+                        pg_types=pg_types,
+                        batch_rows=batch_rows,
+                    )
+                    for f in group.files
+                ]
+                if group.partition is not None:
+                    built = self._build_partition(
+                        conn, stage=stage, spec=spec, partition=group.partition
+                    )
+                if built is None:
+                    inserted = self._insert_new_rows(
+                        conn, stage=stage, spec=spec, on_conflict=on_conflict
+                    )
+                    self._record_group(conn, group, file_rows, dataset, source_dir)
 
-        copy_sql = f"""
-            COPY {tmp} ({cols_sql})
-            FROM STDIN
-            WITH (FORMAT text);
+            if built is not None and group.partition is not None:
+                with conn.transaction():
+                    self._attach_partition(conn, spec=spec, partition=group.partition)
+                    self._record_group(conn, group, file_rows, dataset, source_dir)
+                inserted = built
+        finally:
+            if group.partition is not None and not conn.broken:
+                self._lock_partition(conn, spec, group.partition, lock=False)
+        return sum(file_rows), inserted
+
+    def _record_group(
+        self,
+        conn: psycopg.Connection,
+        group: _LoadGroup,
+        file_rows: list[int],
+        dataset: str,
+        source_dir: str,
+    ) -> None:
+        for f, rows in zip(group.files, file_rows, strict=True):
+            self._record_loaded(
+                conn,
+                dataset=dataset,
+                source_dir=source_dir,
+                file_name=f.name,
+                stamp=f.stamp,
+                rows=rows,
+            )
+
+    def _create_stage(self, conn: psycopg.Connection, spec: CopySpec) -> str:
         """
+        The UNLOGGED staging table of this connection for `spec.table`, created once per
+        worker and emptied by every group, instead of a temp table per file.
+        """
+        with conn.cursor() as cur:
+            cur.execute("SELECT pg_backend_pid()")
+            row = cur.fetchone()
+            assert row is not None
+            stage = f"{STAGING_SCHEMA}.{spec.table.replace('.', '_')}_{row[0]}"
+            cur.execute(
+                f"""
+                CREATE UNLOGGED TABLE IF NOT EXISTS {stage}
+                (LIKE {spec.table} INCLUDING DEFAULTS);
+                TRUNCATE {stage};
+                """
+            )
+        conn.commit()
+        return stage
 
-        insert_sql = f"""
-            INSERT INTO {spec.table} ({cols_sql})
-            SELECT {cols_sql} FROM {tmp}
-            ON CONFLICT {on_conflict};
+    def _drop_stage(self, conn: psycopg.Connection, stage: str) -> None:
+        with conn.cursor() as cur:
+            cur.execute(f"DROP TABLE IF EXISTS {stage}")
+        conn.commit()
+
+    def _drop_orphan_stages(self, conn: psycopg.Connection) -> None:
+        """Staging tables of backends that are gone (a loader killed mid load)."""
+        with conn.cursor() as cur:
+            cur.execute(
+                """
+                SELECT c.relname FROM pg_class c
+                JOIN pg_namespace n ON n.oid = c.relnamespace
+                WHERE n.nspname = %s AND c.relkind = 'r'
+                AND substring(c.relname FROM '_([0-9]+)$')::int
+                    NOT IN (SELECT pid FROM pg_stat_activity)
+                """,
+                (STAGING_SCHEMA,),
+            )
+            orphans = [name for (name,) in cur.fetchall()]
+            for name in orphans:
+                cur.execute(f'DROP TABLE IF EXISTS {STAGING_SCHEMA}."{name}"')
+        conn.commit()
+        if orphans:
+            logger.info("Dropped {} orphan staging tables: {}", len(orphans), orphans)
+
+    def _partition_name(self, spec: CopySpec, partition: tuple[int, int, int]) -> str:
+        chain_id, start, _ = partition
+        return f"{spec.table}_c{chain_id}_b{start}"
+
+    def _lock_partition(
+        self,
+        conn: psycopg.Connection,
+        spec: CopySpec,
+        partition: tuple[int, int, int],
+        *,
+        lock: bool,
+    ) -> None:
+        """
+        Take / release the session level advisory lock of a partition name: it outlives
+        the build and attach transactions and conflicts with the transaction level lock
+        of raw.ensure_block_partition.
         """
+        func = "pg_advisory_lock" if lock else "pg_advisory_unlock"
+        with conn.cursor() as cur:
+            cur.execute(f"SELECT {func}(hashtext(%s))", (self._partition_name(spec, partition),))
+        conn.commit()  # end the implicit transaction, the session lock stays
+
+    def _build_partition(
+        self,
+        conn: psycopg.Connection,
+        *,
+        stage: str,
+        spec: CopySpec,
+        partition: tuple[int, int, int],
+    ) -> int | None:
+        """
+        Attach-partition fast path for a block range without a partition: the staged rows
+        go into a standalone <partition>_load table (no index to maintain while loading),
+        its primary key and indexes are built afterwards, and a CHECK constraint of the
+        partition bounds lets ATTACH skip its validation scan. Returns the inserted row
+        count, None if another loader created the partition meanwhile (the caller inserts
+        as usual).
+        """
+        chain_id, start, end = partition
+        part = self._partition_name(spec, partition)
+        name = part.split(".")[1]
+        cols_sql = ", ".join(f'"{c}"' for c in spec.columns)
+        key_sql = ", ".join(f'"{c}"' for c in spec.key)
+
+        with conn.cursor() as cur:
+            cur.execute("SELECT to_regclass(%s) IS NOT NULL", (part,))
+            row = cur.fetchone()
+            assert row is not None
+            if row[0]:
+                return None
+
+            # left unattached by a failed ATTACH: its rows are not in the ledger
+            cur.execute(f"DROP TABLE IF EXISTS {part}_load")
+            cur.execute(f"CREATE TABLE {part}_load (LIKE {spec.table} INCLUDING DEFAULTS)")
+            cur.execute(
+                f"""
+                INSERT INTO {part}_load ({cols_sql})
+                SELECT DISTINCT ON ({key_sql}) {cols_sql} FROM {stage}
+                """
+            )
+            inserted = cur.rowcount
+            cur.execute(f"TRUNCATE {stage}")
+            cur.execute(f"ALTER TABLE {part}_load ADD PRIMARY KEY ({key_sql})")
+            cur.execute(f"CREATE INDEX ON {part}_load (chain_id, block_number)")
+            cur.execute(
+                f"""
+                ALTER TABLE {part}_load ADD CONSTRAINT {name}_bounds CHECK (
+                    chain_id = {chain_id} AND block_number >= {start} AND block_number < {end}
+                )
+                """
+            )
+        return inserted
 
+    def _attach_partition(
+        self, conn: psycopg.Connection, *, spec: CopySpec, partition: tuple[int, int, int]
+    ) -> None:
+        """ATTACH the table built by _build_partition; its CHECK constraint skips the scan."""
+        chain_id, start, end = partition
+        part = self._partition_name(spec, partition)
+        name = part.split(".")[1]
+        with conn.cursor() as cur:
+            cur.execute(f"ALTER TABLE {part}_load RENAME TO {name}")
+            cur.execute(
+                f"""
+                ALTER TABLE {spec.table}_c{chain_id}
+                ATTACH PARTITION {part} FOR VALUES FROM ({start}) TO ({end})
+                """
+            )
+            cur.execute(f"ALTER TABLE {part} DROP CONSTRAINT {name}_bounds")
+        logger.info("Attached {}", part)
+
+    def _read_ledger(
+        self, conn: psycopg.Connection, *, dataset: str, source_dir: str
+    ) -> dict[str, tuple[int, str]]:
+        with conn.cursor() as cur:
+            cur.execute(
+                f"""
+                SELECT file_name, size_bytes, fingerprint FROM {LOAD_LEDGER_TABLE}
+                WHERE dataset = %s AND source_dir = %s
+                """,
+                (dataset, source_dir),
+            )
+            return {name: (size, fingerprint) for name, size, fingerprint in cur.fetchall()}
+
+    def _record_loaded(
+        self,
+        conn: psycopg.Connection,
+        *,
+        dataset: str,
+        source_dir: str,
+        file_name: str,
+        stamp: tuple[int, str],
+        rows: int,
+    ) -> None:
         with conn.cursor() as cur:
-            cur.execute(create_tmp)
+            cur.execute(
+                f"""
+                INSERT INTO {LOAD_LEDGER_TABLE}
+                    (dataset, source_dir, file_name, size_bytes, fingerprint, rows)
+                VALUES (%s, %s, %s, %s, %s, %s)
+                ON CONFLICT (dataset, source_dir, file_name) DO UPDATE
+                SET size_bytes = EXCLUDED.size_bytes,
+                    fingerprint = EXCLUDED.fingerprint,
+                    rows = EXCLUDED.rows,
+                    loaded_at = now()
+                """,
+                (dataset, source_dir, file_name, *stamp, rows),
+            )
+
+    def _copy_to_stage(
+        self,
+        conn: psycopg.Connection,
+        parquet_file: Path,
+        *,
+        stage: str,
+        spec: CopySpec,
+        pg_types: list[str],
+        batch_rows: int,
+    ) -> int:
+        """COPY one parquet file into the staging table; returns its row count."""
+        # cytation np. "from"
+        cols_sql = ", ".join(f'"{c}"' for c in spec.columns)
+
+        copy_sql = f"""
+            COPY {stage} ({cols_sql})
+            FROM STDIN
+            WITH (FORMAT {self._copy_format});
+        """
 
-            pf = pq.ParquetFile(parquet_file)
-            with cur.copy(copy_sql) as copy:
+        pf = pq.ParquetFile(parquet_file)
+        with conn.cursor() as cur, cur.copy(copy_sql) as copy:
+            if self._copy_format == "binary":
+                # block mode: header and trailer are part of the written data
+                copy.write(COPY_BINARY_HEADER)
+                for batch in pf.iter_batches(batch_size=batch_rows, columns=spec.columns):
+                    copy.write(encode_batch(batch, spec.columns, pg_types))
+                copy.write(COPY_BINARY_TRAILER)
+            else:
                 for batch in pf.iter_batches(batch_size=batch_rows):
                     for row in self._iter_py_rows(batch, spec):
                         copy.write_row(row)
 
+        return pf.metadata.num_rows
+
+    def _insert_new_rows(
+        self, conn: psycopg.Connection, *, stage: str, spec: CopySpec, on_conflict: str
+    ) -> int:
+        """
+        Insert the staged rows missing from the target table, set based, then empty the
+        stage; returns the inserted row count.
+
+        Rows above the chain's highest stored block are new by construction; only the
+        others are anti-joined on the primary key. Duplicates inside the stage (files
+        overlapping) are dropped with DISTINCT ON; ON CONFLICT only guards against
+        concurrent loaders of the same rows.
+        """
+        cols_sql = ", ".join(f'"{c}"' for c in spec.columns)
+        staged_cols_sql = ", ".join(f's."{c}"' for c in spec.columns)
+        key_sql = ", ".join(f'"{c}"' for c in spec.key)
+        key_match = " AND ".join(f't."{c}" = s."{c}"' for c in spec.key)
+        # no stored block yet (NULL watermark): every staged row is new
+        fresh = "coalesce(s.block_number > w.max_block, w.max_block IS NULL)"
+
+        # two branches so that NOT EXISTS stays a plain (hash / merge) anti-join
+        insert_sql = f"""
+            WITH watermark AS (
+                SELECT c.chain_id, (
+                    SELECT max(t.block_number) FROM {spec.table} t
+                    WHERE t.chain_id = c.chain_id
+                ) AS max_block
+                FROM (SELECT DISTINCT chain_id FROM {stage}) c
+            )
+            INSERT INTO {spec.table} ({cols_sql})
+            SELECT DISTINCT ON ({key_sql}) {cols_sql}
+            FROM (
+                SELECT {staged_cols_sql}
+                FROM {stage} s JOIN watermark w ON w.chain_id = s.chain_id
+                WHERE {fresh}
+                UNION ALL
+                SELECT {staged_cols_sql}
+                FROM {stage} s JOIN watermark w ON w.chain_id = s.chain_id
+                WHERE NOT {fresh}
+                AND NOT EXISTS (SELECT 1 FROM {spec.table} t WHERE {key_match})
+            ) s
+            ON CONFLICT {on_conflict};
+        """
+
+        with conn.cursor() as cur:
             cur.execute(insert_sql)
+            inserted = cur.rowcount
+            cur.execute(f"TRUNCATE {stage}")
+        return inserted
+
+    def _column_types(self, conn: psycopg.Connection, spec: CopySpec) -> list[str]:
+        """typname of every spec column in the target table, in spec order."""
+        with conn.cursor() as cur:
+            cur.execute(
+                """
+                SELECT a.attname, t.typname
+                FROM pg_attribute a JOIN pg_type t ON t.oid = a.atttypid
+                WHERE a.attrelid = %s::regclass AND a.attnum > 0 AND NOT a.attisdropped
+                """,
+                (spec.table,),
+            )
+            types: dict[str, str] = dict(cur.fetchall())
+        missing = [c for c in spec.columns if c not in types]
+        if missing:
+            raise KeyError(f"Columns {missing} not found in {spec.table}")
+        unsupported = {types[c] for c in spec.columns} - PG_TYPES
+        if unsupported:
+            raise ValueError(f"No binary COPY encoding for {sorted(unsupported)} ({spec.table})")
+        return [types[c] for c in spec.columns]
 
     def _iter_py_rows(self, batch: pa.RecordBatch, spec: CopySpec) -> Iterator[list[Any]]:
         """
@@ -279,20 +985,6 @@ class PostgresCopyLoader(DatasetLoader):
         No manual string building, no NUL characters.
         """
 
-        def _json_safe(v: Any) -> Any:
-            # Recursively convert bytes into hex strings for JSONB
-            if v is None:
-                return None
-            if isinstance(v, (bytes, bytearray, memoryview)):
-                b = bytes(v) if not isinstance(v, bytes) else v
-                return "0x" + b.hex()
-            if isinstance(v, dict):
-                return {k: _json_safe(val) for k, val in v.items()}
-            if isinstance(v, list):
-                return [_json_safe(x) for x in v]
-            # Arrow may return Decimal, int, bool, str directly which are JSON-safe
-            return v
-
         cols: dict[str, pa.Array] = {}
         schema = batch.schema
         present = set(schema.names)
@@ -337,7 +1029,7 @@ class PostgresCopyLoader(DatasetLoader):
                     row.append(s)
                 elif kind == "json":
                     # list/dict -> jsonb, ensure bytes are JSON-serializable
-                    row.append(Jsonb(_json_safe(val)))
+                    row.append(Jsonb(json_safe(val)))
                 elif kind == "ts":
                     # unix epoch seconds -> timestamptz (UTC)
                     # Parquet daje tu int (np. 1740051563)
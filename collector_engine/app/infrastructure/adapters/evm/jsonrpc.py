@@ -0,0 +1,156 @@
+from __future__ import annotations
+
+import asyncio
+import itertools
+from collections.abc import Sequence
+from typing import Any
+
+import aiohttp
+
+
+class JsonRpcError(Exception):
+    """Error object returned by the endpoint for a single JSON-RPC request."""
+
+    def __init__(self, method: str, params: Any, error: dict[str, Any]) -> None:
+        self.method = method
+        self.params = params
+        self.code = error.get("code")
+        self.error = error
+        super().__init__(f"{method}{list(params)}: {error.get('message')} (code={self.code})")
+
+
+class JsonRpcBatchError(Exception):
+    """
+    Raised by call_many when some items failed.
+
+    - results: per-position results, None where the item failed
+    - errors: position -> JsonRpcError for every failed item
+    """
+
+    def __init__(self, method: str, results: list[Any], errors: dict[int, JsonRpcError]) -> None:
+        self.method = method
+        self.results = results
+        self.errors = errors
+        first = errors[min(errors)]
+        super().__init__(
+            f"{method}: {len(errors)} of {len(results)} batched requests failed, first: {first}"
+        )
+
+
+def _chunks(items: Sequence[Any], size: int) -> list[Sequence[Any]]:
+    return [items[i : i + size] for i in range(0, len(items), size)]
+
+
+class JsonRpcClient:
+    """
+    Minimal JSON-RPC 2.0 client over a pooled aiohttp session.
+
+    - call: a single request
+    - call_many: packs requests into array (batch) payloads of batch_size and
+      demultiplexes responses by request id, so item errors do not fail the whole batch.
+    At most max_in_flight HTTP requests (single or batch) are open at once.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        *,
+        batch_size: int = 100,
+        max_in_flight: int = 4,
+        request_timeout: float = 30.0,
+    ) -> None:
+        if batch_size < 1:
+            raise ValueError(f"batch_size must be >= 1, got {batch_size}")
+        self.url = url
+        self.batch_size = batch_size
+        self._timeout = aiohttp.ClientTimeout(total=request_timeout)
+        self._max_connections = max_in_flight
+        self._sem = asyncio.Semaphore(max_in_flight)
+        self._ids = itertools.count(1)
+        self._session: aiohttp.ClientSession | None = None
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=self._max_connections),
+                timeout=self._timeout,
+                headers={"Content-Type": "application/json"},
+            )
+        return self._session
+
+    async def close(self) -> None:
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+    async def _post(self, payload: Any) -> Any:
+        async with self._sem, self._get_session().post(self.url, json=payload) as resp:
+            resp.raise_for_status()
+            return await resp.json(content_type=None)
+
+    def _request(self, method: str, params: Sequence[Any]) -> dict[str, Any]:
+        return {"jsonrpc": "2.0", "id": next(self._ids), "method": method, "params": list(params)}
+
+    async def call(self, method: str, params: Sequence[Any], *, allow_null: bool = True) -> Any:
+        response = await self._post(self._request(method, params))
+        if "error" in response:
+            raise JsonRpcError(method, params, response["error"])
+        result = response.get("result")
+        if result is None and not allow_null:
+            raise JsonRpcError(method, params, {"message": "null result"})
+        return result
+
+    async def _call_chunk(
+        self, method: str, params_chunk: Sequence[Sequence[Any]]
+    ) -> list[tuple[Any, dict[str, Any] | None]]:
+        requests = [self._request(method, p) for p in params_chunk]
+        response = await self._post(requests)
+
+        if isinstance(response, dict):
+            # the endpoint rejected the batch as a whole (e.g. batch too large)
+            error = response.get("error") or {"message": f"unexpected response: {response!r}"}
+            return [(None, error)] * len(requests)
+
+        by_id = {item.get("id"): item for item in response if isinstance(item, dict)}
+        out: list[tuple[Any, dict[str, Any] | None]] = []
+        for req in requests:
+            item = by_id.get(req["id"])
+            if item is None:
+                out.append((None, {"message": "no response for request id"}))
+            elif "error" in item:
+                out.append((None, item["error"]))
+            else:
+                out.append((item.get("result"), None))
+        return out
+
+    async def call_many(
+        self,
+        method: str,
+        params_list: Sequence[Sequence[Any]],
+        *,
+        allow_null: bool = False,
+    ) -> list[Any]:
+        """
+        Call `method` once per params entry and return results in input order.
+        A null result counts as an item error unless allow_null=True.
+        Raises JsonRpcBatchError (carrying the successful results) if any item failed.
+        """
+        if not params_list:
+            return []
+
+        chunk_results = await asyncio.gather(
+            *(self._call_chunk(method, chunk) for chunk in _chunks(params_list, self.batch_size))
+        )
+
+        results: list[Any] = []
+        errors: dict[int, JsonRpcError] = {}
+        for pos, (result, error) in enumerate(itertools.chain.from_iterable(chunk_results)):
+            if error is None and result is None and not allow_null:
+                error = {"message": "null result"}
+            if error is not None:
+                errors[pos] = JsonRpcError(method, params_list[pos], error)
+            results.append(result)
+
+        if errors:
+            raise JsonRpcBatchError(method, results, errors)
+        return results
@@ -0,0 +1,124 @@
+"""
+Typed decoders for raw JSON-RPC results.
+
+They turn hex quantities into int and hex data into bytes in a single pass,
+driven by a per-type field table, and leave fields the domain normalizers do
+not read untouched. The resulting plain dict records are accepted by
+log_to_row / transaction_to_row / receipt_to_row / block_to_row as they are,
+without web3.py's AttributeDict, HexBytes and checksum-address formatting.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+from typing import Any
+
+Decoder = Callable[[Any], Any]
+
+
+def hex_to_int(x: str) -> int:
+    return int(x, 16)
+
+
+def hex_to_bytes(x: str) -> bytes:
+    s = x.removeprefix("0x")
+    if len(s) % 2:
+        s = "0" + s
+    return bytes.fromhex(s)
+
+
+def _list_of(decoder: Decoder) -> Decoder:
+    def decode(items: list[Any]) -> list[Any]:
+        return [decoder(i) for i in items]
+
+    return decode
+
+
+def _record(fields: dict[str, Decoder]) -> Callable[[dict[str, Any]], dict[str, Any]]:
+    items = tuple(fields.items())
+
+    def decode(raw: dict[str, Any]) -> dict[str, Any]:
+        out = dict(raw)
+        for name, decoder in items:
+            value = raw.get(name)
+            if value is not None:
+                out[name] = decoder(value)
+        return out
+
+    return decode
+
+
+decode_log = _record(
+    {
+        "address": hex_to_bytes,
+        "blockHash": hex_to_bytes,
+        "blockNumber": hex_to_int,
+        "data": hex_to_bytes,
+        "logIndex": hex_to_int,
+        "topics": _list_of(hex_to_bytes),
+        "transactionHash": hex_to_bytes,
+        "transactionIndex": hex_to_int,
+    }
+)
+
+_decode_access_list_entry = _record(
+    {
+        "address": hex_to_bytes,
+        "storageKeys": _list_of(hex_to_bytes),
+    }
+)
+
+decode_transaction = _record(
+    {
+        "blockHash": hex_to_bytes,
+        "blockNumber": hex_to_int,
+        "transactionIndex": hex_to_int,
+        "from": hex_to_bytes,
+        "to": hex_to_bytes,
+        "gas": hex_to_int,
+        "gasPrice": hex_to_int,
+        "maxFeePerGas": hex_to_int,
+        "maxPriorityFeePerGas": hex_to_int,
+        "hash": hex_to_bytes,
+        "input": hex_to_bytes,
+        "nonce": hex_to_int,
+        "value": hex_to_int,
+        "type": hex_to_int,
+        "v": hex_to_int,
+        "r": hex_to_bytes,
+        "s": hex_to_bytes,
+        "yParity": hex_to_int,
+        "accessList": _list_of(_decode_access_list_entry),
+    }
+)
+
+decode_receipt = _record(
+    {
+        "blockHash": hex_to_bytes,
+        "blockNumber": hex_to_int,
+        "transactionHash": hex_to_bytes,
+        "transactionIndex": hex_to_int,
+        "from": hex_to_bytes,
+        "to": hex_to_bytes,
+        "contractAddress": hex_to_bytes,
+        "status": hex_to_int,
+        "type": hex_to_int,
+        "gasUsed": hex_to_int,
+        "cumulativeGasUsed": hex_to_int,
+        "effectiveGasPrice": hex_to_int,
+        "logsBloom": hex_to_bytes,
+        "logs": _list_of(decode_log),
+    }
+)
+
+decode_block = _record(
+    {
+        "number": hex_to_int,
+        "hash": hex_to_bytes,
+        "parentHash": hex_to_bytes,
+        "timestamp": hex_to_int,
+        "gasUsed": hex_to_int,
+        "gasLimit": hex_to_int,
+        "baseFeePerGas": hex_to_int,
+    }
+)
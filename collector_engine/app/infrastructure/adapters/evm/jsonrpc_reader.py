@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Callable, Iterable, Sequence
+from typing import Any, cast
+
+from web3.types import BlockData, LogReceipt, TxData, TxReceipt
+
+from collector_engine.app.infrastructure.adapters.evm.jsonrpc import JsonRpcClient
+from collector_engine.app.infrastructure.adapters.evm.jsonrpc_decoders import (
+    decode_block,
+    decode_log,
+    decode_receipt,
+    decode_transaction,
+    hex_to_int,
+)
+
+
+class JsonRpcEvmReader:
+    """
+    Lean EvmReader implementation that talks JSON-RPC directly over a pooled
+    aiohttp session and skips web3.py's middleware and result formatters.
+
+    Results are decoded by the typed decoders in jsonrpc_decoders into plain
+    dict records (ints and raw bytes) that the domain normalizers accept as is.
+    With batch_size > 0 hash/block lookups are sent as JSON-RPC batches.
+    """
+
+    def __init__(
+        self,
+        provider_url: str,
+        *,
+        max_concurrency: int = 16,
+        request_timeout: float = 30.0,
+        batch_size: int = 0,
+    ):
+        self._batch_size = batch_size
+        self._client = JsonRpcClient(
+            provider_url,
+            batch_size=max(batch_size, 1),
+            max_in_flight=max_concurrency,
+            request_timeout=request_timeout,
+        )
+
+    async def close(self) -> None:
+        await self._client.close()
+
+    async def _call_each(
+        self,
+        method: str,
+        params_list: list[list[Any]],
+        decoder: Callable[[dict[str, Any]], dict[str, Any]],
+    ) -> list[dict[str, Any]]:
+        if self._batch_size > 0:
+            results = await self._client.call_many(method, params_list)
+        else:
+            results = await asyncio.gather(
+                *(self._client.call(method, p, allow_null=False) for p in params_list)
+            )
+        return [decoder(r) for r in results]
+
+    async def latest_block_number(self) -> int:
+        return hex_to_int(await self._client.call("eth_blockNumber", []))
+
+    async def get_logs(
+        self, *, address: bytes | Sequence[bytes], from_block: int, to_block: int
+    ) -> Sequence[LogReceipt]:
+        if isinstance(address, bytes):
+            addr: str | list[str] = "0x" + address.hex()
+        else:
+            addr = ["0x" + a.hex() for a in address]
+        result = await self._client.call(
+            "eth_getLogs",
+            [
+                {
+                    "fromBlock": hex(from_block),
+                    "toBlock": hex(to_block),
+                    "address": addr,
+                }
+            ],
+        )
+        return cast(Sequence[LogReceipt], [decode_log(lg) for lg in result or []])
+
+    async def get_transactions(self, hashes: Iterable[bytes]) -> Sequence[TxData]:
+        params = [["0x" + h.hex()] for h in hashes]
+        txs = await self._call_each("eth_getTransactionByHash", params, decode_transaction)
+        return cast(Sequence[TxData], txs)
+
+    async def get_receipts(self, hashes: Iterable[bytes]) -> Sequence[TxReceipt]:
+        params = [["0x" + h.hex()] for h in hashes]
+        receipts = await self._call_each("eth_getTransactionReceipt", params, decode_receipt)
+        return cast(Sequence[TxReceipt], receipts)
+
+    async def get_block(self, number: int) -> BlockData:
+        block = await self._client.call(
+            "eth_getBlockByNumber", [hex(number), False], allow_null=False
+        )
+        return cast(BlockData, decode_block(block))
+
+    async def get_blocks_range(self, from_block: int, to_block: int) -> Sequence[BlockData]:
+        if to_block < from_block:
+            return []
+
+        params = [[hex(n), False] for n in range(from_block, to_block + 1)]
+        blocks = await self._call_each("eth_getBlockByNumber", params, decode_block)
+        return cast(Sequence[BlockData], blocks)
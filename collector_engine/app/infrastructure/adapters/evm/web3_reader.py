@@ -1,20 +1,55 @@
 from __future__ import annotations
-from typing import Iterable, Sequence, Callable, Awaitable, TypeVar
+from typing import Any, Iterable, Sequence, Callable, Awaitable, TypeVar
 import asyncio
 from web3 import AsyncWeb3
 from web3.types import LogReceipt, TxReceipt, TxData, BlockData
 
+from collector_engine.app.infrastructure.adapters.evm.jsonrpc import (
+    JsonRpcBatchError,
+    JsonRpcClient,
+)
+from collector_engine.app.infrastructure.adapters.evm.jsonrpc_decoders import (
+    decode_block,
+    decode_receipt,
+    decode_transaction,
+)
+
 T = TypeVar("T")
 
 
 class Web3EvmReader:
+    """
+    EvmReader implementation backed by web3.py.
+
+    With batch_size > 0, get_transactions / get_receipts / get_blocks_range pack
+    batch_size calls into one JSON-RPC array request (at most max_batches_in_flight
+    at once) instead of sending one HTTP request per hash / block. Batched results are
+    decoded by jsonrpc_decoders into the plain dict records the normalizers accept.
+    """
+
     def __init__(
-        self, provider_url: str, *, max_concurrency: int = 16, request_timeout: float = 30.0
+        self,
+        provider_url: str,
+        *,
+        max_concurrency: int = 16,
+        request_timeout: float = 30.0,
+        batch_size: int = 0,
+        max_batches_in_flight: int = 4,
     ):
         self.w3 = AsyncWeb3(
             AsyncWeb3.AsyncHTTPProvider(provider_url, request_kwargs={"timeout": request_timeout})
         )
         self._sem = asyncio.Semaphore(max_concurrency)
+        self._batch_client = (
+            JsonRpcClient(
+                provider_url,
+                batch_size=batch_size,
+                max_in_flight=max_batches_in_flight,
+                request_timeout=request_timeout,
+            )
+            if batch_size > 0
+            else None
+        )
 
     async def _lim(self, coro: Awaitable[T]) -> T:
         async with self._sem:
@@ -24,28 +59,64 @@ class Web3EvmReader:
     async def _one(h: bytes, func: Callable[[str], Awaitable[T]]) -> T:
         return await func("0x" + h.hex())
 
+    @staticmethod
+    async def _batched(
+        client: JsonRpcClient,
+        method: str,
+        params_list: list[list[Any]],
+        decoder: Callable[[dict[str, Any]], dict[str, Any]],
+    ) -> list[Any]:
+        try:
+            results = await client.call_many(method, params_list)
+        except JsonRpcBatchError as exc:
+            exc.results = [decoder(r) if r is not None else None for r in exc.results]
+            raise
+        return [decoder(r) for r in results]
+
+    async def close(self) -> None:
+        """Close the HTTP sessions (web3 provider cache and batch client)."""
+        await self.w3.provider.disconnect()
+        if self._batch_client is not None:
+            await self._batch_client.close()
+
     async def latest_block_number(self) -> int:
         blk = await self.w3.eth.get_block("latest")
         return int(blk.number)  # type: ignore[attr-defined]
 
     async def get_logs(
-        self, *, address: bytes, from_block: int, to_block: int
+        self, *, address: bytes | Sequence[bytes], from_block: int, to_block: int
     ) -> Sequence[LogReceipt]:
-        addr_hex = "0x" + address.hex()
-        checksum_addr = self.w3.to_checksum_address(addr_hex)
-        return await self.w3.eth.get_logs(
-            {
-                "fromBlock": from_block,
-                "toBlock": to_block,
-                "address": checksum_addr,
-            }
+        if isinstance(address, bytes):
+            checksum_addr: Any = self.w3.to_checksum_address("0x" + address.hex())
+        else:
+            checksum_addr = [self.w3.to_checksum_address("0x" + a.hex()) for a in address]
+        return await self._lim(
+            self.w3.eth.get_logs(
+                {
+                    "fromBlock": from_block,
+                    "toBlock": to_block,
+                    "address": checksum_addr,
+                }
+            )
         )
 
     async def get_transactions(self, hashes: Iterable[bytes]) -> Sequence[TxData]:
+        if self._batch_client is not None:
+            params = [["0x" + h.hex()] for h in hashes]
+            return await self._batched(
+                self._batch_client, "eth_getTransactionByHash", params, decode_transaction
+            )
+
         coros = [self._lim(self._one(h, self.w3.eth.get_transaction)) for h in hashes]  # type: ignore[arg-type]
         return await asyncio.gather(*coros)
 
     async def get_receipts(self, hashes: Iterable[bytes]) -> Sequence[TxReceipt]:
+        if self._batch_client is not None:
+            params = [["0x" + h.hex()] for h in hashes]
+            return await self._batched(
+                self._batch_client, "eth_getTransactionReceipt", params, decode_receipt
+            )
+
         coros = [self._lim(self._one(h, self.w3.eth.get_transaction_receipt)) for h in hashes]  # type: ignore[arg-type]
         return await asyncio.gather(*coros)
 
@@ -56,6 +127,12 @@ class Web3EvmReader:
         if to_block < from_block:
             return []
 
+        if self._batch_client is not None:
+            params = [[hex(n), False] for n in range(from_block, to_block + 1)]
+            return await self._batched(
+                self._batch_client, "eth_getBlockByNumber", params, decode_block
+            )
+
         coros = [self.get_block(n) for n in range(from_block, to_block + 1)]
         blocks: Sequence[BlockData] = await asyncio.gather(*coros)
         return blocks
@@ -0,0 +1,423 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+import time
+from collections.abc import Iterator
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, ClassVar
+
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.fs as pafs
+import pyarrow.parquet as pq
+
+from collector_engine.app.infrastructure.helpers.arrow_ipc import (
+    HOT_DIR,
+    IPC_SUFFIX,
+    list_ipc_files,
+    read_ipc,
+)
+from collector_engine.app.infrastructure.helpers.metadata import (
+    read_json,
+    read_json_object,
+    write_json_atomic,
+    write_json_object,
+)
+from collector_engine.app.infrastructure.helpers.parquet import (
+    column_range_from_footer,
+    list_parquet_files,
+)
+
+MANIFEST_FILE = "_manifest.json"
+MANIFEST_LOG = "_manifest.jsonl"
+MANIFEST_VERSION = 2
+
+
+@dataclass(frozen=True)
+class ManifestEntry:
+    name: str  # logical <name>.parquet, also for hot tier files not promoted yet
+    path: str  # relative to the dataset directory, "<partition dirs>/<name>" when partitioned
+    from_block: int | None
+    to_block: int | None
+    rows: int
+    size_bytes: int
+    schema_fingerprint: str
+    created_at: float
+
+    @property
+    def is_hot(self) -> bool:
+        """Arrow IPC file of the hot tier, waiting for promotion."""
+        return self.path.endswith(IPC_SUFFIX)
+
+
+def schema_fingerprint(schema: pa.Schema) -> str:
+    """Short stable hash of the Arrow schema (field names, types, nullability)."""
+    return hashlib.sha256(schema.remove_metadata().to_string().encode()).hexdigest()[:16]
+
+
+def entry_from_file(base_path: Path, rel_path: str, block_field: str) -> ManifestEntry:
+    """Describe a parquet file from its footer only (hot tier files: memory mapped)."""
+    path = base_path / rel_path
+    if path.suffix == IPC_SUFFIX:
+        return _entry_from_ipc_file(path, rel_path, block_field)
+    metadata = pq.read_metadata(path)
+    block_range = column_range_from_footer(path, block_field)
+    stat = path.stat()
+    return ManifestEntry(
+        name=path.name,
+        path=rel_path,
+        from_block=None if block_range is None else block_range[0],
+        to_block=None if block_range is None else block_range[1],
+        rows=metadata.num_rows,
+        size_bytes=stat.st_size,
+        schema_fingerprint=schema_fingerprint(metadata.schema.to_arrow_schema()),
+        created_at=stat.st_mtime,
+    )
+
+
+def _entry_from_ipc_file(path: Path, rel_path: str, block_field: str) -> ManifestEntry:
+    table = read_ipc(path)
+    min_max = pc.min_max(table[block_field]).as_py() if table.num_rows else {"min": None}
+    stat = path.stat()
+    return ManifestEntry(
+        name=f"{path.stem}.parquet",
+        path=rel_path,
+        from_block=min_max["min"],
+        to_block=min_max.get("max"),
+        rows=table.num_rows,
+        size_bytes=stat.st_size,
+        schema_fingerprint=schema_fingerprint(table.schema),
+        created_at=stat.st_mtime,
+    )
+
+
+def entry_from_table(
+    *, name: str, path: str, table: pa.Table, size_bytes: int, block_field: str
+) -> ManifestEntry:
+    """Describe a file from the table just written to it (no read back)."""
+    min_max = pc.min_max(table[block_field]).as_py() if table.num_rows else {"min": None}
+    return ManifestEntry(
+        name=name,
+        path=path,
+        from_block=min_max["min"],
+        to_block=min_max.get("max"),
+        rows=table.num_rows,
+        size_bytes=size_bytes,
+        schema_fingerprint=schema_fingerprint(table.schema),
+        created_at=time.time(),
+    )
+
+
+def _parse(data: Any) -> dict[str, ManifestEntry]:
+    if isinstance(data, dict) and data.get("version") == MANIFEST_VERSION:
+        return {
+            name: ManifestEntry(name=name, **fields)
+            for name, fields in data.get("files", {}).items()
+        }
+    return {}
+
+
+def _document(entries: dict[str, ManifestEntry]) -> dict[str, Any]:
+    files = {}
+    for name, entry in entries.items():
+        fields = asdict(entry)
+        del fields["name"]
+        files[name] = fields
+    return {"version": MANIFEST_VERSION, "updated_at": time.time(), "files": files}
+
+
+class ManifestIndex:
+    """
+    File entries of one dataset and the queries answered from them; loading / storing
+    the JSON document is left to subclasses. Thread safe: the background writer records
+    files from its own thread.
+    """
+
+    def __init__(self, *, block_field: str = "block_number"):
+        self.block_field = block_field
+        self._entries: dict[str, ManifestEntry] | None = None
+        self._lock = threading.Lock()
+
+    def _load(self) -> dict[str, ManifestEntry]:
+        raise NotImplementedError
+
+    def _write_document(self, document: dict[str, Any]) -> None:
+        raise NotImplementedError
+
+    def _loaded(self) -> dict[str, ManifestEntry]:
+        if self._entries is None:
+            self._entries = self._load()
+        return self._entries
+
+    def _save(self, entries: dict[str, ManifestEntry]) -> None:
+        self._write_document(_document(entries))
+
+    def _changed(
+        self,
+        entries: dict[str, ManifestEntry],
+        *,
+        put: ManifestEntry | None = None,
+        removed: list[ManifestEntry] | None = None,
+    ) -> None:
+        """Persist one change to `entries`; the whole document by default."""
+        self._save(entries)
+
+    def put(self, entry: ManifestEntry) -> None:
+        with self._lock:
+            entries = self._loaded()
+            entries[entry.name] = entry
+            self._changed(entries, put=entry)
+
+    def remove(self, names: list[str]) -> None:
+        with self._lock:
+            entries = self._loaded()
+            removed = [e for e in (entries.pop(name, None) for name in names) if e is not None]
+            self._changed(entries, removed=removed)
+
+    def get(self, name: str) -> ManifestEntry | None:
+        with self._lock:
+            return self._loaded().get(name)
+
+    def entries(self) -> list[ManifestEntry]:
+        """All files, ordered by block interval."""
+        with self._lock:
+            entries = list(self._loaded().values())
+        return sorted(entries, key=lambda e: (e.from_block is None, e.from_block or 0, e.name))
+
+    def overlapping(self, from_block: int, to_block: int) -> list[ManifestEntry]:
+        """Files with at least one row in [from_block, to_block]."""
+        return [
+            e
+            for e in self.entries()
+            if e.from_block is not None
+            and e.to_block is not None
+            and e.from_block <= to_block
+            and e.to_block >= from_block
+        ]
+
+    def max_block(self) -> int | None:
+        """Highest committed block of the dataset."""
+        blocks = [e.to_block for e in self.entries() if e.to_block is not None]
+        return max(blocks, default=None)
+
+
+class DatasetManifest(ManifestIndex):
+    """
+    Index of the parquet files of one dataset directory: a _manifest.json snapshot plus
+    the changes made since, appended to _manifest.jsonl.
+
+    - loaded once per instance; the directory is only walked (and the footers of
+      untracked files read) when there is no manifest yet, when it is stale or on
+      rebuild(). Stale means a directory changed behind the manifest's back (a crash
+      between the parquet write and the manifest update, files copied in or deleted
+      by hand): every change records the mtimes of the directories it touched,
+    - hot tier files (_hot/*.arrow) are tracked under their logical .parquet name;
+      a promoted parquet file wins over a leftover hot copy,
+    - a change is one appended line (no fsync: a lost line leaves a changed directory
+      mtime and so a stale manifest); the log is folded into the snapshot, written with
+      an atomic replace, every LOG_COMPACT_LINES lines,
+    - one instance per directory and process (`for_path`), so stores opened on the same
+      directory never overwrite each other's entries.
+    """
+
+    LOG_COMPACT_LINES: ClassVar[int] = 1_000
+
+    _instances: ClassVar[dict[Path, DatasetManifest]] = {}
+    _instances_lock = threading.Lock()
+
+    @classmethod
+    def for_path(cls, base_path: Path, *, block_field: str = "block_number") -> DatasetManifest:
+        key = base_path.resolve()
+        with cls._instances_lock:
+            manifest = cls._instances.get(key)
+            if manifest is None or manifest.block_field != block_field:
+                manifest = cls(base_path, block_field=block_field)
+                cls._instances[key] = manifest
+            return manifest
+
+    def __init__(self, base_path: Path, *, block_field: str = "block_number"):
+        super().__init__(block_field=block_field)
+        self.base_path = base_path
+        self.path = base_path / MANIFEST_FILE
+        self.log_path = base_path / MANIFEST_LOG
+        self._directories: dict[str, int] = {}  # relative directory -> st_mtime_ns
+        self._log_lines = 0
+
+    def _load(self) -> dict[str, ManifestEntry]:
+        data = read_json(self.path)
+        if not isinstance(data, dict) or data.get("version") != MANIFEST_VERSION:
+            return self._reconcile({})
+        entries = _parse(data)
+        self._directories = {}
+        self._log_lines = 0
+        for record in _read_log(self.log_path):
+            self._apply(entries, record)
+            self._log_lines += 1
+        if self._is_stale():
+            return self._reconcile(entries)
+        return entries
+
+    def _write_document(self, document: dict[str, Any]) -> None:
+        write_json_atomic(self.path, document)
+
+    def _reconcile(self, entries: dict[str, ManifestEntry]) -> dict[str, ManifestEntry]:
+        on_disk = set(list_parquet_files(self.base_path)) | set(list_ipc_files(self.base_path))
+        stale = [name for name, e in entries.items() if e.path not in on_disk]
+        for name in stale:
+            del entries[name]
+        untracked = on_disk - {e.path for e in entries.values()}
+        for rel_path in sorted(untracked):
+            entry = entry_from_file(self.base_path, rel_path, self.block_field)
+            current = entries.get(entry.name)
+            if current is not None and current.is_hot != entry.is_hot:
+                # promotion interrupted between the parquet write and the hot file removal
+                hot, entry = (current, entry) if current.is_hot else (entry, current)
+                (self.base_path / hot.path).unlink(missing_ok=True)
+            entries[entry.name] = entry
+        self._compact(entries)
+        return entries
+
+    def _is_stale(self) -> bool:
+        if not self._directories:
+            return True
+        for rel_dir, mtime_ns in self._directories.items():
+            try:
+                if (self.base_path / rel_dir).stat().st_mtime_ns != mtime_ns:
+                    return True
+            except FileNotFoundError:
+                return True
+        return False
+
+    def _compact(self, entries: dict[str, ManifestEntry]) -> None:
+        """Snapshot `entries`, then restart the log with the current directory mtimes."""
+        self._save(entries)
+        # truncating an existing log leaves the directory mtime alone, creating it does not
+        self.log_path.open("w").close()
+        self._directories = {}
+        self._log_lines = 0
+        self._append({"directories": self._mtimes(_tracked_directories(self.base_path))})
+
+    def _changed(
+        self,
+        entries: dict[str, ManifestEntry],
+        *,
+        put: ManifestEntry | None = None,
+        removed: list[ManifestEntry] | None = None,
+    ) -> None:
+        if self._log_lines >= self.LOG_COMPACT_LINES:
+            self._compact(entries)
+            return
+        touched = [put] if put is not None else removed or []
+        record: dict[str, Any] = {
+            "directories": self._mtimes(
+                {d for e in touched for d in _directory_chain(e.path.rpartition("/")[0])}
+            )
+        }
+        if put is not None:
+            record["put"] = asdict(put)
+        if removed:
+            record["remove"] = [e.name for e in removed]
+        self._append(record)
+
+    def _append(self, record: dict[str, Any]) -> None:
+        with self.log_path.open("a") as f:
+            f.write(json.dumps(record, sort_keys=True) + "\n")
+        self._directories.update(record.get("directories", {}))
+        self._log_lines += 1
+
+    def _apply(self, entries: dict[str, ManifestEntry], record: dict[str, Any]) -> None:
+        if "put" in record:
+            entry = ManifestEntry(**record["put"])
+            entries[entry.name] = entry
+        for name in record.get("remove", []):
+            entries.pop(name, None)
+        self._directories.update(record.get("directories", {}))
+
+    def _mtimes(self, rel_dirs: set[str]) -> dict[str, int]:
+        mtimes = {}
+        for rel_dir in sorted(rel_dirs):
+            try:
+                mtimes[rel_dir] = (self.base_path / rel_dir).stat().st_mtime_ns
+            except FileNotFoundError:
+                pass
+        return mtimes
+
+    def add(self, file_path: Path) -> ManifestEntry:
+        """Record a freshly written file."""
+        rel_path = file_path.relative_to(self.base_path).as_posix()
+        entry = entry_from_file(self.base_path, rel_path, self.block_field)
+        self.put(entry)
+        return entry
+
+    def directory_changed(self, directory: Path) -> None:
+        """
+        Record a change made to `directory` that is not a tracked file (metadata files,
+        a removed hot copy), so that it does not make the manifest stale.
+        """
+        rel_dir = directory.relative_to(self.base_path).as_posix()
+        with self._lock:
+            self._loaded()
+            self._append({"directories": self._mtimes(set(_directory_chain(rel_dir)))})
+
+    def rebuild(self) -> None:
+        """Re-describe every file from the directory listing and footers, then snapshot."""
+        with self._lock:
+            self._entries = self._reconcile({})
+
+
+def _read_log(path: Path) -> Iterator[dict[str, Any]]:
+    """Records of the manifest log; a torn last line (crash while appending) ends it."""
+    try:
+        with path.open() as f:
+            for line in f:
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError:
+                    return
+    except FileNotFoundError:
+        return
+
+
+def _directory_chain(rel_dir: str) -> list[str]:
+    """The dataset directory ("") and every directory down to `rel_dir`."""
+    parts = [p for p in rel_dir.split("/") if p not in ("", ".")]
+    return [""] + ["/".join(parts[: i + 1]) for i in range(len(parts))]
+
+
+def _tracked_directories(base_path: Path) -> set[str]:
+    """Directories whose mtime tells about added or removed data files."""
+    tracked = {""}
+    if (base_path / HOT_DIR).is_dir():
+        tracked.add(HOT_DIR)
+    for root, dirs, _ in os.walk(base_path):
+        dirs[:] = [d for d in dirs if not d.startswith(("_", "."))]
+        rel = Path(root).relative_to(base_path)
+        tracked.update((rel / d).as_posix() for d in dirs)
+    return tracked
+
+
+class ObjectStoreManifest(ManifestIndex):
+    """
+    Index of the parquet files of one object storage prefix, kept in _manifest.json.
+
+    The manifest is the listing: objects are never LISTed, an object missing from it
+    (upload finished, manifest update lost) is simply rewritten by the next run.
+    A single writer per dataset is assumed (one collector per contract).
+    """
+
+    def __init__(
+        self, filesystem: pafs.FileSystem, root: str, *, block_field: str = "block_number"
+    ):
+        super().__init__(block_field=block_field)
+        self.filesystem = filesystem
+        self.path = f"{root}/{MANIFEST_FILE}"
+
+    def _load(self) -> dict[str, ManifestEntry]:
+        return _parse(read_json_object(self.filesystem, self.path))
+
+    def _write_document(self, document: dict[str, Any]) -> None:
+        write_json_object(self.filesystem, self.path, document)
@@ -0,0 +1,194 @@
+from __future__ import annotations
+
+from collections.abc import Iterator
+from dataclasses import replace
+from pathlib import Path
+from typing import Any
+
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.fs as pafs
+import pyarrow.parquet as pq
+
+from collector_engine.app.infrastructure.adapters.storage.manifest import (
+    ManifestEntry,
+    ObjectStoreManifest,
+    entry_from_table,
+    schema_fingerprint,
+)
+from collector_engine.app.infrastructure.helpers.metadata import (
+    read_json_object,
+    write_json_object,
+)
+from collector_engine.app.infrastructure.helpers.parquet import row_groups, write_table_to
+from collector_engine.app.infrastructure.parquet.write_profiles import profile_for
+
+SCAN_BATCH_SIZE = 64 * 1024
+
+
+class ObjectStoreDatasetStore:
+    """
+    DatasetStore implementation backed by Parquet objects on S3 compatible storage
+    (any pyarrow FileSystem: S3FileSystem in production, a local SubTreeFileSystem in tests).
+
+    - root: "<bucket>/<prefix>" of the dataset, objects are <root>/<name>.parquet
+    - list_names / max_block / files_overlapping / list_files: answered by the manifest
+      object (<root>/_manifest.json), never by LIST calls
+    - write_table: streams the parquet file into the object; with S3FileSystem
+      (background_writes=True) the parts of the multipart upload are sent concurrently
+      on the pyarrow IO thread pool while encoding continues, and the object only
+      becomes visible when the upload completes
+    - read_table / read_schema / scan: ranged reads of the projected columns
+    - read_metadata / write_metadata: small JSON objects <root>/_<key>.json
+    - merge_files / delete_files: file-level operations for compaction
+    - flat layout only, no hot tier (promote() is a no-op)
+    """
+
+    def __init__(
+        self,
+        root: str | Path,
+        *,
+        filesystem: pafs.FileSystem,
+        block_field: str = "block_number",
+    ):
+        self.root = Path(root).as_posix().strip("/")
+        self.filesystem = filesystem
+        self.block_field = block_field
+        self.manifest = ObjectStoreManifest(filesystem, self.root, block_field=block_field)
+
+    def _object(self, rel_path: str) -> str:
+        return f"{self.root}/{rel_path}"
+
+    def _path_of(self, name: str) -> str:
+        entry = self.manifest.get(name)
+        return self._object(entry.path if entry is not None else name)
+
+    def list_names(self) -> list[str]:
+        return [e.name for e in self.manifest.entries()]
+
+    def list_files(self) -> list[ManifestEntry]:
+        return self.manifest.entries()
+
+    def read_table(self, name: str, columns: list[str] | None = None) -> pa.Table:
+        return pq.read_table(
+            self._path_of(name), columns=columns, filesystem=self.filesystem, pre_buffer=True
+        )
+
+    def read_schema(self, name: str) -> pa.Schema:
+        with self.filesystem.open_input_file(self._path_of(name)) as f:
+            return pq.read_schema(f)
+
+    def scan(
+        self,
+        *,
+        columns: list[str] | None = None,
+        block_range: tuple[int, int] | None = None,
+        filter: ds.Expression | None = None,
+        names: list[str] | None = None,
+        batch_size: int = SCAN_BATCH_SIZE,
+    ) -> pa.RecordBatchReader:
+        """Same contract as ParquetDatasetStore.scan (manifest pruning + pushdown)."""
+        if names is not None:
+            found = [self.manifest.get(n) for n in names]
+            missing = [n for n, e in zip(names, found) if e is None]
+            if missing:
+                raise ValueError(f"Unknown objects under {self.root}: {missing}")
+            entries = [e for e in found if e is not None]
+        elif block_range is not None:
+            entries = self.files_overlapping(*block_range)
+        else:
+            entries = self.manifest.entries()
+
+        if block_range is not None:
+            block = ds.field(self.block_field)
+            in_range = (block >= block_range[0]) & (block <= block_range[1])
+            filter = in_range if filter is None else filter & in_range
+
+        if not entries:
+            return pa.RecordBatchReader.from_batches(pa.schema([]), [])
+
+        dataset = ds.dataset(
+            [self._object(e.path) for e in entries], format="parquet", filesystem=self.filesystem
+        )
+        return dataset.scanner(columns=columns, filter=filter, batch_size=batch_size).to_reader()
+
+    def read_metadata(self, key: str) -> dict[str, Any] | None:
+        return read_json_object(self.filesystem, self._object(f"_{key}.json"))
+
+    def write_metadata(self, key: str, data: dict[str, Any]) -> None:
+        write_json_object(self.filesystem, self._object(f"_{key}.json"), data)
+
+    def max_block(self) -> int | None:
+        return self.manifest.max_block()
+
+    def files_overlapping(self, from_block: int, to_block: int) -> list[ManifestEntry]:
+        return self.manifest.overlapping(from_block, to_block)
+
+    def write_table(self, *, table: pa.Table, file_name: str) -> None:
+        name = f"{file_name}.parquet"
+        with self.filesystem.open_output_stream(self._object(name)) as out:
+            write_table_to(out, table)
+            size_bytes = out.tell()
+        self.manifest.put(
+            entry_from_table(
+                name=name,
+                path=name,
+                table=table,
+                size_bytes=size_bytes,
+                block_field=self.block_field,
+            )
+        )
+
+    def merge_files(self, *, names: list[str], file_name: str) -> None:
+        """
+        Stream `names` (in the given order) into <file_name>.parquet; the merged object
+        appears when its upload completes, the sources are left in place.
+        """
+        entries = [self.manifest.get(n) for n in names]
+        missing = [n for n, e in zip(names, entries) if e is None]
+        if missing:
+            raise ValueError(f"Unknown objects under {self.root}: {missing}")
+
+        name = f"{file_name}.parquet"
+        sources = [self._object(e.path) for e in entries if e is not None]
+        if not sources:
+            raise ValueError(f"Nothing to merge into {name}: {names}")
+        num_rows = sum(e.rows for e in entries if e is not None)
+        with self.filesystem.open_input_file(sources[0]) as f:
+            schema = pq.read_schema(f)
+        profile = profile_for(schema)
+        block_columns: list[pa.Array] = []  # block range of the merged file, no read back
+
+        def batches() -> Iterator[pa.RecordBatch]:
+            for source in sources:
+                with self.filesystem.open_input_file(source) as f, pq.ParquetFile(f) as pf:
+                    for batch in pf.iter_batches(batch_size=profile.row_group_size):
+                        block_columns.append(batch[self.block_field])
+                        yield batch
+
+        with self.filesystem.open_output_stream(self._object(name)) as out:
+            with pq.ParquetWriter(out, schema, **profile.write_options(schema, num_rows)) as writer:
+                for table in row_groups(batches(), profile.row_group_size):
+                    writer.write_table(table, row_group_size=profile.row_group_size)
+            size_bytes = out.tell()
+
+        blocks = pa.chunked_array(block_columns, type=schema.field(self.block_field).type)
+        entry = entry_from_table(
+            name=name,
+            path=name,
+            table=pa.table({self.block_field: blocks}),
+            size_bytes=size_bytes,
+            block_field=self.block_field,
+        )
+        self.manifest.put(replace(entry, schema_fingerprint=schema_fingerprint(schema)))
+
+    def delete_files(self, names: list[str]) -> None:
+        for name in names:
+            try:
+                self.filesystem.delete_file(self._path_of(name))
+            except FileNotFoundError:
+                pass
+        self.manifest.remove(names)
+
+    def promote(self, *, min_age: float = 0.0) -> int:
+        return 0
@@ -3,50 +3,288 @@ from __future__ import annotations
 # shell/adapters/storage/parquet_store.py
 from __future__ import annotations
 
+import itertools
+import os
+import time
 from pathlib import Path
+from typing import Any
 
 import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.fs as pafs
 import pyarrow.parquet as pq
 
+from collector_engine.app.infrastructure.adapters.storage.manifest import (
+    DatasetManifest,
+    ManifestEntry,
+)
+from collector_engine.app.infrastructure.adapters.storage.partitioning import (
+    PARTITIONING_KEY,
+    HivePartitioning,
+)
+from collector_engine.app.infrastructure.helpers.arrow_ipc import (
+    HOT_DIR,
+    IPC_SUFFIX,
+    read_ipc,
+    read_ipc_schema,
+    write_ipc,
+)
 from collector_engine.app.infrastructure.helpers.parquet import (
-    get_pq_names,
-    write_and_flush_if_needed,
+    create_path_if_not_exist,
+    merge_parquet_files,
+    write_table,
 )
+from collector_engine.app.infrastructure.helpers.metadata import read_json, write_json_atomic
+
+SCAN_BATCH_SIZE = 64 * 1024
+
+# zero copy reads of local files; pages are only touched if a projected column needs them
+_MMAP_FS = pafs.LocalFileSystem(use_mmap=True)
 
 
 class ParquetDatasetStore:
     """
     DatasetStore implementation backed by Parquet files.
 
-    - list_names: list parquet files in a directory
-    - read_table: read a parquet file as a pyarrow.Table (or pandas if you prefer)
-    - write_buffer: use your existing buffered writer (write_and_flush_if_needed)
+    - list_names: parquet files of the dataset, ordered by block (from the manifest)
+    - read_table: read a parquet file (optionally only some columns) as a pyarrow.Table
+    - write_table: write an already built (sorted) Arrow table as <file_name>.parquet
+    - max_block / files_overlapping: answered by the manifest (_manifest.json) which
+      records block interval, rows, size, schema fingerprint and creation time per file
+    - read_metadata / write_metadata: small JSON documents kept as _<key>.json
+      next to the parquet files (atomic replace on write)
+    - partitioning (optional): hive directories chain_id=<id>/block_bucket=<b>/, recorded
+      in _partitioning.json and picked up by later stores on the same directory;
+      names stay plain file names, the manifest maps them to their partition path
+    - dataset(): pyarrow.dataset view of all files (partition pruning when partitioned)
+    - scan: streaming, column projected and filtered read over some or all files
+      (manifest file pruning, row group pruning from statistics, memory mapped)
+    - read_schema: schema of one file from its footer
+    - list_files / merge_files / delete_files: file-level operations for compaction
+    - hot_tier (optional): new files land as uncompressed Arrow IPC in _hot/ (cheap to
+      write, zero copy reads for the derived stages) under their final .parquet name;
+      promote() rewrites them as tuned parquet, which stays the source of truth
+      (dataset() and the SQL loader only see promoted files)
     """
 
-    def __init__(self, base_path: str | Path):
+    def __init__(
+        self,
+        base_path: str | Path,
+        *,
+        block_field: str = "block_number",
+        partitioning: HivePartitioning | None = None,
+        hot_tier: bool = False,
+    ):
         self.base_path = Path(base_path)
+        self.hot_tier = hot_tier
+        self.manifest = DatasetManifest.for_path(self.base_path, block_field=block_field)
+
+        stored = self.read_metadata(PARTITIONING_KEY)
+        if stored is not None:
+            stored_partitioning = HivePartitioning.from_metadata(stored)
+            if partitioning is not None and partitioning != stored_partitioning:
+                raise ValueError(
+                    f"{self.base_path} is partitioned as {stored}, got {partitioning.to_metadata()}"
+                )
+            partitioning = stored_partitioning
+        self.partitioning = partitioning
+        self._partitioning_recorded = stored is not None
 
     def list_names(self) -> list[str]:
-        names = get_pq_names(self.base_path)
-        return [n for n in names if n.endswith(".parquet")]
+        return [e.name for e in self.manifest.entries()]
 
-    def read_table(self, name: str) -> pa.Table:
-        return pq.read_table(self.base_path / name)
+    def read_table(self, name: str, columns: list[str] | None = None) -> pa.Table:
+        """Memory mapped read of `columns` (all if None); pages of other columns stay untouched."""
+        path = self._path_of(name)
+        if path.suffix == IPC_SUFFIX:
+            try:
+                return read_ipc(path, columns)
+            except FileNotFoundError:
+                path = self._path_of(name)  # promoted meanwhile
+        return pq.read_table(path, columns=columns, memory_map=True, pre_buffer=True)
 
-    def write_buffer(
+    def read_schema(self, name: str) -> pa.Schema:
+        path = self._path_of(name)
+        return read_ipc_schema(path) if path.suffix == IPC_SUFFIX else pq.read_schema(path)
+
+    def dataset(self) -> ds.Dataset:
+        partitioning: ds.Partitioning | str | None = None
+        if self.partitioning is not None:
+            parquet = [e for e in self.manifest.entries() if not e.is_hot]
+            partitioning = (
+                self.partitioning.dataset_partitioning(self.read_schema(parquet[0].name))
+                if parquet
+                else "hive"
+            )
+        return ds.dataset(
+            self.base_path,
+            format="parquet",
+            filesystem=_MMAP_FS,
+            partitioning=partitioning,
+        )
+
+    def scan(
         self,
         *,
-        buffer: dict[str, list],
-        schema: pa.Schema,
-        file_name: str,
-        rows_per_file: int,
-        force: bool = False,
-    ) -> dict[str, list]:
-        return write_and_flush_if_needed(
-            buffer=buffer,
-            schema=schema,
-            pq_path=self.base_path,
-            file_name=file_name,
-            rows_per_file=rows_per_file,
-            force=force,
+        columns: list[str] | None = None,
+        block_range: tuple[int, int] | None = None,
+        filter: ds.Expression | None = None,
+        names: list[str] | None = None,
+        batch_size: int = SCAN_BATCH_SIZE,
+    ) -> pa.RecordBatchReader:
+        """
+        Stream record batches of `columns` (all if None) in file order.
+
+        - names: only these files (e.g. the logs file a txs file is derived from),
+        - block_range: inclusive [from, to]; files outside it are skipped from the
+          manifest, rows outside it are filtered (row groups pruned on statistics),
+        - filter: extra pyarrow.dataset expression, pushed down the same way.
+        """
+        if names is not None:
+            found = [self.manifest.get(n) for n in names]
+            missing = [n for n, e in zip(names, found) if e is None]
+            if missing:
+                raise ValueError(f"Unknown files in {self.base_path}: {missing}")
+            entries = [e for e in found if e is not None]
+        elif block_range is not None:
+            entries = self.files_overlapping(*block_range)
+        else:
+            entries = self.manifest.entries()
+
+        if block_range is not None:
+            block = ds.field(self.manifest.block_field)
+            in_range = (block >= block_range[0]) & (block <= block_range[1])
+            filter = in_range if filter is None else filter & in_range
+
+        if not entries:
+            return pa.RecordBatchReader.from_batches(pa.schema([]), [])
+
+        # files are already pruned by the manifest and carry the partition columns
+        # themselves, so no hive partitioning here; one child per run of same-tier files
+        # keeps the file order
+        children = [
+            ds.dataset(
+                [str(self.base_path / e.path) for e in run],
+                format="ipc" if hot else "parquet",
+                filesystem=_MMAP_FS,
+            )
+            for hot, run in itertools.groupby(entries, key=lambda e: e.is_hot)
+        ]
+        dataset = children[0] if len(children) == 1 else ds.dataset(children)
+        return dataset.scanner(columns=columns, filter=filter, batch_size=batch_size).to_reader()
+
+    def list_files(self) -> list[ManifestEntry]:
+        return self.manifest.entries()
+
+    def merge_files(self, *, names: list[str], file_name: str) -> None:
+        """
+        Stream `names` (in the given order) into <file_name>.parquet next to them.
+        The merged file appears atomically; the sources are left in place
+        (hot sources are promoted first).
+        """
+        for entry in self.manifest.entries():
+            if entry.is_hot and entry.name in names:
+                self._promote(entry)
+        entries = [self.manifest.get(n) for n in names]
+        missing = [n for n, e in zip(names, entries) if e is None]
+        if missing:
+            raise ValueError(f"Unknown files in {self.base_path}: {missing}")
+        rel_paths = [e.path for e in entries if e is not None]
+        directories = {Path(p).parent for p in rel_paths}
+        if len(directories) != 1:
+            raise ValueError(f"Cannot merge files across partitions: {rel_paths}")
+
+        target_dir = self.base_path / directories.pop()
+        tmp_name = f".{file_name}.tmp"
+        merge_parquet_files(
+            temp_files_path=self.base_path,
+            temp_files_lst=[p.removesuffix(".parquet") for p in rel_paths],
+            final_file_path=target_dir,
+            final_file_name=tmp_name,
         )
+        file_path = target_dir / f"{file_name}.parquet"
+        os.replace(target_dir / f"{tmp_name}.parquet", file_path)
+        self.manifest.add(file_path)
+
+    def delete_files(self, names: list[str]) -> None:
+        for name in names:
+            self._path_of(name).unlink(missing_ok=True)
+        self.manifest.remove(names)
+
+    def promote(self, *, min_age: float = 0.0) -> int:
+        """
+        Rewrite hot tier files older than `min_age` seconds as parquet (write profile of
+        their schema, partition directory if partitioned). Returns the number promoted.
+        """
+        now = time.time()
+        hot = [e for e in self.manifest.entries() if e.is_hot and now - e.created_at >= min_age]
+        for entry in hot:
+            self._promote(entry)
+        return len(hot)
+
+    def _promote(self, entry: ManifestEntry) -> None:
+        hot_path = self.base_path / entry.path
+        table = read_ipc(hot_path)
+        directory = "" if self.partitioning is None else self.partitioning.split(table)[0][0]
+        # parquet first: a crash in between leaves both, the manifest keeps the parquet one
+        self._write_parquet(self.base_path / directory / entry.name, table)
+        del table
+        hot_path.unlink(missing_ok=True)
+        self.manifest.directory_changed(hot_path.parent)
+
+    def _path_of(self, name: str) -> Path:
+        entry = self.manifest.get(name)
+        return self.base_path / (entry.path if entry is not None else name)
+
+    def read_metadata(self, key: str) -> dict[str, Any] | None:
+        return read_json(self.base_path / f"_{key}.json")
+
+    def write_metadata(self, key: str, data: dict[str, Any]) -> None:
+        write_json_atomic(self.base_path / f"_{key}.json", data)
+        self.manifest.directory_changed(self.base_path)
+
+    def max_block(self) -> int | None:
+        return self.manifest.max_block()
+
+    def files_overlapping(self, from_block: int, to_block: int) -> list[ManifestEntry]:
+        return self.manifest.overlapping(from_block, to_block)
+
+    def write_table(self, *, table: pa.Table, file_name: str) -> None:
+        """
+        Write `table` as <file_name>.parquet; when partitioned, one file per block bucket
+        named {prefix}_{from}_{to} after its own rows.
+        """
+        if self.partitioning is None:
+            self._write_file("", file_name, table)
+            return
+
+        self._record_partitioning()
+        prefix = file_name.rsplit("_", 2)[0]
+        pieces = self.partitioning.split(table)
+        for directory, piece in pieces:
+            if len(pieces) > 1:
+                blocks = piece[self.partitioning.block_field]
+                file_name = f"{prefix}_{blocks[0].as_py()}_{blocks[-1].as_py()}"
+            self._write_file(directory, file_name, piece)
+
+    def _write_file(self, directory: str, file_name: str, table: pa.Table) -> None:
+        if self.hot_tier:
+            file_path = self.base_path / HOT_DIR / f"{file_name}{IPC_SUFFIX}"
+            write_ipc(file_path, table)
+            self.manifest.add(file_path)
+            return
+        self._write_parquet(self.base_path / directory / f"{file_name}.parquet", table)
+
+    def _write_parquet(self, file_path: Path, table: pa.Table) -> None:
+        create_path_if_not_exist(file_path.parent)
+        write_table(str(file_path), table)
+        self.manifest.add(file_path)
+
+    def _record_partitioning(self) -> None:
+        assert self.partitioning is not None
+        if self._partitioning_recorded:
+            return
+        if any("/" not in e.path for e in self.manifest.entries()):
+            raise ValueError(f"{self.base_path} already holds flat files, cannot partition it")
+        self.write_metadata(PARTITIONING_KEY, self.partitioning.to_metadata())
+        self._partitioning_recorded = True
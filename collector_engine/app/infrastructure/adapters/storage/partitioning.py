@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any
+
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.dataset as ds
+
+PARTITIONING_KEY = "partitioning"
+
+
+@dataclass(frozen=True)
+class HivePartitioning:
+    """
+    Hive-style directories for a dataset: chain_id=<id>/block_bucket=<first block>/.
+
+    A file never crosses a bucket boundary (tables are split on write), so pruning on
+    block_bucket is exact for pyarrow.dataset readers with partitioning="hive".
+    """
+
+    bucket_size: int
+    by_chain: bool = True
+    block_field: str = "block_number"
+    chain_field: str = "chain_id"
+
+    def __post_init__(self) -> None:
+        if self.bucket_size < 1:
+            raise ValueError("bucket_size must be >= 1")
+
+    def to_metadata(self) -> dict[str, Any]:
+        return {
+            "scheme": "hive",
+            "keys": ([self.chain_field] if self.by_chain else []) + ["block_bucket"],
+            "bucket_size": self.bucket_size,
+            "block_field": self.block_field,
+        }
+
+    @classmethod
+    def from_metadata(cls, data: dict[str, Any]) -> HivePartitioning:
+        if data.get("scheme") != "hive":
+            raise ValueError(f"Unsupported partitioning scheme: {data.get('scheme')}")
+        keys = data["keys"]
+        return cls(
+            bucket_size=int(data["bucket_size"]),
+            by_chain=len(keys) == 2,
+            block_field=data.get("block_field", "block_number"),
+            chain_field=keys[0] if len(keys) == 2 else "chain_id",
+        )
+
+    def dataset_partitioning(self, schema: pa.Schema) -> ds.Partitioning:
+        """
+        Hive partitioning of pyarrow.dataset with the key types of the dataset schema
+        (inferred keys are int32 and clash with int64 chain_id / block_number columns).
+        """
+        keys = [(self.chain_field, schema.field(self.chain_field).type)] if self.by_chain else []
+        keys.append(("block_bucket", schema.field(self.block_field).type))
+        return ds.partitioning(pa.schema(keys), flavor="hive")
+
+    def bucket(self, block: int) -> int:
+        return block // self.bucket_size * self.bucket_size
+
+    def split(self, table: pa.Table) -> list[tuple[str, pa.Table]]:
+        """(partition directory, rows) for every bucket the table touches, in block order."""
+        buckets = pc.multiply(
+            pc.divide(table[self.block_field], self.bucket_size), self.bucket_size
+        )
+        unique = sorted(pc.unique(buckets).to_pylist())
+        if len(unique) == 1:
+            return [(self._directory(table, unique[0]), table)]
+
+        out = []
+        for bucket in unique:
+            piece = table.filter(pc.equal(buckets, bucket))
+            out.append((self._directory(piece, bucket), piece))
+        return out
+
+    def _directory(self, piece: pa.Table, bucket: int) -> str:
+        parts = []
+        if self.by_chain and self.chain_field in piece.column_names:
+            parts.append(f"{self.chain_field}={piece[self.chain_field][0].as_py()}")
+        parts.append(f"block_bucket={bucket}")
+        return "/".join(parts)
@@ -0,0 +1,134 @@
+from __future__ import annotations
+
+import os
+import threading
+from contextlib import ExitStack
+from pathlib import Path
+from typing import Any, BinaryIO
+
+import pyarrow as pa
+import pyarrow.compute as pc
+from pyarrow import ipc
+
+# write-ahead spill of a collector buffer, kept next to the dataset in _wal/<dataset>/ so
+# that segment churn leaves the dataset directory (and its manifest) alone
+WAL_DIR = "_wal"
+_SEGMENT_SUFFIX = ".arrow"
+_TO_BLOCK = b"to_block"
+
+
+class ArrowSpillLog:
+    """
+    SpillLog implementation: Arrow IPC stream segments <directory>/<segment>.arrow.
+
+    - append(): one record batch per normalized chunk, tagged with the last block of the
+      range it covers (empty ranges too) and fsynced before the rows enter the buffer,
+    - checkpoint(): seals the current segment when its rows are handed to the writer,
+      release(): deletes the sealed segments once their parquet file is committed,
+    - close(): seals the current segment at the end of a run, whatever the buffer holds,
+    - replay(): rows spilled but not in a committed file + the last spilled block;
+      a batch torn by a crash mid append ends its segment.
+    A single collector per dataset is assumed.
+    """
+
+    def __init__(
+        self,
+        directory: str | Path,
+        schema: pa.Schema,
+        *,
+        block_field: str = "block_number",
+        sync: bool = True,
+    ):
+        self.directory = Path(directory)
+        self.schema = schema
+        self.block_field = block_field
+        self.sync = sync
+        self._segment = max(self._segments(), default=0) + 1
+        self._sink: BinaryIO | None = None
+        self._writer: ipc.RecordBatchStreamWriter | None = None
+        self._open = ExitStack()  # closes the writer, then the sink, of the current segment
+        self._lock = threading.Lock()  # release() runs on the writer thread
+
+    def _segments(self) -> list[int]:
+        if not self.directory.is_dir():
+            return []
+        return sorted(
+            int(f.removesuffix(_SEGMENT_SUFFIX))
+            for f in os.listdir(self.directory)
+            if f.endswith(_SEGMENT_SUFFIX) and f.removesuffix(_SEGMENT_SUFFIX).isdigit()
+        )
+
+    def _path(self, segment: int) -> Path:
+        return self.directory / f"{segment:08d}{_SEGMENT_SUFFIX}"
+
+    def append(self, rows: list[dict[str, Any]], *, to_block: int) -> None:
+        batch = pa.RecordBatch.from_pylist(rows, schema=self.schema)
+        if self._writer is None:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            self._sink = self._open.enter_context(self._path(self._segment).open("wb"))
+            self._writer = self._open.enter_context(ipc.new_stream(self._sink, self.schema))
+        assert self._sink is not None
+        self._writer.write_batch(batch, custom_metadata={_TO_BLOCK: str(to_block).encode()})
+        self._sink.flush()
+        if self.sync:
+            os.fsync(self._sink.fileno())
+
+    def checkpoint(self) -> int:
+        """Seal the current segment; returns its number for release()."""
+        sealed = self._segment
+        self._open.close()
+        self._writer = self._sink = None
+        self._segment += 1
+        return sealed
+
+    def close(self) -> None:
+        if self._writer is not None:
+            self.checkpoint()
+
+    def release(self, segment: int) -> None:
+        with self._lock:
+            for s in self._segments():
+                if s <= segment:
+                    self._path(s).unlink(missing_ok=True)
+
+    def replay(self, committed_block: int | None) -> tuple[list[dict[str, Any]], int | None]:
+        """
+        (rows, last spilled block). Batches whose rows all lie at or below
+        `committed_block` were written to parquet before the crash and are skipped.
+        """
+        batches: list[pa.RecordBatch] = []
+        last_block: int | None = None
+        with self._lock:
+            segments = [s for s in self._segments() if s < self._segment]
+        for segment in segments:
+            for batch, to_block in _read_segment(self._path(segment)):
+                last_block = to_block if last_block is None else max(last_block, to_block)
+                if batch.num_rows == 0:
+                    continue
+                max_block = pc.max(batch[self.block_field]).as_py()
+                if committed_block is None or max_block > committed_block:
+                    batches.append(batch)
+
+        rows = pa.Table.from_batches(batches, schema=self.schema).to_pylist()
+        return rows, last_block
+
+
+def wal_directory(base_path: str | Path) -> Path:
+    """Spill directory of the dataset at `base_path`: <parent>/_wal/<dataset>/."""
+    base_path = Path(base_path)
+    return base_path.parent / WAL_DIR / base_path.name
+
+
+def _read_segment(path: Path) -> list[tuple[pa.RecordBatch, int]]:
+    out: list[tuple[pa.RecordBatch, int]] = []
+    try:
+        with pa.OSFile(str(path)) as source:
+            reader = ipc.open_stream(source)
+            while True:
+                batch, metadata = reader.read_next_batch_with_custom_metadata()
+                out.append((batch, int(metadata[_TO_BLOCK])))
+    except StopIteration:
+        pass
+    except (pa.ArrowInvalid, OSError):
+        pass  # torn tail (or an empty segment): everything before it is intact
+    return out
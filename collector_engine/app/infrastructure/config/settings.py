@@ -25,6 +25,36 @@ class AppConfig(BaseConfig):
         alias="DATA_PATH",
     )
     postgres_dsn: str = Field(..., alias="POSTGRES_DSN")
+    # parquet -> postgres loading: connections open at once, workers per dataset
+    # (JSON, e.g. {"logs": 6}, defaults in DEFAULT_LOAD_PARALLELISM) and the bytes of
+    # consecutive files staged and inserted in one transaction (0: one file each)
+    sql_load_connections: int = Field(8, alias="SQL_LOAD_CONNECTIONS")
+    sql_load_parallelism: dict[str, int] = Field(default_factory=dict, alias="SQL_LOAD_PARALLELISM")
+    sql_load_group_bytes: int = Field(64 << 20, alias="SQL_LOAD_GROUP_BYTES")
+    # block partitioned raw.* tables: load new block ranges detached, then attach them
+    sql_attach_partitions: bool = Field(True, alias="SQL_ATTACH_PARTITIONS")
+    pipeline_streaming: bool = Field(False, alias="PIPELINE_STREAMING")
+    # collector flush thresholds per dataset, merged over the FLUSH_POLICIES defaults
+    # (JSON, e.g. {"logs": {"target_file_bytes": 268435456}}; null disables a limit)
+    flush_policies: dict[str, dict[str, float | None]] = Field(
+        default_factory=dict, alias="FLUSH_POLICIES"
+    )
+    # hive layout chain_id=<id>/block_bucket=<b>/ for new datasets; 0 keeps them flat
+    parquet_block_bucket_size: int = Field(0, alias="PARQUET_BLOCK_BUCKET_SIZE")
+    # write new files as Arrow IPC first, promoted to parquet at the end of the pipeline
+    parquet_hot_tier: bool = Field(False, alias="PARQUET_HOT_TIER")
+    # write-ahead spill of the logs / blocks collector buffers in _wal/<dataset>/ (local)
+    collector_wal: bool = Field(False, alias="COLLECTOR_WAL")
+    # "parquet" (local DATA_PATH) or "s3" (DATA_PATH is then "<bucket>/<prefix>")
+    storage_backend: str = Field("parquet", alias="STORAGE_BACKEND")
+    # S3 compatible object storage; endpoint as host:port for MinIO and friends
+    s3_endpoint: str | None = Field(None, alias="S3_ENDPOINT")
+    s3_scheme: str = Field("https", alias="S3_SCHEME")
+    s3_region: str = Field("us-east-1", alias="S3_REGION")
+    s3_access_key: str | None = Field(None, alias="S3_ACCESS_KEY")
+    s3_secret_key: str | None = Field(None, alias="S3_SECRET_KEY")
+    # pyarrow IO threads: concurrent multipart part uploads and ranged reads
+    s3_io_threads: int = Field(16, alias="S3_IO_THREADS")
 
 
 class Web3Config(BaseConfig):
@@ -36,8 +66,14 @@ class Web3Config(BaseConfig):
     etherscan_api_key: str = Field(..., alias="ETHERSCAN_API_KEY")
     basescan_api_key: str = Field(..., alias="BASESCAN_API_KEY")
 
+    # "web3" (web3.py) or "jsonrpc" (lean JSON-RPC client)
+    evm_reader_backend: str = Field("web3", alias="EVM_READER_BACKEND")
+
     client_max_concurrency: int = Field(10, alias="CLIENT_MAX_CONCURRENCY")
     client_request_timeout: int = Field(30, alias="CLIENT_REQUEST_TIMEOUT")
+    # JSON-RPC batching: 0 disables it (one HTTP request per call)
+    client_batch_size: int = Field(0, alias="CLIENT_BATCH_SIZE")
+    client_max_batches_in_flight: int = Field(4, alias="CLIENT_MAX_BATCHES_IN_FLIGHT")
 
     def rpc_url(self, chain_id: int) -> str:
         """Return provider URL based on chain_id."""
@@ -0,0 +1,13 @@
+-- LOAD LEDGER: parquet files already loaded into raw.* / analytics.*,
+-- written in the same transaction as the rows of the file
+CREATE TABLE IF NOT EXISTS raw._load_ledger (
+  dataset      text         NOT NULL,  -- logs / txs / receipts / blocks
+  source_dir   text         NOT NULL,  -- parquet directory the file was loaded from
+  file_name    text         NOT NULL,  -- relative to source_dir (partition dirs included)
+  size_bytes   bigint       NOT NULL,
+  fingerprint  text         NOT NULL,  -- sha256 of the parquet footer
+  rows         bigint       NOT NULL,
+  loaded_at    timestamptz  NOT NULL DEFAULT now(),
+
+  CONSTRAINT load_ledger_pk PRIMARY KEY (dataset, source_dir, file_name)
+);
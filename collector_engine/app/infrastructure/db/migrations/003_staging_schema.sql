@@ -0,0 +1,3 @@
+-- STAGING: UNLOGGED tables the SQL loader COPYs parquet files into,
+-- staging.<target table>_<backend pid>, one per loading connection
+CREATE SCHEMA IF NOT EXISTS staging;
@@ -0,0 +1,127 @@
+-- RAW TABLES PARTITIONED BY chain_id (LIST) AND block_number (RANGE)
+--
+--   raw.logs -> raw.logs_c<chain_id> -> raw.logs_c<chain_id>_b<first block>
+--
+-- Range partitions are raw.block_partition_width() blocks wide and created on demand
+-- by the loader (raw.ensure_block_partition) or bulk loaded detached and attached.
+-- Partition keys must be part of the primary keys: block_number is added to them
+-- (and is NOT NULL in raw.transactions).
+-- Unpartitioned tables created by 001 are converted in place, rows included.
+
+-- width of the block ranges; changing it only affects partitions created afterwards
+-- and must keep their bounds from overlapping the existing ones
+CREATE OR REPLACE FUNCTION raw.block_partition_width() RETURNS bigint
+LANGUAGE sql IMMUTABLE AS $$ SELECT 1000000::bigint $$;
+
+-- <parent>_c<chain>, the LIST partition of one chain, itself partitioned by block range
+CREATE OR REPLACE FUNCTION raw.ensure_chain_partition(parent regclass, chain integer)
+RETURNS text LANGUAGE plpgsql AS $$
+DECLARE
+  sch  text;
+  rel  text;
+  part text;
+BEGIN
+  SELECT n.nspname, c.relname INTO sch, rel
+  FROM pg_class c JOIN pg_namespace n ON n.oid = c.relnamespace
+  WHERE c.oid = parent;
+  part := format('%I.%I', sch, rel || '_c' || chain);
+  PERFORM pg_advisory_xact_lock(hashtext(part));
+  IF to_regclass(part) IS NULL THEN
+    EXECUTE format(
+      'CREATE TABLE %s PARTITION OF %s FOR VALUES IN (%s) PARTITION BY RANGE (block_number)',
+      part, parent, chain
+    );
+  END IF;
+  RETURN part;
+END $$;
+
+-- <parent>_c<chain>_b<first block>, the range partition holding `block` of `chain`
+CREATE OR REPLACE FUNCTION raw.ensure_block_partition(parent regclass, chain integer, block bigint)
+RETURNS text LANGUAGE plpgsql AS $$
+DECLARE
+  width      bigint := raw.block_partition_width();
+  lo         bigint := block - block % width;
+  chain_part text   := raw.ensure_chain_partition(parent, chain);
+  sch        text;
+  rel        text;
+  part       text;
+BEGIN
+  SELECT n.nspname, c.relname INTO sch, rel
+  FROM pg_class c JOIN pg_namespace n ON n.oid = c.relnamespace
+  WHERE c.oid = parent;
+  part := format('%I.%I', sch, rel || '_c' || chain || '_b' || lo);
+  PERFORM pg_advisory_xact_lock(hashtext(part));
+  IF to_regclass(part) IS NULL THEN
+    EXECUTE format(
+      'CREATE TABLE %s PARTITION OF %s FOR VALUES FROM (%s) TO (%s)',
+      part, chain_part, lo, lo + width
+    );
+  END IF;
+  RETURN part;
+END $$;
+
+-- LOGS
+DO $$
+BEGIN
+  IF (SELECT relkind FROM pg_class WHERE oid = 'raw.logs'::regclass) = 'r' THEN
+    ALTER TABLE raw.logs RENAME TO logs_unpartitioned;
+    ALTER INDEX raw.logs_pk RENAME TO logs_unpartitioned_pk;
+    ALTER INDEX raw.logs_block_idx RENAME TO logs_unpartitioned_block_idx;
+
+    CREATE TABLE raw.logs (
+      LIKE raw.logs_unpartitioned INCLUDING DEFAULTS,
+      CONSTRAINT logs_pk PRIMARY KEY (chain_id, block_number, transaction_hash, log_index)
+    ) PARTITION BY LIST (chain_id);
+    CREATE INDEX logs_block_idx ON raw.logs (chain_id, block_number);
+
+    PERFORM raw.ensure_block_partition('raw.logs', chain_id, block_number)
+    FROM (SELECT DISTINCT chain_id, block_number - block_number % raw.block_partition_width()
+          AS block_number FROM raw.logs_unpartitioned) p;
+    INSERT INTO raw.logs SELECT * FROM raw.logs_unpartitioned;
+    DROP TABLE raw.logs_unpartitioned;
+  END IF;
+END $$;
+
+-- TRANSACTIONS
+DO $$
+BEGIN
+  IF (SELECT relkind FROM pg_class WHERE oid = 'raw.transactions'::regclass) = 'r' THEN
+    ALTER TABLE raw.transactions RENAME TO transactions_unpartitioned;
+    ALTER INDEX raw.txs_pk RENAME TO txs_unpartitioned_pk;
+    ALTER INDEX raw.txs_block_idx RENAME TO txs_unpartitioned_block_idx;
+
+    CREATE TABLE raw.transactions (
+      LIKE raw.transactions_unpartitioned INCLUDING DEFAULTS,
+      CONSTRAINT txs_pk PRIMARY KEY (chain_id, block_number, hash)
+    ) PARTITION BY LIST (chain_id);
+    CREATE INDEX txs_block_idx ON raw.transactions (chain_id, block_number);
+
+    PERFORM raw.ensure_block_partition('raw.transactions', chain_id, block_number)
+    FROM (SELECT DISTINCT chain_id, block_number - block_number % raw.block_partition_width()
+          AS block_number FROM raw.transactions_unpartitioned) p;
+    INSERT INTO raw.transactions SELECT * FROM raw.transactions_unpartitioned;
+    DROP TABLE raw.transactions_unpartitioned;
+  END IF;
+END $$;
+
+-- RECEIPTS
+DO $$
+BEGIN
+  IF (SELECT relkind FROM pg_class WHERE oid = 'raw.receipts'::regclass) = 'r' THEN
+    ALTER TABLE raw.receipts RENAME TO receipts_unpartitioned;
+    ALTER INDEX raw.receipts_pk RENAME TO receipts_unpartitioned_pk;
+    ALTER INDEX raw.receipts_block_idx RENAME TO receipts_unpartitioned_block_idx;
+
+    CREATE TABLE raw.receipts (
+      LIKE raw.receipts_unpartitioned INCLUDING DEFAULTS,
+      CONSTRAINT receipts_pk PRIMARY KEY (chain_id, block_number, transaction_hash)
+    ) PARTITION BY LIST (chain_id);
+    CREATE INDEX receipts_block_idx ON raw.receipts (chain_id, block_number);
+
+    PERFORM raw.ensure_block_partition('raw.receipts', chain_id, block_number)
+    FROM (SELECT DISTINCT chain_id, block_number - block_number % raw.block_partition_width()
+          AS block_number FROM raw.receipts_unpartitioned) p;
+    INSERT INTO raw.receipts SELECT * FROM raw.receipts_unpartitioned;
+    DROP TABLE raw.receipts_unpartitioned;
+  END IF;
+END $$;
@@ -3,15 +3,25 @@ from __future__ import annotations
 from typing import Callable, Dict
 
 from collector_engine.app.domain.ports.out import EvmReader
+from collector_engine.app.infrastructure.adapters.evm.jsonrpc_reader import JsonRpcEvmReader
 from collector_engine.app.infrastructure.adapters.evm.web3_reader import Web3EvmReader
-# from .jsonrpc_reader import JsonRpcEvmReader  # maybe later
+from collector_engine.app.infrastructure.config.settings import web3_config
 # from .fake_reader import FakeEvmReader       # for tests
 
 EvmReaderFactory = Callable[[str], EvmReader]
 
 _EVM_READER_REGISTRY: Dict[str, EvmReaderFactory] = {
-    "web3": lambda url: Web3EvmReader(url),
-    # "jsonrpc": lambda url: JsonRpcEvmReader(url),
+    "web3": lambda url: Web3EvmReader(
+        url,
+        batch_size=web3_config.client_batch_size,
+        max_batches_in_flight=web3_config.client_max_batches_in_flight,
+    ),
+    "jsonrpc": lambda url: JsonRpcEvmReader(
+        url,
+        max_concurrency=web3_config.client_max_concurrency,
+        request_timeout=web3_config.client_request_timeout,
+        batch_size=web3_config.client_batch_size,
+    ),
     # "fake": lambda url: FakeEvmReader(),
 }
 
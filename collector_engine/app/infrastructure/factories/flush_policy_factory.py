@@ -0,0 +1,23 @@
+from dataclasses import fields
+
+from collector_engine.app.domain.pure.flush_policy import FlushPolicy
+from collector_engine.app.infrastructure.config.settings import app_config
+from collector_engine.app.infrastructure.parquet.constants import FLUSH_POLICIES
+
+
+def flush_policy_factory(dataset: str) -> FlushPolicy:
+    """Flush policy of `dataset`: the FLUSH_POLICIES defaults with the setting merged over."""
+    default = FLUSH_POLICIES[dataset]
+    overrides = app_config.flush_policies.get(dataset, {})
+    if unknown := set(overrides) - {f.name for f in fields(FlushPolicy)}:
+        raise ValueError(f"Unknown flush policy fields for {dataset!r}: {sorted(unknown)}")
+
+    def limit(name: str) -> int | None:
+        value = overrides.get(name, getattr(default, name))
+        return None if value is None else int(value)
+
+    return FlushPolicy(
+        max_buffer_bytes=limit("max_buffer_bytes"),
+        target_file_bytes=limit("target_file_bytes"),
+        encoded_ratio=overrides.get("encoded_ratio") or default.encoded_ratio,
+    )
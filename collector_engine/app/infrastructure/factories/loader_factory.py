@@ -5,5 +5,11 @@ from collector_engine.app.infrastructure.config.settings import app_config
 
 def loader_factory(kind: str = "postgres_copy") -> DatasetLoader:
     if kind == "postgres_copy":
-        return PostgresCopyLoader(app_config.postgres_dsn)
+        return PostgresCopyLoader(
+            app_config.postgres_dsn,
+            max_connections=app_config.sql_load_connections,
+            parallelism=app_config.sql_load_parallelism,
+            group_bytes=app_config.sql_load_group_bytes,
+            attach_partitions=app_config.sql_attach_partitions,
+        )
     raise ValueError(f"Unknown loader kind: {kind!r}")
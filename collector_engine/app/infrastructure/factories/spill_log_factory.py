@@ -0,0 +1,21 @@
+from pathlib import Path
+
+import pyarrow as pa
+
+from collector_engine.app.domain.ports.out import SpillLog
+from collector_engine.app.infrastructure.adapters.storage.spill_log import (
+    ArrowSpillLog,
+    wal_directory,
+)
+from collector_engine.app.infrastructure.config.settings import app_config
+
+
+def spill_log_factory(base_path: str | Path, schema: pa.Schema) -> SpillLog | None:
+    """
+    Write-ahead spill for the collector of the dataset at `base_path`, None unless
+    COLLECTOR_WAL is set. Spill files are always local: with the s3 backend they go to
+    the same relative path on local disk (objects cannot be appended to).
+    """
+    if not app_config.collector_wal:
+        return None
+    return ArrowSpillLog(wal_directory(base_path), schema)
@@ -1,13 +1,50 @@
+import functools
 from typing import Callable, Dict
 from pathlib import Path
 
+import pyarrow as pa
+import pyarrow.fs as pafs
+
 from collector_engine.app.domain.ports.out import DatasetStore
+from collector_engine.app.infrastructure.adapters.storage.object_store import (
+    ObjectStoreDatasetStore,
+)
 from collector_engine.app.infrastructure.adapters.storage.parquet_store import ParquetDatasetStore
+from collector_engine.app.infrastructure.adapters.storage.partitioning import HivePartitioning
+from collector_engine.app.infrastructure.config.settings import app_config
 
 DatasetStoreFactory = Callable[[str | Path], DatasetStore]
 
+
+def _parquet_store(base_path: str | Path) -> DatasetStore:
+    bucket_size = app_config.parquet_block_bucket_size
+    partitioning = HivePartitioning(bucket_size=bucket_size) if bucket_size > 0 else None
+    return ParquetDatasetStore(
+        base_path, partitioning=partitioning, hot_tier=app_config.parquet_hot_tier
+    )
+
+
+@functools.cache
+def _s3_filesystem() -> pafs.S3FileSystem:
+    # parts of a multipart upload are sent from the IO pool while encoding continues
+    pa.set_io_thread_count(app_config.s3_io_threads)
+    return pafs.S3FileSystem(
+        endpoint_override=app_config.s3_endpoint,
+        scheme=app_config.s3_scheme,
+        region=app_config.s3_region,
+        access_key=app_config.s3_access_key,
+        secret_key=app_config.s3_secret_key,
+        background_writes=True,
+    )
+
+
+def _s3_store(base_path: str | Path) -> DatasetStore:
+    return ObjectStoreDatasetStore(base_path, filesystem=_s3_filesystem())
+
+
 _STORAGE_REGISTRY: Dict[str, DatasetStoreFactory] = {
-    "parquet": lambda base_path: ParquetDatasetStore(base_path),
+    "parquet": _parquet_store,
+    "s3": _s3_store,
     # "csv": lambda base_path: CsvDatasetStore(base_path),
     # "sql": lambda base_path: SqlDatasetStore(dsn, base_path)  # if needed
 }
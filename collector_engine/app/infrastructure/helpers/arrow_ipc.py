@@ -0,0 +1,40 @@
+import os
+from pathlib import Path
+
+import pyarrow as pa
+from pyarrow import ipc
+
+# hot tier: uncompressed Arrow IPC files, kept in <dataset>/_hot/ until promoted to parquet
+HOT_DIR = "_hot"
+IPC_SUFFIX = ".arrow"
+
+
+def write_ipc(file_path: Path, table: pa.Table) -> None:
+    """Write an uncompressed Arrow IPC file via a hidden temp file + atomic rename."""
+    file_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = file_path.with_name(f".{file_path.name}.tmp")
+    with pa.OSFile(str(tmp_path), "wb") as sink, ipc.new_file(sink, table.schema) as writer:
+        writer.write_table(table)
+    os.replace(tmp_path, file_path)
+
+
+def read_ipc(file_path: Path, columns: list[str] | None = None) -> pa.Table:
+    """Zero copy read: the returned buffers point into the memory mapped file."""
+    table = ipc.open_file(pa.memory_map(str(file_path))).read_all()
+    return table if columns is None else table.select(columns)
+
+
+def read_ipc_schema(file_path: Path) -> pa.Schema:
+    return ipc.open_file(pa.memory_map(str(file_path))).schema
+
+
+def list_ipc_files(base_path: Path) -> list[str]:
+    """Relative paths (HOT_DIR/<name>.arrow) of the hot files of a dataset directory."""
+    hot_path = base_path / HOT_DIR
+    if not hot_path.is_dir():
+        return []
+    return sorted(
+        f"{HOT_DIR}/{f}"
+        for f in os.listdir(hot_path)
+        if f.endswith(IPC_SUFFIX) and not f.startswith(("_", "."))
+    )
@@ -0,0 +1,43 @@
+import json
+import os
+from pathlib import Path
+from typing import Any
+
+import pyarrow.fs as pafs
+
+from collector_engine.app.infrastructure.helpers.parquet import create_path_if_not_exist
+
+
+def read_json(path: Path) -> Any | None:
+    """Read a JSON file. Missing file -> None."""
+    try:
+        with path.open() as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+
+def write_json_atomic(path: Path, data: Any) -> None:
+    """Write JSON to a temp file next to `path` and atomically replace it."""
+    create_path_if_not_exist(path.parent)
+    tmp_path = path.with_name(f".{path.name}.tmp")
+    with tmp_path.open("w") as f:
+        json.dump(data, f, indent=2, sort_keys=True)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+def read_json_object(filesystem: pafs.FileSystem, path: str) -> Any | None:
+    """Read a JSON object through a pyarrow filesystem (object storage). Missing -> None."""
+    try:
+        with filesystem.open_input_stream(path) as f:
+            return json.loads(f.read())
+    except FileNotFoundError:
+        return None
+
+
+def write_json_object(filesystem: pafs.FileSystem, path: str, data: Any) -> None:
+    """Single PUT of a JSON object; object stores make it visible atomically on close."""
+    with filesystem.open_output_stream(path) as f:
+        f.write(json.dumps(data, indent=2, sort_keys=True).encode())
@@ -1,43 +1,57 @@
+import hashlib
 import os
 import pandas as pd
 import pyarrow as pa
+import pyarrow.compute as pc
 import pyarrow.parquet as pq
 
-from typing import List
+from collections.abc import Iterable, Iterator
 from pathlib import Path
 
+from collector_engine.app.infrastructure.parquet.write_profiles import WriteProfile, profile_for
 
-def write_parquet(file_path: str, rows: list, schema: pa.Schema) -> None:
-    if not rows:
-        return
-    batch = pa.record_batch(rows, schema=schema)
+
+def write_table(file_path: str, table: pa.Table, profile: WriteProfile | None = None) -> None:
+    """
+    Write to a hidden temp file next to `file_path`, then atomically rename it.
+    The layout comes from the write profile of the table schema unless given.
+    """
+    path = Path(file_path)
+    tmp_path = path.with_name(f".{path.name}.tmp")
+    write_table_to(tmp_path, table, profile)
+    os.replace(tmp_path, path)
+
+
+def write_table_to(
+    where: str | Path | pa.NativeFile, table: pa.Table, profile: WriteProfile | None = None
+) -> None:
+    """Write `table` with its write profile to a path or an open (e.g. object storage) stream."""
+    profile = profile or profile_for(table.schema)
     pq.write_table(
-        pa.Table.from_batches([batch]),
-        file_path,
-        compression="zstd",
-        data_page_size=1 << 20,  # 1MB pages
+        table,
+        where,
+        row_group_size=profile.row_group_size,
+        **profile.write_options(table.schema, table.num_rows),
     )
 
 
-def write_and_flush_if_needed(
-    buffer: dict[str, list],
-    schema: pa.Schema,
-    pq_path: Path,
-    file_name: str,
-    rows_per_file: int,
-    force: bool = False,
-) -> dict[str, list]:
-    rows_in_buffer = len(buffer["block_number"])
-    if rows_in_buffer == 0:
-        return buffer
-    if rows_in_buffer >= rows_per_file or force:
-        if not pq_path.exists():
-            create_path_if_not_exist(pq_path)
-        file_path = pq_path / f"{file_name}.parquet"
-        rows = [pa.array(buffer[name], type=schema.field(name).type) for name in schema.names]
-        write_parquet(str(file_path), rows, schema)
-        return {name: [] for name in schema.names}
-    return buffer
+def row_groups(batches: Iterable[pa.RecordBatch], rows: int) -> Iterator[pa.Table]:
+    """
+    Re-chunk `batches` into tables of `rows` rows (the last one shorter), so a writer
+    gets full row groups instead of one small group per source batch.
+    """
+    pending: list[pa.RecordBatch] = []
+    pending_rows = 0
+    for batch in batches:
+        pending.append(batch)
+        pending_rows += batch.num_rows
+        while pending_rows >= rows:
+            table = pa.Table.from_batches(pending)
+            yield table.slice(0, rows)
+            rest = table.slice(rows)
+            pending, pending_rows = rest.to_batches(), rest.num_rows
+    if pending_rows:
+        yield pa.Table.from_batches(pending)
 
 
 def merge_parquet_files(
@@ -45,31 +59,89 @@ def merge_parquet_files(
     temp_files_lst: list[str],
     final_file_path: Path,
     final_file_name: str,
-    batch_size: int = 100_000,
+    batch_size: int | None = None,
 ) -> None:
-    """Merge multiple parquet files into a single parquet file."""
-    writer = None
-    try:
-        for f in temp_files_lst:
-            pf = pq.ParquetFile(temp_files_path / f"{f}.parquet")
-            for batch in pf.iter_batches(batch_size=batch_size):
-                if writer is None:
-                    writer = pq.ParquetWriter(
-                        final_file_path / f"{final_file_name}.parquet", batch.schema
-                    )
-                writer.write_batch(batch)
-    finally:
-        if writer is not None:
-            writer.close()
-
-
-def get_pq_names(pq_path: Path) -> List[str]:
-    if not pq_path or not pq_path.exists() or not pq_path.is_dir():
-        return []
-    try:
-        return os.listdir(pq_path)
-    except (FileNotFoundError, NotADirectoryError, PermissionError, OSError):
+    """
+    Merge multiple parquet files into a single parquet file, written with the write
+    profile of their schema in row groups of profile.row_group_size rows.
+    Sources are opened one at a time and streamed in batches of `batch_size` rows.
+    """
+    sources = [temp_files_path / f"{f}.parquet" for f in temp_files_lst]
+    if not sources:
+        return
+    schema = pq.read_schema(sources[0])
+    profile = profile_for(schema)
+    num_rows = sum(pq.read_metadata(path).num_rows for path in sources)
+
+    def batches() -> Iterator[pa.RecordBatch]:
+        for path in sources:
+            with pq.ParquetFile(path) as pf:
+                yield from pf.iter_batches(batch_size=batch_size or profile.row_group_size)
+
+    with pq.ParquetWriter(
+        final_file_path / f"{final_file_name}.parquet",
+        schema,
+        **profile.write_options(schema, num_rows),
+    ) as writer:
+        for table in row_groups(batches(), profile.row_group_size):
+            writer.write_table(table, row_group_size=profile.row_group_size)
+
+
+def column_range_from_footer(file_path: Path, column: str) -> tuple[int, int] | None:
+    """
+    (min, max) of a top-level integer column read from the row-group statistics in the
+    file footer. Falls back to reading just that column if a row group has no statistics.
+    """
+    metadata = pq.read_metadata(file_path)
+    if metadata.num_rows == 0:
+        return None
+
+    col_idx = next(
+        i for i in range(metadata.num_columns) if metadata.schema.column(i).path == column
+    )
+    lows, highs = [], []
+    for rg in range(metadata.num_row_groups):
+        stats = metadata.row_group(rg).column(col_idx).statistics
+        if stats is None or not stats.has_min_max:
+            min_max = pc.min_max(pq.read_table(file_path, columns=[column])[column]).as_py()
+            if min_max["min"] is None:
+                return None
+            return int(min_max["min"]), int(min_max["max"])
+        lows.append(stats.min)
+        highs.append(stats.max)
+    return int(min(lows)), int(max(highs))
+
+
+def parquet_fingerprint(file_path: Path) -> str:
+    """
+    sha256 of the parquet footer (schema, row group offsets, sizes and statistics):
+    changes whenever the file is rewritten with other content, costs one small read.
+    """
+    with open(file_path, "rb") as f:
+        f.seek(-8, os.SEEK_END)
+        tail = f.read(8)
+        footer_len = int.from_bytes(tail[:4], "little")
+        f.seek(-(8 + footer_len), os.SEEK_END)
+        return hashlib.sha256(f.read(footer_len)).hexdigest()
+
+
+def list_parquet_files(base_path: Path) -> list[str]:
+    """
+    Relative paths of all parquet files under base_path, including hive partition
+    directories; names starting with '_' or '.' (metadata, temp files) are skipped.
+    """
+    if not base_path.is_dir():
         return []
+    out: list[str] = []
+    for root, dirs, files in os.walk(base_path):
+        dirs[:] = [d for d in dirs if not d.startswith(("_", "."))]
+        rel = Path(root).relative_to(base_path)
+        out.extend(
+            (rel / f).as_posix()
+            for f in files
+            if f.endswith(".parquet") and not f.startswith(("_", "."))
+        )
+    return out
 
 
 def create_path_if_not_exist(path: Path) -> None:
@@ -1 +1,16 @@
+from collector_engine.app.domain.pure.flush_policy import MB, FlushPolicy
+
 ROWS_PER_FILE = 100_000
+
+# default per dataset flush thresholds, overridden by the FLUSH_POLICIES setting;
+# ROWS_PER_FILE stays the row cap. txs and receipts split their input file past these.
+FLUSH_POLICIES: dict[str, FlushPolicy] = {
+    "logs": FlushPolicy(max_buffer_bytes=512 * MB, target_file_bytes=128 * MB, encoded_ratio=0.35),
+    "txs": FlushPolicy(max_buffer_bytes=512 * MB, target_file_bytes=128 * MB, encoded_ratio=0.4),
+    # nested logs: a receipt carries every log of its tx, a few thousand dense receipts
+    # already weigh hundreds of MB
+    "receipts": FlushPolicy(
+        max_buffer_bytes=256 * MB, target_file_bytes=128 * MB, encoded_ratio=0.3
+    ),
+    "blocks": FlushPolicy(max_buffer_bytes=256 * MB, target_file_bytes=64 * MB, encoded_ratio=0.5),
+}
@@ -0,0 +1,126 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Any
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from collector_engine.app.infrastructure.parquet.schema import (
+    BLOCK_SCHEMA,
+    LOG_SCHEMA,
+    RECEIPT_SCHEMA,
+    TX_SCHEMA,
+)
+
+# shared by every parquet file we write
+BASE_WRITE_OPTIONS: dict[str, Any] = {
+    "compression": "zstd",
+    "data_page_size": 1 << 20,  # 1MB pages
+}
+
+
+@dataclass(frozen=True)
+class WriteProfile:
+    """
+    Parquet layout of one dataset.
+
+    - row_group_size: rows per row group (unit of statistics / bloom filter pruning),
+    - bloom_filter_columns: point-lookup columns (hashes, addresses, topics); the filters
+      are sized on the rows of the file being written,
+    - sorting_columns: order the rows are written in, declared in the row group metadata
+      (flush_buffer / merges guarantee it, the writer does not check),
+    - write_page_index: column + offset index, lets readers skip pages inside a row group,
+    - column_encoding / column_compression: per column overrides; columns with an
+      explicit encoding are not dictionary encoded.
+    """
+
+    row_group_size: int = 64 * 1024
+    bloom_filter_columns: tuple[str, ...] = ()
+    bloom_filter_fpp: float = 0.01
+    sorting_columns: tuple[str, ...] = ()
+    write_page_index: bool = True
+    column_encoding: dict[str, str] = field(default_factory=dict)
+    column_compression: dict[str, str] = field(default_factory=dict)
+
+    def write_options(self, schema: pa.Schema, num_rows: int) -> dict[str, Any]:
+        """Keyword arguments for pq.write_table / pq.ParquetWriter."""
+        names = set(schema.names)
+        options: dict[str, Any] = dict(BASE_WRITE_OPTIONS)
+        options["write_page_index"] = self.write_page_index
+
+        bloom = [c for c in self.bloom_filter_columns if c in names]
+        if bloom and num_rows > 0:
+            ndv = min(num_rows, self.row_group_size)
+            options["bloom_filter_options"] = {
+                c: {"ndv": ndv, "fpp": self.bloom_filter_fpp} for c in bloom
+            }
+
+        sorting = [c for c in self.sorting_columns if c in names]
+        if sorting:
+            options["sorting_columns"] = pq.SortingColumn.from_ordering(
+                schema, [(c, "ascending") for c in sorting]
+            )
+
+        encoding = {c: e for c, e in self.column_encoding.items() if c in names}
+        if encoding:
+            options["column_encoding"] = encoding
+            options["use_dictionary"] = [c for c in schema.names if c not in encoding]
+
+        if self.column_compression:
+            options["compression"] = {
+                c: self.column_compression.get(c, BASE_WRITE_OPTIONS["compression"])
+                for c in schema.names
+            }
+        return options
+
+
+DEFAULT_PROFILE = WriteProfile(write_page_index=False)
+
+LOG_PROFILE = WriteProfile(
+    bloom_filter_columns=(
+        "transaction_hash",
+        "address",
+        "topic0",
+        "topic1",
+        "topic2",
+        "topic3",
+    ),
+    sorting_columns=("block_number", "log_index"),
+    # random 32 byte hashes do not dictionary encode
+    column_encoding={"transaction_hash": "PLAIN"},
+)
+
+TX_PROFILE = WriteProfile(
+    bloom_filter_columns=("hash", "from", "to"),
+    sorting_columns=("block_number", "transaction_index"),
+    column_encoding={"hash": "PLAIN"},
+)
+
+RECEIPT_PROFILE = WriteProfile(
+    bloom_filter_columns=("transaction_hash", "from", "to", "contract_address"),
+    sorting_columns=("block_number", "transaction_index"),
+    column_encoding={"transaction_hash": "PLAIN"},
+)
+
+BLOCK_PROFILE = WriteProfile(
+    bloom_filter_columns=("block_hash",),
+    sorting_columns=("block_number",),
+    column_encoding={"block_hash": "PLAIN", "parent_hash": "PLAIN"},
+)
+
+WRITE_PROFILES: list[tuple[pa.Schema, WriteProfile]] = [
+    (LOG_SCHEMA, LOG_PROFILE),
+    (TX_SCHEMA, TX_PROFILE),
+    (RECEIPT_SCHEMA, RECEIPT_PROFILE),
+    (BLOCK_SCHEMA, BLOCK_PROFILE),
+]
+
+
+def profile_for(schema: pa.Schema) -> WriteProfile:
+    """Profile of the dataset `schema` belongs to (field names and types, not nullability)."""
+    key = [(f.name, f.type) for f in schema]
+    for known, profile in WRITE_PROFILES:
+        if [(f.name, f.type) for f in known] == key:
+            return profile
+    return DEFAULT_PROFILE
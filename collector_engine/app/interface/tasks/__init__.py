@@ -10,16 +10,19 @@ from collector_engine.app.interface.tasks.load_contract_scoped_data_to_sql_task
 )
 
 from .logs_task import logs_task
+from .protocol_logs_task import protocol_logs_task
 from .transactions_task import transactions_task
 from .receipts_task import receipts_task
 from .pipeline_task import pipeline_task
 from .validate_pipeline_datasets_task import validate_pipeline_datasets_task
 from .blocks_task import blocks_task
+from .compaction_task import compaction_task
 
 TaskFn = Callable[[int, str, str], Awaitable[None]]
 
 TASKS: dict[str, TaskFn] = {
     "logs_task": logs_task,
+    "protocol_logs_task": protocol_logs_task,
     "transactions_task": transactions_task,
     "receipts_task": receipts_task,
     "pipeline_task": pipeline_task,
@@ -27,4 +30,5 @@ TASKS: dict[str, TaskFn] = {
     "load_contract_scoped_data_to_sql_task": load_contract_scoped_data_to_sql_task,
     "load_chain_scoped_data_to_sql_task": load_chain_scoped_data_to_sql_task,
     "blocks_task": blocks_task,
+    "compaction_task": compaction_task,
 }
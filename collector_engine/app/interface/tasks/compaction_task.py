@@ -0,0 +1,30 @@
+from __future__ import annotations
+
+import asyncio
+from pathlib import Path
+
+from collector_engine.app.application.services.compaction import LinkedDataset, compact_datasets
+from collector_engine.app.infrastructure.config.settings import app_config
+from collector_engine.app.infrastructure.factories.storage_factory import storage_factory
+
+
+async def compaction_task(chain_id: int, protocol: str, contract_name: str) -> None:
+    """
+    Merge small adjacent logs/txs/receipts parquet files of (protocol, contract).
+    Run it while no collector is writing these datasets.
+    """
+    base_path = Path(app_config.data_path) / protocol / contract_name
+    datasets = [
+        LinkedDataset(
+            store=storage_factory(app_config.storage_backend, base_path / "logs"), prefix="logs"
+        ),
+        LinkedDataset(
+            store=storage_factory(app_config.storage_backend, base_path / "transactions"),
+            prefix="txs",
+        ),
+        LinkedDataset(
+            store=storage_factory(app_config.storage_backend, base_path / "receipts"),
+            prefix="receipts",
+        ),
+    ]
+    await asyncio.to_thread(compact_datasets, datasets)
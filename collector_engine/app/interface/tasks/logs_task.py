@@ -3,17 +3,19 @@ from pathlib import Path
 from collector_engine.app.infrastructure.config.settings import app_config, web3_config
 from collector_engine.app.domain.ports.out import EvmReader, DatasetStore
 from collector_engine.app.infrastructure.factories.evm_reader_factory import evm_reader_factory
+from collector_engine.app.infrastructure.factories.flush_policy_factory import flush_policy_factory
+from collector_engine.app.infrastructure.factories.spill_log_factory import spill_log_factory
 from collector_engine.app.infrastructure.factories.storage_factory import storage_factory
+from collector_engine.app.infrastructure.parquet.schema import LOG_SCHEMA
 from collector_engine.app.infrastructure.registry.registry import get_protocol_info
 from collector_engine.app.application.services.collectors.collect_logs import collect_logs
+from collector_engine.app.application.services.hot_tier import promoted_on_exit
 
 
 async def logs_task(chain_id: int, protocol: str, contract_name: str) -> None:
     """Collect logs for a specific contract."""
-    reader: EvmReader = evm_reader_factory("web3", web3_config.rpc_url(chain_id))
-
     base_path = Path(app_config.data_path) / protocol / contract_name / "logs"
-    store: DatasetStore = storage_factory("parquet", base_path)
+    store: DatasetStore = storage_factory(app_config.storage_backend, base_path)
 
     protocol_info = get_protocol_info(chain_id, protocol)
     try:
@@ -23,9 +25,18 @@ async def logs_task(chain_id: int, protocol: str, contract_name: str) -> None:
             f"Contract {contract_name!r} not found in protocol {protocol!r} for chain {chain_id}"
         )
 
-    await collect_logs(
-        chain_id=chain_id,
-        contract_info=contract_info,
-        reader=reader,
-        store=store,
+    reader: EvmReader = evm_reader_factory(
+        web3_config.evm_reader_backend, web3_config.rpc_url(chain_id)
     )
+    try:
+        async with promoted_on_exit(store):
+            await collect_logs(
+                chain_id=chain_id,
+                contract_info=contract_info,
+                reader=reader,
+                store=store,
+                spill=spill_log_factory(base_path, LOG_SCHEMA),
+                flush_policy=flush_policy_factory("logs"),
+            )
+    finally:
+        await reader.close()
@@ -2,7 +2,10 @@ from pathlib import Path
 
 from collector_engine.app.infrastructure.config.settings import app_config, web3_config
 from collector_engine.app.infrastructure.factories.evm_reader_factory import evm_reader_factory
+from collector_engine.app.infrastructure.factories.flush_policy_factory import flush_policy_factory
+from collector_engine.app.infrastructure.factories.spill_log_factory import spill_log_factory
 from collector_engine.app.infrastructure.factories.storage_factory import storage_factory
+from collector_engine.app.infrastructure.parquet.schema import LOG_SCHEMA
 from collector_engine.app.infrastructure.registry.registry import get_protocol_info
 
 from collector_engine.app.application.services.run_pipeline import (
@@ -13,12 +16,10 @@ from collector_engine.app.application.services.run_pipeline import (
 
 
 async def pipeline_task(chain_id: int, protocol: str, contract_name: str) -> None:
-    reader = evm_reader_factory("web3", web3_config.rpc_url(chain_id))
-
     base_path = Path(app_config.data_path) / protocol / contract_name
-    logs_store = storage_factory("parquet", base_path / "logs")
-    tx_store = storage_factory("parquet", base_path / "transactions")
-    receipts_store = storage_factory("parquet", base_path / "receipts")
+    logs_store = storage_factory(app_config.storage_backend, base_path / "logs")
+    tx_store = storage_factory(app_config.storage_backend, base_path / "transactions")
+    receipts_store = storage_factory(app_config.storage_backend, base_path / "receipts")
 
     protocol_info = get_protocol_info(chain_id, protocol)
     try:
@@ -28,12 +29,25 @@ async def pipeline_task(chain_id: int, protocol: str, contract_name: str) -> Non
             f"Contract {contract_name!r} not found in protocol {protocol!r} for chain {chain_id}"
         )
 
-    cfg = PipelineConfig(chain_id=chain_id, protocol=protocol, contract_info=contract_info)
-    deps = PipelineDeps(
-        reader=reader,
-        logs_store=logs_store,
-        tx_store=tx_store,
-        receipts_store=receipts_store,
+    cfg = PipelineConfig(
+        chain_id=chain_id,
+        protocol=protocol,
+        contract_info=contract_info,
+        streaming=app_config.pipeline_streaming,
+        logs_flush_policy=flush_policy_factory("logs"),
+        txs_flush_policy=flush_policy_factory("txs"),
+        receipts_flush_policy=flush_policy_factory("receipts"),
     )
+    reader = evm_reader_factory(web3_config.evm_reader_backend, web3_config.rpc_url(chain_id))
+    try:
+        deps = PipelineDeps(
+            reader=reader,
+            logs_store=logs_store,
+            tx_store=tx_store,
+            receipts_store=receipts_store,
+            logs_spill=spill_log_factory(base_path / "logs", LOG_SCHEMA),
+        )
 
-    await run_pipeline(cfg=cfg, deps=deps)
+        await run_pipeline(cfg=cfg, deps=deps)
+    finally:
+        await reader.close()
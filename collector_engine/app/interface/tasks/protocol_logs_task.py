@@ -0,0 +1,38 @@
+from pathlib import Path
+
+from collector_engine.app.application.services.collectors.collect_protocol_logs import (
+    collect_protocol_logs,
+)
+from collector_engine.app.application.services.hot_tier import promoted_on_exit
+from collector_engine.app.domain.ports.out import DatasetStore, EvmReader
+from collector_engine.app.infrastructure.config.settings import app_config, web3_config
+from collector_engine.app.infrastructure.factories.evm_reader_factory import evm_reader_factory
+from collector_engine.app.infrastructure.factories.flush_policy_factory import flush_policy_factory
+from collector_engine.app.infrastructure.factories.storage_factory import storage_factory
+from collector_engine.app.infrastructure.registry.registry import get_protocol_info
+
+
+async def protocol_logs_task(chain_id: int, protocol: str, contract_name: str) -> None:
+    """Collect logs for all contracts of a protocol in one pass (contract_name is ignored)."""
+    protocol_info = get_protocol_info(chain_id, protocol)
+    stores: dict[str, DatasetStore] = {
+        c.name: storage_factory(
+            app_config.storage_backend, Path(app_config.data_path) / protocol / c.name / "logs"
+        )
+        for c in protocol_info.contracts
+    }
+
+    reader: EvmReader = evm_reader_factory(
+        web3_config.evm_reader_backend, web3_config.rpc_url(chain_id)
+    )
+    try:
+        async with promoted_on_exit(*stores.values()):
+            await collect_protocol_logs(
+                chain_id=chain_id,
+                contracts=protocol_info.contracts,
+                reader=reader,
+                stores=stores,
+                flush_policy=flush_policy_factory("logs"),
+            )
+    finally:
+        await reader.close()
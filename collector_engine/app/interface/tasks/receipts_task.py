@@ -3,18 +3,20 @@ from pathlib import Path
 from collector_engine.app.infrastructure.config.settings import app_config, web3_config
 from collector_engine.app.domain.ports.out import EvmReader, DatasetStore
 from collector_engine.app.infrastructure.factories.evm_reader_factory import evm_reader_factory
+from collector_engine.app.infrastructure.factories.flush_policy_factory import flush_policy_factory
 from collector_engine.app.infrastructure.factories.storage_factory import storage_factory
 from collector_engine.app.infrastructure.registry.registry import get_protocol_info
 from collector_engine.app.application.services.collectors.collect_receipts import collect_receipts
+from collector_engine.app.application.services.hot_tier import promoted_on_exit
 
 
 async def receipts_task(chain_id: int, protocol: str, contract_name: str) -> None:
     """Collect receipts for a specific contract."""
-    reader: EvmReader = evm_reader_factory("web3", web3_config.rpc_url(chain_id))
-
     base_path = Path(app_config.data_path) / protocol / contract_name
-    tx_store: DatasetStore = storage_factory("parquet", base_path / "transactions")
-    receipts_store: DatasetStore = storage_factory("parquet", base_path / "receipts")
+    tx_store: DatasetStore = storage_factory(app_config.storage_backend, base_path / "transactions")
+    receipts_store: DatasetStore = storage_factory(
+        app_config.storage_backend, base_path / "receipts"
+    )
 
     protocol_info = get_protocol_info(chain_id, protocol)
     try:
@@ -24,10 +26,18 @@ async def receipts_task(chain_id: int, protocol: str, contract_name: str) -> Non
             f"Contract {contract_name!r} not found in protocol {protocol!r} for chain {chain_id}"
         )
 
-    await collect_receipts(
-        chain_id=chain_id,
-        contract_info=contract_info,
-        reader=reader,
-        tx_store=tx_store,
-        receipts_store=receipts_store,
+    reader: EvmReader = evm_reader_factory(
+        web3_config.evm_reader_backend, web3_config.rpc_url(chain_id)
     )
+    try:
+        async with promoted_on_exit(receipts_store):
+            await collect_receipts(
+                chain_id=chain_id,
+                contract_info=contract_info,
+                reader=reader,
+                tx_store=tx_store,
+                receipts_store=receipts_store,
+                flush_policy=flush_policy_factory("receipts"),
+            )
+    finally:
+        await reader.close()
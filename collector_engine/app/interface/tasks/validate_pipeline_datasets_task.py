@@ -18,13 +18,14 @@ async def validate_pipeline_datasets_task(chain_id: int, protocol: str, contract
     """
     Validate logs/txs/receipts parquet sets for given (chain, protocol, contract).
     """
-    # reader not required for validation, but kept consistent with other tasks:
-    _ = evm_reader_factory("web3", web3_config.rpc_url(chain_id))
+    # reader not required for validation, but kept consistent with other tasks
+    # (checks the chain's RPC settings); closed right away, it holds an HTTP session
+    await evm_reader_factory(web3_config.evm_reader_backend, web3_config.rpc_url(chain_id)).close()
 
     base_path = Path(app_config.data_path) / protocol / contract_name
-    logs_store = storage_factory("parquet", base_path / "logs")
-    tx_store = storage_factory("parquet", base_path / "transactions")
-    receipts_store = storage_factory("parquet", base_path / "receipts")
+    logs_store = storage_factory(app_config.storage_backend, base_path / "logs")
+    tx_store = storage_factory(app_config.storage_backend, base_path / "transactions")
+    receipts_store = storage_factory(app_config.storage_backend, base_path / "receipts")
 
     protocol_info = get_protocol_info(chain_id, protocol)
     try:
@@ -0,0 +1,117 @@
+"""
+File size, write time and lookup latency of LOG_SCHEMA files written with the plain
+options (DEFAULT_PROFILE) vs LOG_PROFILE.
+
+Lookups go through pyarrow.dataset, which prunes on row group statistics and the page
+index but does not read bloom filters; those pay off in engines that do (DuckDB, Spark,
+Trino), so hash lookups here only show their size cost.
+
+    uv run python -m collector_engine.benchmarks.parquet_write_profiles --rows 500000
+"""
+
+from __future__ import annotations
+
+import argparse
+import functools
+import os
+import random
+import statistics
+import tempfile
+import time
+from collections.abc import Callable
+from pathlib import Path
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.dataset as ds
+
+from collector_engine.app.infrastructure.helpers.parquet import write_table
+from collector_engine.app.infrastructure.parquet.schema import LOG_SCHEMA
+from collector_engine.app.infrastructure.parquet.write_profiles import (
+    DEFAULT_PROFILE,
+    LOG_PROFILE,
+    WriteProfile,
+)
+
+
+def synthetic_logs(rows: int, *, logs_per_block: int = 8, seed: int = 0) -> pa.Table:
+    """Sorted logs: few contracts / event signatures, random tx hashes, small data."""
+    rng = np.random.default_rng(seed)
+
+    def fixed(values: np.ndarray, width: int) -> pa.Array:
+        return pa.FixedSizeBinaryArray.from_buffers(
+            pa.binary(width), len(values), [None, pa.py_buffer(values.tobytes())]
+        )
+
+    addresses = rng.integers(0, 256, size=(64, 20), dtype=np.uint8)
+    topics = rng.integers(0, 256, size=(16, 32), dtype=np.uint8)
+    blocks = 18_000_000 + np.arange(rows, dtype=np.int64) // logs_per_block
+    block_hashes = rng.integers(0, 256, size=(rows // logs_per_block + 1, 32), dtype=np.uint8)
+    return pa.table(
+        {
+            "chain_id": pa.array(np.ones(rows, dtype=np.int32)),
+            "block_number": pa.array(blocks),
+            "block_hash": fixed(block_hashes[blocks - blocks[0]], 32),
+            "transaction_hash": fixed(rng.integers(0, 256, size=(rows, 32), dtype=np.uint8), 32),
+            "log_index": pa.array((np.arange(rows) % logs_per_block).astype(np.int32)),
+            "address": fixed(addresses[rng.integers(0, 64, rows)], 20),
+            "topic0": fixed(topics[rng.integers(0, 16, rows)], 32),
+            "topic1": fixed(rng.integers(0, 256, size=(rows, 32), dtype=np.uint8), 32),
+            "topic2": fixed(rng.integers(0, 256, size=(rows, 32), dtype=np.uint8), 32),
+            "topic3": pa.nulls(rows, pa.binary(32)),
+            "data": pa.array([os.urandom(64) for _ in range(rows)], pa.binary()),
+            "removed": pa.array(np.zeros(rows, dtype=bool)),
+        },
+        schema=LOG_SCHEMA,
+    )
+
+
+def _median_ms(fn: Callable[[], object], repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - started) * 1000)
+    return statistics.median(samples)
+
+
+def _lookup_ms(dataset: ds.Dataset, column: str, values: list) -> float:
+    it = iter(values * 2)
+    return _median_ms(lambda: dataset.to_table(filter=ds.field(column) == next(it)), len(values))
+
+
+def run(rows: int, lookups: int) -> None:
+    table = synthetic_logs(rows)
+    rng = random.Random(0)
+    hashes = [table["transaction_hash"][rng.randrange(rows)].as_py() for _ in range(lookups)]
+    addresses = [table["address"][rng.randrange(rows)].as_py() for _ in range(lookups)]
+    blocks = [table["block_number"][rng.randrange(rows)].as_py() for _ in range(lookups)]
+
+    profiles: dict[str, WriteProfile] = {"default": DEFAULT_PROFILE, "log_profile": LOG_PROFILE}
+    print(f"{rows:,} rows, {lookups} lookups per query (median ms)")
+    print(
+        f"{'profile':<12} {'size MB':>8} {'write ms':>9} {'tx_hash':>9} {'address':>9} {'block':>9}"
+    )
+    with tempfile.TemporaryDirectory() as tmp:
+        for label, profile in profiles.items():
+            path = Path(tmp) / f"{label}.parquet"
+            write_ms = _median_ms(functools.partial(write_table, str(path), table, profile), 3)
+            dataset = ds.dataset(path, format="parquet")
+            print(
+                f"{label:<12} {path.stat().st_size / 1e6:>8.1f} {write_ms:>9.1f}"
+                f" {_lookup_ms(dataset, 'transaction_hash', hashes):>9.2f}"
+                f" {_lookup_ms(dataset, 'address', addresses):>9.2f}"
+                f" {_lookup_ms(dataset, 'block_number', blocks):>9.2f}"
+            )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=500_000)
+    parser.add_argument("--lookups", type=int, default=20)
+    args = parser.parse_args()
+    run(args.rows, args.lookups)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,175 @@
+"""
+COPY payload encoding of the SQL loader: per row path (_iter_py_rows, one as_py() and
+wrapper per cell, formatted by psycopg's write_row) vs the column at a time binary
+encoder (pg_binary_copy.encode_batch).
+
+Without --dsn only the Python side is timed (row path: value conversion only, psycopg's
+formatting excluded, so it is a lower bound). With --dsn both paths COPY into a temp
+table LIKE the raw.* table (001_raw_schema.sql must be applied).
+
+    uv run python -m collector_engine.benchmarks.pg_binary_copy --rows 200000
+    uv run python -m collector_engine.benchmarks.pg_binary_copy --dsn postgresql://...
+"""
+
+from __future__ import annotations
+
+import argparse
+import functools
+from decimal import Decimal
+
+import numpy as np
+import psycopg
+import pyarrow as pa
+
+from collector_engine.app.infrastructure.adapters.db.pg_binary_copy import (
+    COPY_BINARY_HEADER,
+    COPY_BINARY_TRAILER,
+    encode_batch,
+)
+from collector_engine.app.infrastructure.adapters.db.postgres_copy_loader import (
+    LOGS_COPY_SPEC,
+    TXS_COPY_SPEC,
+    CopySpec,
+    PostgresCopyLoader,
+)
+from collector_engine.app.infrastructure.parquet.schema import TX_SCHEMA
+from collector_engine.benchmarks.parquet_write_profiles import _median_ms, synthetic_logs
+
+BATCH_ROWS = 50_000
+
+# column types of raw.logs / raw.transactions (001_raw_schema.sql)
+PG_TYPES = {
+    "raw.logs": {
+        "chain_id": "int4",
+        "log_index": "int4",
+        "block_number": "int8",
+        "removed": "bool",
+    },
+    "raw.transactions": {
+        "chain_id": "int4",
+        "transaction_index": "int4",
+        "type": "int4",
+        "y_parity": "int4",
+        "block_number": "int8",
+        "gas": "int8",
+        "nonce": "int8",
+        "v": "int8",
+        "gas_price": "numeric",
+        "max_fee_per_gas": "numeric",
+        "max_priority_fee_per_gas": "numeric",
+        "value": "numeric",
+        "r": "text",
+        "s": "text",
+        "access_list": "jsonb",
+    },
+}
+
+
+def synthetic_txs(rows: int, *, seed: int = 0) -> pa.Table:
+    rng = np.random.default_rng(seed)
+    hashes = rng.integers(0, 256, size=(rows, 32), dtype=np.uint8)
+    return pa.Table.from_pylist(
+        [
+            {
+                "block_hash": hashes[i // 100].tobytes(),
+                "block_number": 18_000_000 + i // 100,
+                "from": hashes[i, :20].tobytes(),
+                "gas": 21_000 + i % 50_000,
+                "gas_price": Decimal(10**10 + i),
+                "max_fee_per_gas": Decimal(2 * 10**10 + i),
+                "max_priority_fee_per_gas": Decimal(10**9),
+                "hash": hashes[i].tobytes(),
+                "input": hashes[i].tobytes() * (i % 8),
+                "nonce": i,
+                "to": hashes[-1 - i, :20].tobytes(),
+                "transaction_index": i % 100,
+                "value": Decimal(10**18 * (i % 5)),
+                "type": 2,
+                "chain_id": 1,
+                "v": 0,
+                "r": "0x" + hashes[i].tobytes().hex(),
+                "s": "0x" + hashes[-1 - i].tobytes().hex(),
+                "y_parity": i % 2,
+                "access_list": [] if i % 10 else [{"address": b"\x01" * 20, "storage_keys": []}],
+            }
+            for i in range(rows)
+        ],
+        schema=TX_SCHEMA,
+    )
+
+
+def _pg_types(spec: CopySpec) -> list[str]:
+    types = PG_TYPES[spec.table]
+    return [types.get(c, "bytea") for c in spec.columns]
+
+
+def _encode_rows(table: pa.Table, spec: CopySpec) -> None:
+    loader = PostgresCopyLoader("", copy_format="text")
+    for batch in table.to_batches(BATCH_ROWS):
+        for _ in loader._iter_py_rows(batch, spec):
+            pass
+
+
+def _encode_binary(table: pa.Table, spec: CopySpec) -> None:
+    pg_types = _pg_types(spec)
+    for batch in table.to_batches(BATCH_ROWS):
+        encode_batch(batch, spec.columns, pg_types)
+
+
+def _copy(dsn: str, table: pa.Table, spec: CopySpec, copy_format: str) -> None:
+    cols = ", ".join(f'"{c}"' for c in spec.columns)
+    with psycopg.connect(dsn) as conn, conn.cursor() as cur:
+        cur.execute(f"CREATE TEMP TABLE bench (LIKE {spec.table})")
+        with cur.copy(f"COPY bench ({cols}) FROM STDIN WITH (FORMAT {copy_format})") as copy:
+            if copy_format == "binary":
+                pg_types = _pg_types(spec)
+                copy.write(COPY_BINARY_HEADER)
+                for batch in table.to_batches(BATCH_ROWS):
+                    copy.write(encode_batch(batch, spec.columns, pg_types))
+                copy.write(COPY_BINARY_TRAILER)
+            else:
+                loader = PostgresCopyLoader(dsn, copy_format="text")
+                for batch in table.to_batches(BATCH_ROWS):
+                    for row in loader._iter_py_rows(batch, spec):
+                        copy.write_row(row)
+        conn.rollback()
+
+
+def run(rows: int, dsn: str | None, repeat: int) -> None:
+    datasets = [
+        ("logs", synthetic_logs(rows), LOGS_COPY_SPEC),
+        ("txs", synthetic_txs(rows), TXS_COPY_SPEC),
+    ]
+    print(f"{rows:,} rows per dataset (median ms of {repeat})")
+    print(f"{'dataset':<8} {'step':<7} {'row path':>10} {'binary':>10} {'speedup':>8}")
+    for label, table, spec in datasets:
+        steps = {
+            "encode": (
+                functools.partial(_encode_rows, table, spec),
+                functools.partial(_encode_binary, table, spec),
+            )
+        }
+        if dsn is not None:
+            steps["copy"] = (
+                functools.partial(_copy, dsn, table, spec, "text"),
+                functools.partial(_copy, dsn, table, spec, "binary"),
+            )
+        for step, (row_path, binary) in steps.items():
+            row_ms = _median_ms(row_path, repeat)
+            binary_ms = _median_ms(binary, repeat)
+            print(
+                f"{label:<8} {step:<7} {row_ms:>10.1f} {binary_ms:>10.1f} {row_ms / binary_ms:>7.1f}x"
+            )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--dsn", default=None)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    run(args.rows, args.dsn, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from collector_engine.app.application.services.background_writer import BackgroundWriter
+from collector_engine.app.domain.pure.column_buffer import ColumnBuffer
+from collector_engine.app.infrastructure.adapters.storage.parquet_store import ParquetDatasetStore
+from collector_engine.app.infrastructure.parquet.schema import BLOCK_SCHEMA
+
+
+def _blocks_buffer(numbers: list[int]) -> ColumnBuffer:
+    buffer = ColumnBuffer(BLOCK_SCHEMA)
+    buffer.extend(
+        {
+            "chain_id": 1,
+            "block_number": n,
+            "block_hash": b"\xaa" * 32,
+            "parent_hash": b"\xbb" * 32,
+            "timestamp": 1_700_000_000 + n,
+            "base_fee_per_gas": None,
+            "gas_used": None,
+            "gas_limit": None,
+            "tx_count": 0,
+        }
+        for n in numbers
+    )
+    return buffer
+
+
+class SlowStore(ParquetDatasetStore):
+    """Blocks the calling thread on every write, records which thread wrote."""
+
+    def __init__(self, base_path, fail: bool = False):
+        super().__init__(base_path)
+        self.fail = fail
+        self.threads: list[int] = []
+
+    def write_table(self, **kwargs):
+        self.threads.append(threading.get_ident())
+        time.sleep(0.05)
+        if self.fail:
+            raise OSError("disk full")
+        return super().write_table(**kwargs)
+
+
+async def _flush(writer: BackgroundWriter, store, numbers: list[int]) -> ColumnBuffer:
+    return await writer.flush(
+        buffer=_blocks_buffer(numbers),
+        store=store,
+        rows_per_file=2,
+        force=False,
+        file_prefix="blocks",
+        block_field="block_number",
+        index_field="block_number",
+    )
+
+
+@pytest.mark.asyncio
+async def test_background_writer_writes_off_loop_in_order(tmp_path):
+    store = SlowStore(tmp_path)
+    ticks = 0
+
+    async def ticker():
+        nonlocal ticks
+        while True:
+            ticks += 1
+            await asyncio.sleep(0.005)
+
+    tick_task = asyncio.create_task(ticker())
+    async with BackgroundWriter(max_pending=2) as writer:
+        # below threshold: buffer is kept
+        assert len(await _flush(writer, store, [1])) == 1
+        for start in range(0, 8, 2):
+            returned = await _flush(writer, store, [start + 1, start])
+            assert len(returned) == 0
+    tick_task.cancel()
+
+    assert ticks > 10  # the loop kept running during the 4 x 50ms writes
+    assert threading.get_ident() not in store.threads
+    assert sorted(store.list_names()) == [f"blocks_{i}_{i + 1}.parquet" for i in range(0, 8, 2)]
+    assert store.read_table("blocks_0_1.parquet")["block_number"].to_pylist() == [0, 1]
+
+
+@pytest.mark.asyncio
+async def test_background_writer_propagates_write_errors(tmp_path):
+    store = SlowStore(tmp_path, fail=True)
+
+    with pytest.raises(OSError, match="disk full"):
+        async with BackgroundWriter() as writer:
+            await _flush(writer, store, [1, 2])
+
+    with pytest.raises(OSError, match="disk full"):
+        async with BackgroundWriter(max_pending=1) as writer:
+            await _flush(writer, store, [1, 2])
+            await _flush(writer, store, [3, 4])  # waits for the failed write
+            pytest.fail("write error not raised on the next flush")
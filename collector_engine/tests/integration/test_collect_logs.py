@@ -1,9 +1,22 @@
+import asyncio
+import time
+
 import pytest
 import pyarrow as pa
 
 from collector_engine.app.infrastructure.adapters.storage.parquet_store import ParquetDatasetStore
-from collector_engine.app.application.services.collectors.collect_logs import collect_logs
+from collector_engine.app.infrastructure.adapters.storage.spill_log import (
+    ArrowSpillLog,
+    wal_directory,
+)
+from collector_engine.app.infrastructure.parquet.schema import LOG_SCHEMA
+from collector_engine.app.application.services.collectors.collect_logs import (
+    collect_logs,
+    load_window,
+)
 from collector_engine.app.infrastructure.registry.schemas import ContractInfo
+from collector_engine.app.application.services.streaming import FileCommitted
+from collector_engine.app.application.services.prefetch import prefetch_ordered
 
 
 class FakeEvmReader:
@@ -78,3 +91,260 @@ async def test_collect_logs_idempotent(tmp_path):
     )
     names_after = set(store.list_names())
     assert names_after == names_before, "Collecting again should not create new files"
+
+
+class LimitedEvmReader(FakeEvmReader):
+    """Fails like a provider result cap when asked for more than `max_blocks` blocks."""
+
+    def __init__(self, latest: int, max_blocks: int):
+        super().__init__(latest)
+        self.max_blocks = max_blocks
+        self.calls: list[tuple[int, int]] = []
+
+    async def get_logs(self, *, address: bytes, from_block: int, to_block: int):
+        self.calls.append((from_block, to_block))
+        if to_block - from_block + 1 > self.max_blocks:
+            raise ValueError({"code": -32005, "message": "query returned more than 10000 results"})
+        return await super().get_logs(address=address, from_block=from_block, to_block=to_block)
+
+
+@pytest.mark.asyncio
+async def test_collect_logs_adaptive_window_bisects_and_remembers_profile(tmp_path):
+    reader = LimitedEvmReader(latest=199, max_blocks=8)
+    store = ParquetDatasetStore(tmp_path / "logs")
+    contract = ContractInfo(name="PoolManager", abi="", address=b"\x11" * 20, genesis_block=100)
+
+    await collect_logs(
+        chain_id=1,
+        contract_info=contract,
+        reader=reader,
+        store=store,
+        batch_size=32,
+    )
+
+    blocks = sorted(
+        b for name in store.list_names() for b in store.read_table(name)["block_number"].to_pylist()
+    )
+    assert blocks == list(range(100, 200))
+    assert reader.calls[:3] == [(100, 131), (100, 115), (100, 107)]
+
+    profile = store.read_metadata("logs_window")
+    assert profile is not None
+    assert profile["window"] >= 1
+    assert profile["logs_per_block"] == 1.0
+
+
+@pytest.mark.parametrize(
+    "profile, size",
+    [
+        ({"window": 40_000, "logs_per_block": 2.0}, 2_500),  # capped by the density
+        ({"window": 1_000, "logs_per_block": 2.0}, 1_000),
+        ({"window": 40_000, "logs_per_block": 0.0}, 40_000),  # no logs seen yet
+        (None, 32),
+    ],
+)
+def test_load_window_sizes_first_window_from_profile(tmp_path, profile, size):
+    store = ParquetDatasetStore(tmp_path / "logs")
+    if profile is not None:
+        store.write_metadata("logs_window", profile)
+
+    window = load_window(
+        store, batch_size=32, adaptive=True, max_batch_size=50_000, target_results=5_000
+    )
+
+    assert window.size == size
+
+
+@pytest.mark.asyncio
+async def test_collect_logs_fixed_window_reraises_limit_error(tmp_path):
+    reader = LimitedEvmReader(latest=199, max_blocks=8)
+    store = ParquetDatasetStore(tmp_path / "logs")
+    contract = ContractInfo(name="PoolManager", abi="", address=b"\x11" * 20, genesis_block=100)
+
+    with pytest.raises(ValueError):
+        await collect_logs(
+            chain_id=1,
+            contract_info=contract,
+            reader=reader,
+            store=store,
+            batch_size=32,
+            adaptive=False,
+        )
+
+
+class SlowEvmReader(FakeEvmReader):
+    """Tracks how many get_logs calls are in flight at once."""
+
+    def __init__(self, latest: int):
+        super().__init__(latest)
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def get_logs(self, *, address: bytes, from_block: int, to_block: int):
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        # later ranges finish first
+        await asyncio.sleep(0.01 * (3 - from_block % 3))
+        self.in_flight -= 1
+        return await super().get_logs(address=address, from_block=from_block, to_block=to_block)
+
+
+@pytest.mark.parametrize("prefetch", [0, 3])
+@pytest.mark.asyncio
+async def test_collect_logs_prefetch_keeps_block_order(tmp_path, prefetch):
+    reader = SlowEvmReader(latest=159)
+    store = ParquetDatasetStore(tmp_path / "logs")
+    contract = ContractInfo(name="PoolManager", abi="", address=b"\x11" * 20, genesis_block=100)
+
+    await collect_logs(
+        chain_id=1,
+        contract_info=contract,
+        reader=reader,
+        store=store,
+        batch_size=5,
+        adaptive=False,
+        rows_per_file=20,
+        prefetch=prefetch,
+    )
+
+    assert reader.max_in_flight == prefetch + 1
+    names = sorted(store.list_names(), key=lambda n: int(n.split("_")[1]))
+    blocks = [b for n in names for b in store.read_table(n)["block_number"].to_pylist()]
+    assert blocks == list(range(100, 160))
+
+
+@pytest.mark.asyncio
+async def test_prefetch_waits_for_cancelled_fetches_on_exit():
+    cancelled = []
+
+    async def fetch(item):
+        try:
+            await asyncio.sleep(0 if item == 0 else 10)
+        except asyncio.CancelledError:
+            cancelled.append(item)
+            raise
+        return item
+
+    stream = prefetch_ordered(range(10), fetch, depth=3)
+    assert await anext(stream) == (0, 0)
+    await stream.aclose()
+
+    assert cancelled == [1, 2, 3]
+
+
+class SlowWriteStore(ParquetDatasetStore):
+    def write_table(self, **kwargs):
+        time.sleep(0.05)  # writer thread
+        super().write_table(**kwargs)
+
+
+class RecordingQueue(asyncio.Queue):
+    """Files in the store each time FileCommitted is put."""
+
+    def __init__(self, store):
+        super().__init__()
+        self.store = store
+        self.files_at_commit = []
+
+    async def put(self, item):
+        if isinstance(item, FileCommitted):
+            self.files_at_commit.append(len(self.store.list_names()))
+        await super().put(item)
+
+
+@pytest.mark.asyncio
+async def test_collect_logs_signals_file_committed_after_the_write(tmp_path):
+    store = SlowWriteStore(tmp_path / "logs")
+    queue = RecordingQueue(store)
+    contract = ContractInfo(name="PoolManager", abi="", address=b"\x11" * 20, genesis_block=100)
+
+    await collect_logs(
+        chain_id=1,
+        contract_info=contract,
+        reader=FakeEvmReader(latest=159),
+        store=store,
+        batch_size=5,
+        adaptive=False,
+        rows_per_file=20,
+        hash_queue=queue,
+    )
+
+    assert queue.files_at_commit == [1, 2, 3]
+
+
+class CrashingEvmReader(LimitedEvmReader):
+    """Provider outage from `fail_from` on."""
+
+    def __init__(self, latest: int, fail_from: int):
+        super().__init__(latest, max_blocks=10**9)
+        self.fail_from = fail_from
+
+    async def get_logs(self, *, address: bytes, from_block: int, to_block: int):
+        if from_block >= self.fail_from:
+            raise ConnectionError("provider down")
+        return await super().get_logs(address=address, from_block=from_block, to_block=to_block)
+
+
+@pytest.mark.asyncio
+async def test_collect_logs_resumes_from_spill_after_crash(tmp_path):
+    store = ParquetDatasetStore(tmp_path / "logs")
+    contract = ContractInfo(name="PoolManager", abi="", address=b"\x11" * 20, genesis_block=100)
+
+    async def run(reader: FakeEvmReader) -> None:
+        await collect_logs(
+            chain_id=1,
+            contract_info=contract,
+            reader=reader,
+            store=store,
+            batch_size=10,
+            adaptive=False,
+            prefetch=0,
+            spill=ArrowSpillLog(wal_directory(tmp_path / "logs"), LOG_SCHEMA),  # new per process
+        )
+
+    with pytest.raises(ConnectionError):
+        await run(CrashingEvmReader(latest=159, fail_from=130))
+    assert store.list_names() == []
+
+    reader = LimitedEvmReader(latest=159, max_blocks=10**9)
+    await run(reader)
+
+    assert reader.calls[0] == (130, 139)  # 100..129 came from the spill
+    blocks = [
+        b for n in store.list_names() for b in store.read_table(n)["block_number"].to_pylist()
+    ]
+    assert blocks == list(range(100, 160))
+    assert list(wal_directory(tmp_path / "logs").iterdir()) == []
+
+
+class TailEmptyEvmReader(FakeEvmReader):
+    async def get_logs(self, *, address: bytes, from_block: int, to_block: int):
+        if from_block >= 130:
+            return []
+        return await super().get_logs(address=address, from_block=from_block, to_block=to_block)
+
+
+@pytest.mark.asyncio
+async def test_collect_logs_closes_spill_segment_of_empty_ranges(tmp_path):
+    store = ParquetDatasetStore(tmp_path / "logs")
+    contract = ContractInfo(name="PoolManager", abi="", address=b"\x11" * 20, genesis_block=100)
+    spill = ArrowSpillLog(wal_directory(tmp_path / "logs"), LOG_SCHEMA, sync=False)
+
+    await collect_logs(
+        chain_id=1,
+        contract_info=contract,
+        reader=TailEmptyEvmReader(latest=159),
+        store=store,
+        batch_size=10,
+        adaptive=False,
+        rows_per_file=30,  # blocks 100..129 are flushed before the empty tail
+        prefetch=0,
+        spill=spill,
+    )
+
+    assert spill._sink is None  # the segment of the empty tail ranges is closed
+    # and kept: the next run resumes after the spilled empty ranges
+    restarted = ArrowSpillLog(wal_directory(tmp_path / "logs"), LOG_SCHEMA)
+    assert restarted.replay(store.max_block()) == ([], 159)
+    # the spill lives outside the dataset directory, whose mtime tells the manifest is stale
+    assert not (tmp_path / "logs" / "_wal").exists()
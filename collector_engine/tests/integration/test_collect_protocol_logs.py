@@ -0,0 +1,88 @@
+import pytest
+
+from collector_engine.app.application.services.collectors.collect_protocol_logs import (
+    collect_protocol_logs,
+)
+from collector_engine.app.infrastructure.adapters.storage.parquet_store import ParquetDatasetStore
+from collector_engine.app.infrastructure.registry.schemas import ContractInfo
+
+POOL_MANAGER = ContractInfo(name="PoolManager", abi="", address=b"\x11" * 20, genesis_block=100)
+DESCRIPTOR = ContractInfo(
+    name="PositionDescriptor", abi="", address=b"\x22" * 20, genesis_block=110
+)
+
+
+class FakeEvmReader:
+    """One log per block for every requested address; PositionDescriptor only on even blocks."""
+
+    def __init__(self, latest: int):
+        self._latest = latest
+        self.calls: list[tuple[tuple[bytes, ...], int, int]] = []
+
+    async def latest_block_number(self) -> int:
+        return self._latest
+
+    async def get_logs(self, *, address, from_block: int, to_block: int):
+        addresses = [address] if isinstance(address, bytes) else list(address)
+        self.calls.append((tuple(addresses), from_block, to_block))
+        logs = []
+        for blk in range(from_block, to_block + 1):
+            for i, addr in enumerate(addresses):
+                if addr == DESCRIPTOR.address and blk % 2:
+                    continue
+                logs.append(
+                    {
+                        "blockNumber": blk,
+                        "blockHash": "0x" + ("aa" * 32),
+                        "transactionHash": "0x" + ("bb" * 32),
+                        "logIndex": i,
+                        "address": "0x" + addr.hex(),
+                        "topics": ["0x" + ("00" * 32)],
+                        "data": "0x",
+                        "removed": False,
+                    }
+                )
+        return logs
+
+
+def _stored(store: ParquetDatasetStore, column: str) -> list:
+    return sorted(v for n in store.list_names() for v in store.read_table(n)[column].to_pylist())
+
+
+@pytest.mark.asyncio
+async def test_collect_protocol_logs_single_pass_demux(tmp_path):
+    reader = FakeEvmReader(latest=129)
+    stores = {
+        c.name: ParquetDatasetStore(tmp_path / c.name / "logs") for c in (POOL_MANAGER, DESCRIPTOR)
+    }
+
+    await collect_protocol_logs(
+        chain_id=1,
+        contracts=[POOL_MANAGER, DESCRIPTOR],
+        reader=reader,
+        stores=stores,
+        batch_size=10,
+    )
+
+    # one address-array query per range; the descriptor joins at its genesis block
+    assert reader.calls[0] == ((POOL_MANAGER.address,), 100, 109)
+    assert all(len(addrs) == 2 for addrs, from_, _ in reader.calls if from_ >= 110)
+
+    assert _stored(stores["PoolManager"], "block_number") == list(range(100, 130))
+    assert set(_stored(stores["PoolManager"], "address")) == {POOL_MANAGER.address}
+    assert _stored(stores["PositionDescriptor"], "block_number") == list(range(110, 130, 2))
+    assert set(_stored(stores["PositionDescriptor"], "address")) == {DESCRIPTOR.address}
+
+    # per-contract resume: nothing new to scan, no new files
+    names_before = {name: set(s.list_names()) for name, s in stores.items()}
+    reader.calls.clear()
+    await collect_protocol_logs(
+        chain_id=1,
+        contracts=[POOL_MANAGER, DESCRIPTOR],
+        reader=reader,
+        stores=stores,
+        batch_size=10,
+    )
+    assert reader.calls == []
+    assert {name: set(s.list_names()) for name, s in stores.items()} == names_before
+    assert stores["PositionDescriptor"].read_metadata("logs_checkpoint") == {"scanned_to": 129}
@@ -68,13 +68,7 @@ def _write_tx_file(store: ParquetDatasetStore, hashes: list[bytes]):
         }
         for k in TX_SCHEMA.names:
             buf[k].append(row[k])
-    store.write_buffer(
-        buffer=buf,
-        schema=TX_SCHEMA,
-        file_name="txs_240_240",
-        rows_per_file=10,
-        force=True,
-    )
+    store.write_table(table=pa.Table.from_pydict(buf, schema=TX_SCHEMA), file_name="txs_240_240")
 
 
 @pytest.mark.asyncio
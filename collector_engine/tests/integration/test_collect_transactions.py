@@ -5,6 +5,7 @@ from collector_engine.app.infrastructure.adapters.storage.parquet_store import P
 from collector_engine.app.application.services.collectors.collect_transactions import (
     collect_transactions,
 )
+from collector_engine.app.domain.pure.flush_policy import FlushPolicy
 from collector_engine.app.infrastructure.registry.schemas import ContractInfo
 from collector_engine.app.infrastructure.parquet.schema import LOG_SCHEMA, TX_SCHEMA
 
@@ -63,13 +64,7 @@ def _write_logs_file(store: ParquetDatasetStore, hashes: list[bytes]):
         }
         for k in LOG_SCHEMA.names:
             buf[k].append(row[k])
-    store.write_buffer(
-        buffer=buf,
-        schema=LOG_SCHEMA,
-        file_name="logs_150_150",
-        rows_per_file=10,
-        force=True,
-    )
+    store.write_table(table=pa.Table.from_pydict(buf, schema=LOG_SCHEMA), file_name="logs_150_150")
 
 
 @pytest.mark.asyncio
@@ -111,3 +106,70 @@ async def test_collect_transactions_idempotent(tmp_path):
 
     names_after = set(tx_store.list_names())
     assert names_after == names_before, "Second run should be idempotent"
+
+
+class BlockPerHashReader(FakeEvmReader):
+    def __init__(self, blocks: dict[bytes, int]):
+        self.blocks = blocks
+        self.requested: list[bytes] = []
+
+    async def get_transactions(self, hashes):
+        self.requested.extend(hashes)
+        txs = await super().get_transactions(hashes)
+        for i, (h, tx) in enumerate(zip(hashes, txs)):
+            tx["blockNumber"] = self.blocks[h]
+            tx["transactionIndex"] = i
+        return txs
+
+
+@pytest.mark.asyncio
+async def test_collect_transactions_splits_on_block_boundaries_and_resumes(tmp_path):
+    contract = ContractInfo(name="PoolManager", abi="", address=b"\x11" * 20, genesis_block=100)
+    logs_store = ParquetDatasetStore(tmp_path / "logs")
+    tx_store = ParquetDatasetStore(tmp_path / "txs")
+
+    blocks = {bytes([i]) * 32: 150 + i // 2 for i in range(10)}  # two txs per block
+    rows = [
+        {name: None for name in LOG_SCHEMA.names}
+        | {
+            "chain_id": 1,
+            "block_number": block,
+            "block_hash": b"\xaa" * 32,
+            "transaction_hash": h,
+            "log_index": i,
+            "address": b"\x11" * 20,
+            "data": b"",
+            "removed": False,
+        }
+        for i, (h, block) in enumerate(blocks.items())
+    ]
+    logs_store.write_table(
+        table=pa.Table.from_pylist(rows, schema=LOG_SCHEMA), file_name="logs_150_154"
+    )
+
+    async def collect(reader: BlockPerHashReader) -> None:
+        await collect_transactions(
+            chain_id=1,
+            contract_info=contract,
+            reader=reader,
+            logs_store=logs_store,
+            tx_store=tx_store,
+            batch_size=3,
+            flush_policy=FlushPolicy(max_buffer_bytes=1, target_file_bytes=None),
+        )
+
+    # every batch is past the policy, but the ones ending inside a block are not cut
+    await collect(BlockPerHashReader(blocks))
+    assert tx_store.list_names() == ["txs_150_152.parquet", "txs_153_154.parquet"]
+    assert tx_store.read_table("txs_150_152.parquet").num_rows == 6
+
+    # interrupted before the last piece: resume after block 152 only
+    tx_store.delete_files(["txs_153_154.parquet"])
+    reader = BlockPerHashReader(blocks)
+    await collect(reader)
+    assert reader.requested == list(blocks)[6:]
+    assert tx_store.list_names() == ["txs_150_152.parquet", "txs_153_154.parquet"]
+
+    reader = BlockPerHashReader(blocks)
+    await collect(reader)
+    assert reader.requested == []
@@ -0,0 +1,102 @@
+import pyarrow as pa
+
+from collector_engine.app.application.services.compaction import (
+    COMPACTION_JOURNAL_KEY,
+    LinkedDataset,
+    compact_datasets,
+)
+from collector_engine.app.infrastructure.adapters.storage.parquet_store import ParquetDatasetStore
+
+PREFIXES = ("logs", "txs", "receipts")
+
+
+def _linked(tmp_path) -> list[LinkedDataset]:
+    return [LinkedDataset(store=ParquetDatasetStore(tmp_path / p), prefix=p) for p in PREFIXES]
+
+
+def _write_small_files(datasets: list[LinkedDataset], ranges: list[tuple[int, int]]) -> None:
+    for d in datasets:
+        for from_block, to_block in ranges:
+            blocks = list(range(from_block, to_block + 1))
+            d.store.write_table(
+                table=pa.table({"block_number": pa.array(blocks, pa.int64())}),
+                file_name=d.file_name(f"{from_block}_{to_block}"),
+            )
+
+
+def _blocks(store) -> list[int]:
+    return [
+        b for name in store.list_names() for b in store.read_table(name)["block_number"].to_pylist()
+    ]
+
+
+def test_compaction_merges_adjacent_files_and_keeps_pairing(tmp_path):
+    datasets = _linked(tmp_path)
+    ranges = [(100, 109), (110, 119), (120, 129), (130, 139), (140, 199), (200, 209)]
+    _write_small_files(datasets, ranges)
+    # txs of the last logs file not collected yet: it must stay untouched
+    datasets[1].store.delete_files(["txs_200_209.parquet"])
+    before = {d.prefix: _blocks(d.store) for d in datasets}
+
+    merged = compact_datasets(datasets, target_rows=25)
+
+    assert merged == 2
+    assert datasets[0].store.list_names() == [
+        "logs_100_119.parquet",
+        "logs_120_139.parquet",
+        "logs_140_199.parquet",
+        "logs_200_209.parquet",
+    ]
+    for d in datasets[1:]:
+        suffixes = {n.removeprefix(f"{d.prefix}_") for n in d.store.list_names()}
+        assert suffixes <= {n.removeprefix("logs_") for n in datasets[0].store.list_names()}
+    for d in datasets:
+        assert _blocks(d.store) == before[d.prefix]
+        assert not d.store.read_metadata(COMPACTION_JOURNAL_KEY)
+
+    # nothing left to merge
+    assert compact_datasets(datasets, target_rows=25) == 0
+
+
+def test_compaction_recovers_interrupted_step(tmp_path):
+    datasets = _linked(tmp_path)
+    _write_small_files(datasets, [(100, 109), (110, 119)])
+    journal = {"merged": "100_119", "sources": ["100_109", "110_119"]}
+
+    # crashed after merging receipts only: roll back
+    datasets[0].store.write_metadata(COMPACTION_JOURNAL_KEY, journal)
+    receipts = datasets[2]
+    receipts.store.merge_files(
+        names=["receipts_100_109.parquet", "receipts_110_119.parquet"],
+        file_name="receipts_100_119",
+    )
+    compact_datasets(datasets, target_rows=5)
+    assert receipts.store.list_names() == ["receipts_100_109.parquet", "receipts_110_119.parquet"]
+
+    # crashed after every merge, before deleting sources: roll forward
+    datasets[0].store.write_metadata(COMPACTION_JOURNAL_KEY, journal)
+    for d in datasets:
+        d.store.merge_files(
+            names=[f"{d.prefix}_100_109.parquet", f"{d.prefix}_110_119.parquet"],
+            file_name=f"{d.prefix}_100_119",
+        )
+    compact_datasets(datasets, target_rows=5)
+    for d in datasets:
+        assert d.store.list_names() == [f"{d.prefix}_100_119.parquet"]
+        assert _blocks(d.store) == list(range(100, 120))
+
+
+def test_compaction_merges_derived_pieces_with_their_root(tmp_path):
+    logs, txs, receipts = datasets = _linked(tmp_path)
+    _write_small_files([logs, receipts], [(100, 109), (110, 119), (120, 129)])
+    # txs split past their flush policy; the last logs file is only half derived
+    _write_small_files([txs], [(100, 104), (105, 109), (110, 119), (120, 124)])
+    before = {d.prefix: _blocks(d.store) for d in datasets}
+
+    assert compact_datasets(datasets, target_rows=25) == 1
+
+    for d in datasets:
+        assert f"{d.prefix}_100_119.parquet" in d.store.list_names()
+        assert _blocks(d.store) == before[d.prefix]
+    assert txs.store.list_names() == ["txs_100_119.parquet", "txs_120_124.parquet"]
+    assert logs.store.list_names() == ["logs_100_119.parquet", "logs_120_129.parquet"]
@@ -0,0 +1,85 @@
+import pyarrow as pa
+import pyarrow.compute as pc
+
+from collector_engine.app.application.services import flush_buffer as flush_module
+from collector_engine.app.application.services.flush_buffer import flush_buffer, is_sorted
+from collector_engine.app.domain.pure.column_buffer import ColumnBuffer
+from collector_engine.app.domain.pure.flush_policy import FlushPolicy
+from collector_engine.app.infrastructure.adapters.storage.parquet_store import ParquetDatasetStore
+
+SCHEMA = pa.schema([("block_number", pa.int64()), ("log_index", pa.int32())])
+SCHEMA_ROW_BYTES = 8 + 4
+
+
+def _buffer(keys: list[tuple[int, int]]) -> ColumnBuffer:
+    buffer = ColumnBuffer(SCHEMA)
+    buffer.extend({"block_number": b, "log_index": i} for b, i in keys)
+    return buffer
+
+
+def _flush(buffer: ColumnBuffer, store: ParquetDatasetStore) -> ColumnBuffer:
+    return flush_buffer(
+        buffer=buffer,
+        store=store,
+        rows_per_file=100,
+        force=True,
+        file_prefix="logs",
+        block_field="block_number",
+        index_field="log_index",
+    )
+
+
+def test_is_sorted_compares_index_only_within_a_block():
+    def table(keys):
+        return _buffer(keys).to_table()
+
+    fields = ["block_number", "log_index"]
+    assert is_sorted(table([(1, 5), (2, 0), (2, 1), (2, 1)]), fields)
+    assert not is_sorted(table([(1, 0), (2, 1), (2, 0)]), fields)
+    assert not is_sorted(table([(2, 0), (1, 1)]), fields)
+    assert is_sorted(table([(1, 1), (1, 0)]), ["block_number"])
+
+
+def test_flush_buffer_sorts_out_of_order_rows(tmp_path):
+    store = ParquetDatasetStore(tmp_path)
+    keys = [(12, 1), (10, 3), (12, 0), (10, 0), (11, 7)]
+
+    out = _flush(_buffer(keys), store)
+
+    assert len(out) == 0
+    table = store.read_table("logs_10_12.parquet")
+    assert list(zip(*(table[c].to_pylist() for c in SCHEMA.names))) == sorted(keys)
+
+
+def test_flush_buffer_skips_sort_for_ordered_rows(tmp_path, monkeypatch):
+    def no_sort(*args, **kwargs):
+        raise AssertionError("sort_indices called for an ordered buffer")
+
+    monkeypatch.setattr(flush_module.pc, "sort_indices", no_sort)
+    store = ParquetDatasetStore(tmp_path)
+
+    _flush(_buffer([(10, 0), (10, 1), (11, 0)]), store)
+
+    assert store.list_names() == ["logs_10_11.parquet"]
+    assert pc.sum(store.read_table("logs_10_11.parquet")["log_index"]).as_py() == 1
+
+
+def test_flush_buffer_flushes_on_buffer_bytes(tmp_path):
+    store = ParquetDatasetStore(tmp_path)
+    policy = FlushPolicy(max_buffer_bytes=10 * SCHEMA_ROW_BYTES, target_file_bytes=None)
+
+    def flush(buffer: ColumnBuffer) -> ColumnBuffer:
+        return flush_buffer(
+            buffer=buffer,
+            store=store,
+            rows_per_file=100,
+            force=False,
+            file_prefix="logs",
+            block_field="block_number",
+            index_field="log_index",
+            policy=policy,
+        )
+
+    assert len(flush(_buffer([(b, 0) for b in range(9)]))) == 9
+    assert len(flush(_buffer([(b, 0) for b in range(10)]))) == 0
+    assert store.list_names() == ["logs_0_9.parquet"]
@@ -0,0 +1,27 @@
+import pyarrow as pa
+import pytest
+
+from collector_engine.app.application.services.hot_tier import promoted_on_exit
+from collector_engine.app.infrastructure.adapters.storage.parquet_store import ParquetDatasetStore
+
+
+def _write(store: ParquetDatasetStore, start: int) -> None:
+    blocks = pa.array(range(start, start + 10), pa.int64())
+    store.write_table(table=pa.table({"block_number": blocks}), file_name=f"t_{start}_{start + 9}")
+
+
+@pytest.mark.asyncio
+async def test_promoted_on_exit_even_if_the_collector_fails(tmp_path):
+    store = ParquetDatasetStore(tmp_path, hot_tier=True)
+
+    async with promoted_on_exit(store):
+        _write(store, 0)
+        assert store.list_files()[0].is_hot
+
+    with pytest.raises(RuntimeError):
+        async with promoted_on_exit(store):
+            _write(store, 10)
+            raise RuntimeError("rpc down")
+
+    assert not list((tmp_path / "_hot").iterdir())
+    assert [e.path for e in store.list_files()] == ["t_0_9.parquet", "t_10_19.parquet"]
@@ -0,0 +1,180 @@
+import copy
+
+import pytest
+import pytest_asyncio
+
+from collector_engine.app.domain.pure.blocks_timestamps import block_to_row
+from collector_engine.app.domain.pure.logs import log_to_row
+from collector_engine.app.domain.pure.receipts import receipt_to_row
+from collector_engine.app.domain.pure.transactions import transaction_to_row
+from collector_engine.app.infrastructure.adapters.evm.jsonrpc import (
+    JsonRpcBatchError,
+    JsonRpcError,
+)
+from collector_engine.app.infrastructure.adapters.evm.jsonrpc_decoders import (
+    decode_block,
+    decode_log,
+    decode_receipt,
+    decode_transaction,
+)
+from collector_engine.app.infrastructure.adapters.evm.jsonrpc_reader import JsonRpcEvmReader
+from collector_engine.app.infrastructure.adapters.evm.web3_reader import Web3EvmReader
+
+CHAIN_ID = 1
+
+RAW_LOG = {
+    "address": "0x000000000004444c5dc75cb358380d2e3de08a90",
+    "topics": ["0x" + "40" * 32, "0x" + "1d" * 32],
+    "data": "0xffff",
+    "blockHash": "0x" + "5e" * 32,
+    "blockNumber": "0x161fda6",
+    "transactionHash": "0x" + "9a" * 32,
+    "transactionIndex": "0x3",
+    "logIndex": "0x84",
+    "removed": False,
+}
+
+RAW_TX = {
+    "blockHash": "0x" + "aa" * 32,
+    "blockNumber": "0x161fda6",
+    "from": "0x" + "11" * 20,
+    "gas": "0x5208",
+    "gasPrice": "0x3b9aca00",
+    "maxFeePerGas": "0x77359400",
+    "maxPriorityFeePerGas": "0x1",
+    "hash": "0x" + "bb" * 32,
+    "input": "0x1234",
+    "nonce": "0x7",
+    "to": "0x" + "22" * 20,
+    "transactionIndex": "0x0",
+    "value": "0xde0b6b3a7640000",
+    "type": "0x2",
+    "chainId": "0x1",
+    "v": "0x1",
+    "r": "0xabc",
+    "s": "0x" + "dd" * 32,
+    "yParity": "0x1",
+    "accessList": [{"address": "0x" + "33" * 20, "storageKeys": ["0x" + "00" * 32]}],
+}
+
+RAW_RECEIPT = {
+    "blockHash": "0x" + "5e" * 32,
+    "blockNumber": "0x161fda6",
+    "transactionHash": "0x" + "9a" * 32,
+    "transactionIndex": "0x3",
+    "from": "0x" + "11" * 20,
+    "to": "0x" + "22" * 20,
+    "contractAddress": None,
+    "status": "0x1",
+    "type": "0x2",
+    "gasUsed": "0x5208",
+    "cumulativeGasUsed": "0xa410",
+    "effectiveGasPrice": "0x3b9aca00",
+    "logsBloom": "0x" + "00" * 256,
+    "logs": [RAW_LOG],
+}
+
+RAW_BLOCK = {
+    "number": "0x161fda6",
+    "hash": "0x" + "5e" * 32,
+    "parentHash": "0x" + "4d" * 32,
+    "timestamp": "0x68a8f147",
+    "gasUsed": "0x1c9c380",
+    "gasLimit": "0x1c9c380",
+    "baseFeePerGas": "0x3b9aca00",
+    "transactions": ["0x" + "9a" * 32],
+}
+
+
+@pytest_asyncio.fixture
+async def raw_rpc_server():
+    """Local JSON-RPC endpoint answering every lookup with the RAW_* records above."""
+    from aiohttp import web
+    from aiohttp.test_utils import TestServer
+
+    results = {
+        "eth_getLogs": [RAW_LOG],
+        "eth_getTransactionByHash": RAW_TX,
+        "eth_getTransactionReceipt": RAW_RECEIPT,
+        "eth_getBlockByNumber": RAW_BLOCK,
+    }
+
+    async def handler(request):
+        payload = await request.json()
+        result = copy.deepcopy(results[payload["method"]])
+        return web.json_response({"jsonrpc": "2.0", "id": payload["id"], "result": result})
+
+    app = web.Application()
+    app.router.add_post("/", handler)
+    server = TestServer(app)
+    await server.start_server()
+    yield str(server.make_url("/"))
+    await server.close()
+
+
+@pytest.mark.asyncio
+async def test_decoders_match_web3_results(raw_rpc_server):
+    # web3.py's formatted results, through its public API, are the reference
+    web3_reader = Web3EvmReader(raw_rpc_server)
+    web3_log = (await web3_reader.get_logs(address=b"\x11" * 20, from_block=1, to_block=2))[0]
+    web3_tx = (await web3_reader.get_transactions([b"\xbb" * 32]))[0]
+    web3_receipt = (await web3_reader.get_receipts([b"\x9a" * 32]))[0]
+    web3_block = await web3_reader.get_block(0x161FDA6)
+    await web3_reader.close()
+
+    pairs = [
+        (log_to_row, decode_log(copy.deepcopy(RAW_LOG)), web3_log),
+        (transaction_to_row, decode_transaction(copy.deepcopy(RAW_TX)), web3_tx),
+        (receipt_to_row, decode_receipt(copy.deepcopy(RAW_RECEIPT)), web3_receipt),
+        (block_to_row, decode_block(copy.deepcopy(RAW_BLOCK)), web3_block),
+    ]
+    for to_row, lean_value, web3_value in pairs:
+        assert to_row(CHAIN_ID, lean_value) == to_row(CHAIN_ID, web3_value)
+
+
+@pytest_asyncio.fixture
+async def rpc_server():
+    """Local JSON-RPC endpoint serving eth_blockNumber, eth_getLogs and tx lookups."""
+    from aiohttp import web
+    from aiohttp.test_utils import TestServer
+
+    def answer(req):
+        if req["method"] == "eth_blockNumber":
+            result = "0x69"
+        elif req["method"] == "eth_getLogs":
+            result = [RAW_LOG]
+        else:
+            result = RAW_TX if req["params"][0] == RAW_TX["hash"] else None
+        return {"jsonrpc": "2.0", "id": req["id"], "result": result}
+
+    async def handler(request):
+        payload = await request.json()
+        if isinstance(payload, list):
+            return web.json_response([answer(r) for r in payload])
+        return web.json_response(answer(payload))
+
+    app = web.Application()
+    app.router.add_post("/", handler)
+    server = TestServer(app)
+    await server.start_server()
+    yield str(server.make_url("/"))
+    await server.close()
+
+
+@pytest.mark.parametrize("batch_size", [0, 2])
+@pytest.mark.asyncio
+async def test_jsonrpc_reader_returns_normalizable_records(rpc_server, batch_size):
+    reader = JsonRpcEvmReader(rpc_server, batch_size=batch_size)
+
+    assert await reader.latest_block_number() == 105
+
+    logs = await reader.get_logs(address=b"\x11" * 20, from_block=1, to_block=2)
+    assert log_to_row(CHAIN_ID, logs[0])["log_index"] == 0x84
+
+    txs = await reader.get_transactions([b"\xbb" * 32])
+    assert transaction_to_row(CHAIN_ID, txs[0])["hash"] == b"\xbb" * 32
+
+    with pytest.raises((JsonRpcError, JsonRpcBatchError)):
+        await reader.get_transactions([b"\xbb" * 32, b"\x00" * 32])
+
+    await reader.close()
@@ -0,0 +1,248 @@
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from types import SimpleNamespace
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+from psycopg.pq import TransactionStatus
+
+from collector_engine.app.application.services.load_contract_scoped_data_to_sql import (
+    LoadContractScopedToSqlConfig,
+    load_contract_scoped_data_to_sql,
+)
+from collector_engine.app.infrastructure.adapters.db.postgres_copy_loader import (
+    ParquetLoadError,
+    PostgresCopyLoader,
+)
+
+
+class FakeConnection:
+    """
+    Commits the ledger rows of a transaction() block only if it succeeds; records the
+    transaction status each block starts in (psycopg opens a savepoint when INTRANS).
+    """
+
+    broken = False
+
+    def __init__(self, committed: list[str], statuses: list[TransactionStatus]):
+        self.committed = committed
+        self.statuses = statuses
+        self.pending: list[str] = []
+        self.info = SimpleNamespace(transaction_status=TransactionStatus.IDLE)
+
+    def commit(self):
+        self.info.transaction_status = TransactionStatus.IDLE
+
+    def query(self):
+        self.info.transaction_status = TransactionStatus.INTRANS
+
+    @contextmanager
+    def transaction(self):
+        self.statuses.append(self.info.transaction_status)
+        self.pending = []
+        yield
+        self.committed.extend(self.pending)
+
+
+def _loader(tmp_path: Path, *, fail: set[str], **kwargs) -> tuple[PostgresCopyLoader, list[str]]:
+    loader = PostgresCopyLoader("", **kwargs)
+    committed: list[str] = []
+    loader.statuses = []
+    lock = threading.Lock()
+
+    @contextmanager
+    def connection():
+        with loader._slots:
+            yield FakeConnection(committed, loader.statuses)
+
+    def column_types(conn, spec):
+        conn.query()  # a SELECT leaves the connection INTRANS
+        return []
+
+    def copy_to_stage(conn, parquet_file, **_):
+        if parquet_file.name in fail:
+            raise RuntimeError(f"bad file {parquet_file.name}")
+        return 10
+
+    def record_loaded(conn, *, file_name, **_):
+        with lock:
+            conn.pending.append(file_name)
+
+    loader._connection = connection
+    loader._drop_orphan_stages = lambda conn: None
+    loader._read_ledger = lambda conn, **_: {}
+    loader._partition_width = lambda conn, spec: None
+    loader._create_stage = lambda conn, spec: f"staging.{spec.table}"
+    loader._drop_stage = lambda conn, stage: None
+    loader._column_types = column_types
+    loader._copy_to_stage = copy_to_stage
+    loader._record_loaded = record_loaded
+    loader._insert_new_rows = lambda conn, **_: 0
+    return loader, committed
+
+
+def _write_files(directory: Path, prefix: str, count: int) -> None:
+    directory.mkdir(parents=True, exist_ok=True)
+    for i in range(count):
+        pq.write_table(pa.table({"block_number": [i]}), directory / f"{prefix}{i:04d}.parquet")
+
+
+def test_failed_file_group_is_rolled_back_alone(tmp_path):
+    _write_files(tmp_path / "logs", "logs_", 6)
+    loader, committed = _loader(tmp_path, fail={"logs_0003.parquet"}, group_bytes=0)
+
+    with pytest.raises(ParquetLoadError) as err:
+        loader.load_parquet_dir(parquet_dir=tmp_path / "logs", dataset="logs", file_prefix="logs_")
+
+    assert set(err.value.errors) == {"logs_0003.parquet"}
+    assert sorted(committed) == [f"logs_{i:04d}.parquet" for i in (0, 1, 2, 4, 5)]
+
+
+def test_every_file_group_starts_a_real_transaction(tmp_path):
+    _write_files(tmp_path / "logs", "logs_", 4)
+    loader, committed = _loader(tmp_path, fail=set(), group_bytes=0, parallelism={"logs": 1})
+
+    loader.load_parquet_dir(parquet_dir=tmp_path / "logs", dataset="logs", file_prefix="logs_")
+
+    assert len(committed) == 4
+    assert loader.statuses == [TransactionStatus.IDLE] * 4
+
+
+def test_file_groups_share_one_transaction(tmp_path):
+    _write_files(tmp_path / "logs", "logs_", 4)
+    size = (tmp_path / "logs" / "logs_0000.parquet").stat().st_size
+    # two files per group: the failing file takes its neighbour down with it
+    loader, committed = _loader(tmp_path, fail={"logs_0002.parquet"}, group_bytes=2 * size)
+
+    with pytest.raises(ParquetLoadError) as err:
+        loader.load_parquet_dir(parquet_dir=tmp_path / "logs", dataset="logs", file_prefix="logs_")
+
+    assert set(err.value.errors) == {"logs_0002.parquet", "logs_0003.parquet"}
+    assert sorted(committed) == ["logs_0000.parquet", "logs_0001.parquet"]
+
+
+def test_contract_datasets_load_even_if_one_fails(tmp_path):
+    for directory, prefix in [
+        ("logs", "logs_"),
+        ("transactions", "txs_"),
+        ("receipts", "receipts_"),
+    ]:
+        _write_files(tmp_path / directory, prefix, 3)
+    loader, committed = _loader(
+        tmp_path,
+        fail={"txs_0001.parquet"},
+        max_connections=2,
+        parallelism={"logs": 3},
+        group_bytes=0,
+    )
+
+    with pytest.raises(ParquetLoadError):
+        load_contract_scoped_data_to_sql(
+            cfg=LoadContractScopedToSqlConfig(contract_base_path=tmp_path), loader=loader
+        )
+
+    assert sorted(committed) == sorted(
+        [f"logs_{i:04d}.parquet" for i in range(3)]
+        + ["txs_0000.parquet", "txs_0002.parquet"]
+        + [f"receipts_{i:04d}.parquet" for i in range(3)]
+    )
+
+
+def _partitioned_dir(tmp_path: Path) -> Path:
+    directory = tmp_path / "logs"
+    directory.mkdir()
+    for from_block, to_block in [(0, 499), (1_000, 1_499), (1_500, 1_999), (2_900, 3_100)]:
+        pq.write_table(
+            pa.table({"chain_id": [1], "block_number": [from_block]}),
+            directory / f"logs_{from_block}_{to_block}.parquet",
+        )
+    return directory
+
+
+def _partition_events(loader: PostgresCopyLoader, *, fail_attach: bool = False) -> list[tuple]:
+    """Stubs the partition steps; events carry the number of transactions opened so far."""
+    events: list[tuple] = []
+    loader._partition_width = lambda conn, spec: 1_000
+    loader._existing_partitions = lambda conn, spec: {(1, 0)}
+
+    def lock(conn, spec, partition, *, lock):
+        events.append(("lock" if lock else "unlock", partition))
+
+    def build(conn, *, partition, **_):
+        events.append(("build", partition, len(loader.statuses)))
+        return 7
+
+    def attach(conn, *, partition, **_):
+        events.append(("attach", partition, len(loader.statuses)))
+        if fail_attach:
+            raise RuntimeError("attach failed")
+
+    loader._lock_partition = lock
+    loader._build_partition = build
+    loader._attach_partition = attach
+    return events
+
+
+def test_partitioned_table_plans_partitions_from_file_ranges(tmp_path):
+    directory = _partitioned_dir(tmp_path)
+    loader, committed = _loader(tmp_path, fail=set(), group_bytes=0, parallelism={"logs": 1})
+    events = _partition_events(loader)
+    ensured = {}
+    loader._ensure_partitions = lambda conn, spec, **kwargs: ensured.update(kwargs)
+
+    loader.load_parquet_dir(parquet_dir=directory, dataset="logs", file_prefix="logs_")
+
+    # the file spanning two partitions needs both, the new range is attached as a whole
+    assert ensured == {"chains": {1}, "partitions": {(1, 0), (1, 2_000), (1, 3_000)}}
+    partition = (1, 1_000, 2_000)
+    # built and committed first, attached in the next (short) transaction, under a lock
+    assert events == [
+        ("lock", partition),
+        ("build", partition, 1),
+        ("attach", partition, 2),
+        ("unlock", partition),
+    ]
+    assert loader.statuses == [TransactionStatus.IDLE] * 4  # 3 groups, one attached
+    assert len(committed) == 4
+
+
+def test_failed_attach_leaves_the_files_unrecorded(tmp_path):
+    directory = _partitioned_dir(tmp_path)
+    loader, committed = _loader(tmp_path, fail=set(), group_bytes=0)
+    events = _partition_events(loader, fail_attach=True)
+    loader._ensure_partitions = lambda conn, spec, **kwargs: None
+
+    with pytest.raises(ParquetLoadError) as err:
+        loader.load_parquet_dir(parquet_dir=directory, dataset="logs", file_prefix="logs_")
+
+    # the next load rebuilds the range: its files are not in the ledger
+    assert set(err.value.errors) == {"logs_1000_1499.parquet", "logs_1500_1999.parquet"}
+    assert sorted(committed) == ["logs_0_499.parquet", "logs_2900_3100.parquet"]
+    assert events[-1] == ("unlock", (1, 1_000, 2_000))
+
+
+def test_partition_planning_fails_on_files_without_block_range(tmp_path):
+    directory = tmp_path / "logs"
+    directory.mkdir()
+    pq.write_table(
+        pa.table({"chain_id": pa.array([None], pa.int64()), "block_number": [5]}),
+        directory / "logs_orphan.parquet",
+    )
+    pq.write_table(  # empty: needs no partition
+        pa.table({"chain_id": pa.array([], pa.int64()), "block_number": pa.array([], pa.int64())}),
+        directory / "logs_empty.parquet",
+    )
+    loader, committed = _loader(tmp_path, fail=set(), group_bytes=0)
+    loader._partition_width = lambda conn, spec: 1_000
+    loader._existing_partitions = lambda conn, spec: set()
+    loader._ensure_partitions = lambda conn, spec, **kwargs: None
+
+    with pytest.raises(ValueError, match="logs_orphan.parquet has no chain_id values"):
+        loader.load_parquet_dir(parquet_dir=directory, dataset="logs", file_prefix="logs_")
+    assert committed == []
+
+    (directory / "logs_orphan.parquet").unlink()
+    loader.load_parquet_dir(parquet_dir=directory, dataset="logs", file_prefix="logs_")
+    assert committed == ["logs_empty.parquet"]
@@ -0,0 +1,192 @@
+import os
+import uuid
+from pathlib import Path
+
+import psycopg
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+from psycopg.conninfo import make_conninfo
+
+from collector_engine.app.infrastructure.adapters.db.postgres_copy_loader import (
+    ParquetLoadError,
+    PostgresCopyLoader,
+)
+from collector_engine.app.infrastructure.parquet.schema import LOG_SCHEMA
+
+pytestmark = pytest.mark.skipif(
+    not os.getenv("TEST_POSTGRES_DSN"), reason="TEST_POSTGRES_DSN not set"
+)
+
+MIGRATIONS = sorted(
+    (Path(__file__).parents[2] / "app" / "infrastructure" / "db" / "migrations").glob("*.sql")
+)
+
+
+def _migrate(dsn: str, migrations: list[Path]) -> None:
+    with psycopg.connect(dsn, autocommit=True) as conn:
+        for path in migrations:
+            conn.execute(path.read_text())
+
+
+@pytest.fixture
+def database():
+    """Scratch database on TEST_POSTGRES_DSN (e.g. the docker-compose postgres service)."""
+    admin = os.environ["TEST_POSTGRES_DSN"]
+    name = f"collector_test_{uuid.uuid4().hex[:8]}"
+    with psycopg.connect(admin, autocommit=True) as conn:
+        conn.execute(f"CREATE DATABASE {name}")
+    try:
+        yield make_conninfo(admin, dbname=name)
+    finally:
+        with psycopg.connect(admin, autocommit=True) as conn:
+            conn.execute(f"DROP DATABASE {name} WITH (FORCE)")
+
+
+@pytest.fixture
+def dsn(database):
+    _migrate(database, MIGRATIONS)
+    return database
+
+
+def _log_rows(blocks, *, chain_id=1):
+    return [
+        {
+            "chain_id": chain_id,
+            "block_number": block,
+            "block_hash": block.to_bytes(32, "big"),
+            "transaction_hash": (block * 10 + i).to_bytes(32, "big"),
+            "log_index": i,
+            "address": b"\x11" * 20,
+            "topic0": b"\x22" * 32,
+            "topic1": None,
+            "topic2": None,
+            "topic3": None,
+            "data": b"\x01\x02",
+            "removed": False,
+        }
+        for block in blocks
+        for i in range(2)
+    ]
+
+
+def _write_logs(parquet_dir: Path, from_block: int, to_block: int, *, schema=LOG_SCHEMA, rows=None):
+    rows = _log_rows(range(from_block, to_block + 1)) if rows is None else rows
+    path = parquet_dir / f"logs_{from_block}_{to_block}.parquet"
+    pq.write_table(pa.Table.from_pylist(rows, schema=schema), path)
+    return path
+
+
+def _rows_by_partition(dsn: str) -> dict[str, int]:
+    with psycopg.connect(dsn) as conn:
+        rows = conn.execute(
+            "SELECT tableoid::regclass::text, count(*) FROM raw.logs GROUP BY 1"
+        ).fetchall()
+    return dict(rows)
+
+
+def _ledger(dsn: str) -> list[str]:
+    with psycopg.connect(dsn) as conn:
+        rows = conn.execute(
+            "SELECT file_name FROM raw._load_ledger WHERE dataset = 'logs' ORDER BY 1"
+        ).fetchall()
+    return [name for (name,) in rows]
+
+
+def _tables(dsn: str, schema: str) -> list[str]:
+    with psycopg.connect(dsn) as conn:
+        rows = conn.execute(
+            "SELECT c.relname FROM pg_class c JOIN pg_namespace n ON n.oid = c.relnamespace"
+            " WHERE n.nspname = %s AND c.relkind IN ('r', 'p') ORDER BY 1",
+            (schema,),
+        ).fetchall()
+    return [name for (name,) in rows]
+
+
+def test_migrations_partition_existing_rows(database):
+    _migrate(database, MIGRATIONS[:3])
+    with psycopg.connect(database) as conn:
+        conn.execute(
+            "INSERT INTO raw.logs VALUES (1, 2000005, '\\x01', '\\x02', 0, '\\x03',"
+            " NULL, NULL, NULL, NULL, '\\x', false)"
+        )
+
+    _migrate(database, MIGRATIONS[3:])
+
+    assert _rows_by_partition(database) == {"raw.logs_c1_b2000000": 1}
+    assert "logs_unpartitioned" not in _tables(database, "raw")
+
+
+@pytest.mark.parametrize("copy_format", ["binary", "text"])
+def test_load_fills_block_partitions_and_reruns_are_idempotent(dsn, tmp_path, copy_format):
+    _write_logs(tmp_path, 100, 199)  # new range: standalone table, then attached
+    _write_logs(tmp_path, 1_999_990, 2_000_009)  # spans two ranges: through the parent
+    _write_logs(tmp_path, 3_000_000, 3_000_049)
+    loader = PostgresCopyLoader(dsn, copy_format=copy_format, max_connections=2)
+
+    loader.load_parquet_dir(parquet_dir=tmp_path, dataset="logs", file_prefix="logs_")
+
+    expected = {
+        "raw.logs_c1_b0": 200,
+        "raw.logs_c1_b1000000": 20,
+        "raw.logs_c1_b2000000": 20,
+        "raw.logs_c1_b3000000": 100,
+    }
+    assert _rows_by_partition(dsn) == expected
+    assert _ledger(dsn) == [
+        "logs_100_199.parquet",
+        "logs_1999990_2000009.parquet",
+        "logs_3000000_3000049.parquet",
+    ]
+    assert not [t for t in _tables(dsn, "raw") if t.endswith("_load")]
+    assert _tables(dsn, "staging") == []
+
+    # skipped through the ledger, then deduplicated by the watermark anti-join
+    loader.load_parquet_dir(parquet_dir=tmp_path, dataset="logs", file_prefix="logs_")
+    with psycopg.connect(dsn) as conn:
+        conn.execute("TRUNCATE raw._load_ledger")
+    loader.load_parquet_dir(parquet_dir=tmp_path, dataset="logs", file_prefix="logs_")
+
+    assert _rows_by_partition(dsn) == expected
+    assert len(_ledger(dsn)) == 3
+
+
+def test_failed_groups_roll_back(dsn, tmp_path):
+    _write_logs(tmp_path, 100, 109)
+    PostgresCopyLoader(dsn).load_parquet_dir(
+        parquet_dir=tmp_path, dataset="logs", file_prefix="logs_"
+    )
+
+    # NULL transaction_hash: rejected by the NOT NULL constraint of the stage
+    nullable = pa.schema([f.with_nullable(True) for f in LOG_SCHEMA])
+    bad = [{**row, "transaction_hash": None} for row in _log_rows([205])]
+    _write_logs(tmp_path, 200, 209)  # same group as the bad file
+    _write_logs(tmp_path, 200_200, 200_205, schema=nullable, rows=_log_rows([200_200]) + bad)
+    _write_logs(tmp_path, 5_000_000, 5_000_005, schema=nullable, rows=bad)  # new range
+
+    loader = PostgresCopyLoader(dsn, group_bytes=1 << 30)
+    with pytest.raises(ParquetLoadError) as excinfo:
+        loader.load_parquet_dir(parquet_dir=tmp_path, dataset="logs", file_prefix="logs_")
+
+    assert sorted(excinfo.value.errors) == [
+        "logs_200200_200205.parquet",
+        "logs_200_209.parquet",
+        "logs_5000000_5000005.parquet",
+    ]
+    assert _rows_by_partition(dsn) == {"raw.logs_c1_b0": 20}
+    assert _ledger(dsn) == ["logs_100_109.parquet"]
+    assert "logs_c1_b5000000" not in _tables(dsn, "raw")
+    assert "logs_c1_b5000000_load" not in _tables(dsn, "raw")
+
+
+def test_orphan_stages_are_dropped(dsn, tmp_path):
+    with psycopg.connect(dsn) as conn:
+        conn.execute("CREATE UNLOGGED TABLE staging.raw_logs_0 (LIKE raw.logs)")
+    _write_logs(tmp_path, 100, 109)
+
+    PostgresCopyLoader(dsn).load_parquet_dir(
+        parquet_dir=tmp_path, dataset="logs", file_prefix="logs_"
+    )
+
+    assert _tables(dsn, "staging") == []
+    assert _rows_by_partition(dsn) == {"raw.logs_c1_b0": 20}
@@ -1,14 +1,26 @@
+import json
+
 import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+import pytest
 
+from collector_engine.app.infrastructure.adapters.storage import manifest as manifest_module
+from collector_engine.app.infrastructure.adapters.storage.manifest import DatasetManifest
 from collector_engine.app.infrastructure.adapters.storage.parquet_store import ParquetDatasetStore
+from collector_engine.app.infrastructure.adapters.storage.partitioning import HivePartitioning
+from collector_engine.app.infrastructure.helpers.arrow_ipc import write_ipc
+from collector_engine.app.infrastructure.helpers.parquet import (
+    parquet_fingerprint,
+    row_groups,
+    write_table,
+)
 from collector_engine.app.infrastructure.parquet.schema import LOG_SCHEMA
 
 
 def test_parquet_store_write_and_read(tmp_path):
     store = ParquetDatasetStore(tmp_path)
 
-    buffer = {name: [] for name in LOG_SCHEMA.names}
-
     rows = [
         {
             "chain_id": 1,
@@ -40,21 +52,7 @@ def test_parquet_store_write_and_read(tmp_path):
         },
     ]
 
-    # build column buffer
-    for row in rows:
-        for name in LOG_SCHEMA.names:
-            buffer[name].append(row[name])
-
-    # force flush
-    out = store.write_buffer(
-        buffer=buffer,
-        schema=LOG_SCHEMA,
-        file_name="logs_100_101",
-        rows_per_file=10,
-        force=True,
-    )
-
-    assert out == {name: [] for name in LOG_SCHEMA.names}
+    store.write_table(table=pa.Table.from_pylist(rows, schema=LOG_SCHEMA), file_name="logs_100_101")
 
     names = store.list_names()
     assert any(n.endswith(".parquet") for n in names)
@@ -64,3 +62,298 @@ def test_parquet_store_write_and_read(tmp_path):
     assert isinstance(table, pa.Table)
     assert set(table.column_names) == set(LOG_SCHEMA.names)
     assert table.num_rows == len(rows)
+
+
+def test_parquet_store_writes_log_profile(tmp_path):
+    store = ParquetDatasetStore(tmp_path)
+    rows = [
+        {
+            "chain_id": 1,
+            "block_number": 100 + i,
+            "block_hash": b"\xaa" * 32,
+            "transaction_hash": bytes([i]) * 32,
+            "log_index": i,
+            "address": b"\x11" * 20,
+            "topic0": b"\x00" * 32,
+            "topic1": None,
+            "topic2": None,
+            "topic3": None,
+            "data": b"",
+            "removed": False,
+        }
+        for i in range(3)
+    ]
+    store.write_table(table=pa.Table.from_pylist(rows, schema=LOG_SCHEMA), file_name="logs_100_102")
+
+    metadata = pq.read_metadata(tmp_path / "logs_100_102.parquet")
+    row_group = metadata.row_group(0)
+    sorting = [(LOG_SCHEMA.names[c.column_index], c.descending) for c in row_group.sorting_columns]
+    assert sorting == [("block_number", False), ("log_index", False)]
+
+    columns = {row_group.column(i).path_in_schema: row_group.column(i) for i in range(12)}
+    for name in ("transaction_hash", "address", "topic0"):
+        assert columns[name].bloom_filter_offset is not None
+    assert columns["block_number"].bloom_filter_offset is None
+    assert columns["block_number"].has_column_index and columns["block_number"].has_offset_index
+    assert not columns["transaction_hash"].has_dictionary_page
+    assert store.read_table("logs_100_102.parquet").equals(
+        pa.Table.from_pylist(rows, schema=LOG_SCHEMA)
+    )
+
+
+def _write_blocks(path, name: str, blocks: list[int], **kwargs) -> None:
+    table = pa.table({"block_number": pa.array(blocks, pa.int64())})
+    pq.write_table(table, path / f"{name}.parquet", row_group_size=2, **kwargs)
+
+
+def test_parquet_store_max_block_reads_footer_only(tmp_path, monkeypatch):
+    assert ParquetDatasetStore(tmp_path / "empty").max_block() is None
+
+    _write_blocks(tmp_path, "logs_9_95", [9, 50, 95])
+    _write_blocks(tmp_path, "logs_100_207", [100, 150, 151, 207, 120])
+    (tmp_path / "_logs_window.json").write_text("{}")
+
+    def no_read(*args, **kwargs):
+        raise AssertionError("data pages read for max_block")
+
+    monkeypatch.setattr(pq, "read_table", no_read)
+    assert ParquetDatasetStore(tmp_path).max_block() == 207
+
+
+def test_parquet_store_max_block_without_statistics(tmp_path):
+    store = ParquetDatasetStore(tmp_path)
+    _write_blocks(tmp_path, "blocks_0_3", [0, 1, 3, 2], write_statistics=False)
+
+    assert store.max_block() == 3
+
+
+def test_parquet_store_manifest(tmp_path):
+    _write_blocks(tmp_path, "logs_1_4", [1, 4])  # written before the manifest existed
+    store = ParquetDatasetStore(tmp_path)
+
+    store.write_table(
+        table=pa.table({"block_number": pa.array([10, 12, 15], pa.int64())}),
+        file_name="logs_10_15",
+    )
+
+    entries = store.manifest.entries()
+    assert [(e.name, e.from_block, e.to_block, e.rows) for e in entries] == [
+        ("logs_1_4.parquet", 1, 4, 2),
+        ("logs_10_15.parquet", 10, 15, 3),
+    ]
+    assert entries[0].schema_fingerprint == entries[1].schema_fingerprint
+    assert entries[1].size_bytes == (tmp_path / "logs_10_15.parquet").stat().st_size
+    assert [e.name for e in store.files_overlapping(4, 9)] == ["logs_1_4.parquet"]
+    assert store.files_overlapping(5, 9) == []
+    assert store.max_block() == 15
+
+    # persisted and reconciled on the next load: a deleted file drops out
+    (tmp_path / "logs_1_4.parquet").unlink()
+    reloaded = DatasetManifest(tmp_path)
+    assert [e.name for e in reloaded.entries()] == ["logs_10_15.parquet"]
+    assert json.loads((tmp_path / "_manifest.json").read_text())["files"].keys() == {
+        "logs_10_15.parquet"
+    }
+
+
+def test_manifest_loads_without_walking_the_directory(tmp_path, monkeypatch):
+    store = ParquetDatasetStore(tmp_path, partitioning=HivePartitioning(bucket_size=100))
+    for start in (0, 100, 200):
+        blocks = pa.array(range(start, start + 10), pa.int64())
+        store.write_table(
+            table=pa.table({"chain_id": pa.array([1] * 10, pa.int64()), "block_number": blocks}),
+            file_name=f"t_{start}_{start + 9}",
+        )
+    store.write_metadata("checkpoint", {"scanned_to": 209})
+    store.delete_files(["t_100_109.parquet"])
+    # changes are appended to the log, the snapshot is not rewritten
+    assert len((tmp_path / "_manifest.jsonl").read_text().splitlines()) > 4
+
+    def walk(*args, **kwargs):
+        raise AssertionError("fresh manifest reconciled")
+
+    monkeypatch.setattr(manifest_module, "list_parquet_files", walk)
+    assert [e.name for e in DatasetManifest(tmp_path).entries()] == [
+        "t_0_9.parquet",
+        "t_200_209.parquet",
+    ]
+
+    # a file added behind the manifest's back makes it stale
+    monkeypatch.undo()
+    _write_blocks(tmp_path / "chain_id=1" / "block_bucket=0", "t_50_59", list(range(50, 60)))
+    assert [e.name for e in DatasetManifest(tmp_path).entries()] == [
+        "t_0_9.parquet",
+        "t_50_59.parquet",
+        "t_200_209.parquet",
+    ]
+
+
+def test_manifest_log_is_compacted(tmp_path, monkeypatch):
+    monkeypatch.setattr(DatasetManifest, "LOG_COMPACT_LINES", 3)
+    store = ParquetDatasetStore(tmp_path)
+    for start in range(0, 50, 10):
+        _write_blocks(tmp_path, f"t_{start}", [start])
+        store.manifest.add(tmp_path / f"t_{start}.parquet")
+
+    snapshot = json.loads((tmp_path / "_manifest.json").read_text())
+    assert len(snapshot["files"]) >= 3
+    assert len((tmp_path / "_manifest.jsonl").read_text().splitlines()) <= 3
+    assert len(DatasetManifest(tmp_path).entries()) == 5
+
+    (tmp_path / "_manifest.jsonl").unlink()
+    store.manifest.rebuild()
+    assert json.loads((tmp_path / "_manifest.json").read_text())["files"].keys() == {
+        f"t_{start}.parquet" for start in range(0, 50, 10)
+    }
+
+
+def test_parquet_store_hive_partitioning(tmp_path):
+    store = ParquetDatasetStore(tmp_path, partitioning=HivePartitioning(bucket_size=100))
+    table = pa.table(
+        {
+            "chain_id": pa.array([1] * 4, pa.int32()),
+            "block_number": pa.array([95, 99, 100, 250], pa.int64()),
+        }
+    )
+
+    store.write_table(table=table, file_name="logs_95_250")
+
+    # split at bucket boundaries, names follow each file's own rows
+    assert store.list_names() == [
+        "logs_95_99.parquet",
+        "logs_100_100.parquet",
+        "logs_250_250.parquet",
+    ]
+    assert (tmp_path / "chain_id=1" / "block_bucket=0" / "logs_95_99.parquet").exists()
+    assert store.read_table("logs_250_250.parquet")["block_number"].to_pylist() == [250]
+    assert store.read_metadata("partitioning") == {
+        "scheme": "hive",
+        "keys": ["chain_id", "block_bucket"],
+        "bucket_size": 100,
+        "block_field": "block_number",
+    }
+
+    # pyarrow.dataset discovery prunes by partition directory
+    pruned = store.dataset().to_table(filter=ds.field("block_bucket") == 100)
+    assert pruned["block_number"].to_pylist() == [100]
+
+    # the scheme is picked up from the directory, conflicting schemes are rejected
+    assert ParquetDatasetStore(tmp_path).partitioning == HivePartitioning(bucket_size=100)
+    with pytest.raises(ValueError, match="partitioned as"):
+        ParquetDatasetStore(tmp_path, partitioning=HivePartitioning(bucket_size=10))
+
+
+def test_parquet_store_hive_dataset_with_int64_chain_id(tmp_path):
+    # TX / RECEIPT / BLOCK schemas store chain_id as int64
+    store = ParquetDatasetStore(tmp_path, partitioning=HivePartitioning(bucket_size=100))
+    table = pa.table(
+        {
+            "chain_id": pa.array([8453] * 3, pa.int64()),
+            "block_number": pa.array([5, 150, 160], pa.int64()),
+        }
+    )
+    store.write_table(table=table, file_name="txs_5_160")
+
+    dataset = store.dataset()
+
+    assert dataset.schema.field("chain_id").type == pa.int64()
+    pruned = dataset.to_table(filter=ds.field("block_bucket") == 100)
+    assert pruned["block_number"].to_pylist() == [150, 160]
+    assert pruned["chain_id"].to_pylist() == [8453, 8453]
+
+
+@pytest.mark.parametrize("partitioning", [None, HivePartitioning(bucket_size=100, by_chain=False)])
+def test_parquet_store_scan(tmp_path, partitioning):
+    store = ParquetDatasetStore(tmp_path, partitioning=partitioning)
+    for start in (0, 100, 200):
+        blocks = list(range(start, start + 100))
+        table = pa.table(
+            {
+                "block_number": pa.array(blocks, pa.int64()),
+                "value": pa.array([b % 7 for b in blocks], pa.int64()),
+                "payload": pa.array([b"x" * 10] * 100, pa.binary()),
+            }
+        )
+        store.write_table(table=table, file_name=f"t_{start}_{start + 99}")
+
+    reader = store.scan(columns=["block_number"], block_range=(150, 249))
+    assert reader.schema.names == ["block_number"]
+    assert reader.read_all()["block_number"].to_pylist() == list(range(150, 250))
+
+    only = store.scan(names=["t_100_199.parquet"], columns=["value"], filter=ds.field("value") == 0)
+    assert only.read_all()["value"].to_pylist() == [0] * len(range(105, 200, 7))
+
+    assert store.scan(block_range=(1_000, 2_000)).read_all().num_rows == 0
+    assert store.read_schema("t_0_99.parquet").names == ["block_number", "value", "payload"]
+    with pytest.raises(ValueError):
+        store.scan(names=["missing.parquet"])
+
+
+def test_parquet_store_hot_tier(tmp_path):
+    store = ParquetDatasetStore(tmp_path, hot_tier=True)
+    tables = {}
+    for start in (0, 100):
+        blocks = list(range(start, start + 100))
+        tables[start] = pa.table(
+            {"block_number": pa.array(blocks, pa.int64()), "value": pa.array(blocks, pa.int64())}
+        )
+        store.write_table(table=tables[start], file_name=f"t_{start}_{start + 99}")
+
+    assert store.list_names() == ["t_0_99.parquet", "t_100_199.parquet"]
+    assert (tmp_path / "_hot" / "t_0_99.arrow").exists()
+    assert not list(tmp_path.glob("*.parquet"))
+    assert store.read_table("t_0_99.parquet", columns=["value"]).equals(tables[0].select(["value"]))
+    assert store.max_block() == 199
+
+    # promoting one file: scans span both tiers in block order
+    store.merge_files(names=["t_0_99.parquet"], file_name="t_0_99_merged")
+    assert not (tmp_path / "_hot" / "t_0_99.arrow").exists()
+    store.delete_files(["t_0_99.parquet"])
+    blocks = store.scan(columns=["block_number"], block_range=(50, 149)).read_all()
+    assert blocks["block_number"].to_pylist() == list(range(50, 150))
+
+    assert store.promote() == 1
+    assert not list((tmp_path / "_hot").iterdir())
+    assert store.read_table("t_100_199.parquet").equals(tables[100])
+
+    # crash between the parquet write and the hot file removal: parquet wins
+    write_ipc(tmp_path / "_hot" / "t_100_199.arrow", tables[0])
+    reopened = DatasetManifest(tmp_path)
+    assert [e.path for e in reopened.entries()] == ["t_0_99_merged.parquet", "t_100_199.parquet"]
+    assert not list((tmp_path / "_hot").iterdir())
+
+
+def test_parquet_store_merge_fills_row_groups(tmp_path):
+    store = ParquetDatasetStore(tmp_path)
+    for start in range(0, 400, 100):
+        _write_blocks(tmp_path, f"t_{start}_{start + 99}", list(range(start, start + 100)))
+    names = store.list_names()
+
+    store.merge_files(names=names, file_name="t_0_399")
+
+    # small sources end up in one row group (profile.row_group_size rows)
+    merged = pq.ParquetFile(tmp_path / "t_0_399.parquet")
+    assert merged.metadata.num_row_groups == 1
+    assert merged.read()["block_number"].to_pylist() == list(range(400))
+
+
+def test_row_groups_rechunks_batches():
+    batches = [pa.record_batch({"x": list(range(i, i + 3))}) for i in range(0, 12, 3)]
+
+    tables = list(row_groups(batches, 5))
+
+    assert [t.num_rows for t in tables] == [5, 5, 2]
+    assert pa.concat_tables(tables)["x"].to_pylist() == list(range(12))
+
+
+def test_parquet_fingerprint_follows_file_content(tmp_path):
+    path = tmp_path / "logs_1_2.parquet"
+    table = pa.table({"block_number": pa.array([1, 2], pa.int64())})
+
+    write_table(str(path), table)
+    first = parquet_fingerprint(path)
+    write_table(str(path), table)
+    assert parquet_fingerprint(path) == first
+
+    write_table(str(path), pa.table({"block_number": pa.array([1, 3], pa.int64())}))
+    assert parquet_fingerprint(path) != first
@@ -0,0 +1,150 @@
+import json
+from datetime import UTC, datetime, timedelta
+from decimal import Decimal
+
+import pyarrow as pa
+import pytest
+
+from collector_engine.app.infrastructure.adapters.db.pg_binary_copy import encode_batch
+from collector_engine.app.infrastructure.adapters.db.postgres_copy_loader import (
+    TXS_COPY_SPEC,
+    PostgresCopyLoader,
+)
+from collector_engine.app.infrastructure.parquet.schema import TX_SCHEMA
+
+# raw.transactions column types (001_raw_schema.sql)
+TX_PG_TYPES = {
+    "chain_id": "int4",
+    "block_hash": "bytea",
+    "block_number": "int8",
+    "transaction_index": "int4",
+    "from": "bytea",
+    "to": "bytea",
+    "gas": "int8",
+    "gas_price": "numeric",
+    "max_fee_per_gas": "numeric",
+    "max_priority_fee_per_gas": "numeric",
+    "hash": "bytea",
+    "input": "bytea",
+    "nonce": "int8",
+    "value": "numeric",
+    "type": "int4",
+    "v": "int8",
+    "r": "text",
+    "s": "text",
+    "y_parity": "int4",
+    "access_list": "jsonb",
+}
+
+
+def _decode_value(data: bytes, pg_type: str):
+    if pg_type in ("int2", "int4", "int8"):
+        return int.from_bytes(data, "big", signed=True)
+    if pg_type == "bool":
+        return data == b"\x01"
+    if pg_type == "text":
+        return data.decode()
+    if pg_type == "jsonb":
+        assert data[0] == 1
+        return json.loads(data[1:])
+    if pg_type == "timestamptz":
+        micros = int.from_bytes(data, "big", signed=True)
+        return datetime(2000, 1, 1, tzinfo=UTC) + timedelta(microseconds=micros)
+    if pg_type == "numeric":
+        ndigits, weight, sign, _ = (int.from_bytes(data[i : i + 2], "big") for i in (0, 2, 4, 6))
+        value = 0
+        for i in range(ndigits):
+            value = value * 10_000 + int.from_bytes(data[8 + 2 * i : 10 + 2 * i], "big")
+        value *= 10_000 ** (weight - ndigits + 1)
+        return Decimal(-value if sign == 0x4000 else value)
+    return data
+
+
+def _decode(payload: bytes, pg_types: list[str]) -> list[list]:
+    rows, pos = [], 0
+    while pos < len(payload):
+        assert int.from_bytes(payload[pos : pos + 2], "big") == len(pg_types)
+        pos += 2
+        row = []
+        for pg_type in pg_types:
+            length = int.from_bytes(payload[pos : pos + 4], "big", signed=True)
+            pos += 4
+            if length == -1:
+                row.append(None)
+                continue
+            row.append(_decode_value(payload[pos : pos + length], pg_type))
+            pos += length
+        rows.append(row)
+    return rows
+
+
+def _tx_row(i: int) -> dict:
+    return {
+        "block_hash": bytes([i]) * 32,
+        "block_number": 18_000_000 + i,
+        "from": b"\x01" * 20,
+        "gas": 21_000 * i,
+        "gas_price": Decimal(10**18 + i),
+        "max_fee_per_gas": None if i % 2 else Decimal(10**37 * 9 + i),
+        "max_priority_fee_per_gas": Decimal(0),
+        "hash": bytes([i + 1]) * 32,
+        "input": bytes(range(i * 7)),
+        "nonce": i,
+        "to": None if i == 0 else b"\x02" * 20,
+        "transaction_index": i,
+        "value": Decimal(-(10**30) - i) if i == 3 else Decimal(i),
+        "type": None if i == 1 else 2,
+        "chain_id": 8453,
+        "v": 27,
+        "r": "0x" + "ab" * 32,
+        "s": "0x\x00" + "cd" * 31,
+        "y_parity": None,
+        "access_list": [{"address": b"\x03" * 20, "storage_keys": [b"\x04" * 32]}] * (i % 3),
+    }
+
+
+def _python_row(values: list) -> list:
+    """Row path values in comparable form (memoryview -> bytes, Jsonb -> obj)."""
+    out = []
+    for v in values:
+        if isinstance(v, memoryview):
+            v = bytes(v)
+        elif hasattr(v, "obj"):
+            v = json.loads(json.dumps(v.obj))
+        out.append(v)
+    return out
+
+
+@pytest.mark.parametrize("offset", [0, 2])
+def test_encode_batch_matches_row_path(offset):
+    batch = pa.RecordBatch.from_pylist([_tx_row(i) for i in range(6)], schema=TX_SCHEMA)
+    batch = batch.slice(offset)  # sliced arrays keep their buffers with an offset
+    pg_types = [TX_PG_TYPES[c] for c in TXS_COPY_SPEC.columns]
+
+    decoded = _decode(encode_batch(batch, TXS_COPY_SPEC.columns, pg_types), pg_types)
+
+    expected = PostgresCopyLoader("")._iter_py_rows(batch, TXS_COPY_SPEC)
+    assert decoded == [_python_row(r) for r in expected]
+
+
+def test_encode_batch_timestamps_and_bools():
+    batch = pa.RecordBatch.from_pydict(
+        {"timestamp": pa.array([1_740_051_563, 0], pa.int64()), "removed": [True, None]}
+    )
+
+    decoded = _decode(
+        encode_batch(batch, ["timestamp", "removed"], ["timestamptz", "bool"]),
+        ["timestamptz", "bool"],
+    )
+
+    assert decoded == [
+        [datetime.fromtimestamp(1_740_051_563, tz=UTC), True],
+        [datetime(1970, 1, 1, tzinfo=UTC), None],
+    ]
+
+
+def test_encode_batch_rejects_int_overflow():
+    batch = pa.RecordBatch.from_pydict({"log_index": pa.array([2**40], pa.int64())})
+
+    with pytest.raises(pa.ArrowInvalid):
+        encode_batch(batch, ["log_index"], ["int4"])
@@ -5,7 +5,18 @@ from collector_engine.app.application.services.run_pipeline import (
     PipelineDeps,
     PipelineConfig,
 )
+from collector_engine.app.domain.pure.derived_files import pending_inputs
+from collector_engine.app.domain.pure.flush_policy import FlushPolicy
 from collector_engine.app.infrastructure.adapters.storage.parquet_store import ParquetDatasetStore
+from collector_engine.app.infrastructure.adapters.storage.partitioning import HivePartitioning
+from collector_engine.app.application.services.validation.validate_pipeline_datasets import (
+    validate_pipeline_datasets,
+)
+from collector_engine.app.infrastructure.parquet.schema import (
+    LOG_SCHEMA,
+    RECEIPT_SCHEMA,
+    TX_SCHEMA,
+)
 from collector_engine.app.infrastructure.registry.schemas import ContractInfo
 
 
@@ -118,3 +129,131 @@ async def test_pipeline_end_to_end_idempotent(tmp_path):
     assert set(logs_store.list_names()) == logs_f
     assert set(tx_store.list_names()) == txs_f
     assert set(receipts_store.list_names()) == rec_f
+
+
+class ConsistentEvmReader(FakeEvmReader):
+    """Every block has one tx; tx/receipt block numbers match the logs."""
+
+    async def get_logs(self, *, address: bytes, from_block: int, to_block: int):
+        logs = await super().get_logs(address=address, from_block=from_block, to_block=to_block)
+        for log in logs:
+            log["transactionHash"] = "0x" + log["blockNumber"].to_bytes(32, "big").hex()
+            log["logIndex"] = 0
+        return logs
+
+    async def get_transactions(self, hashes):
+        txs = await super().get_transactions(hashes)
+        for tx, h in zip(txs, hashes):
+            tx["blockNumber"] = int.from_bytes(h, "big")
+        return txs
+
+    async def get_receipts(self, hashes):
+        receipts = await super().get_receipts(hashes)
+        for receipt, h in zip(receipts, hashes):
+            receipt["blockNumber"] = int.from_bytes(h, "big")
+        return receipts
+
+
+def _suffixes(names: list[str], prefix: str) -> set[str]:
+    return {n.removeprefix(prefix).removesuffix(".parquet") for n in names}
+
+
+@pytest.mark.parametrize(
+    "bucket_size, hot_tier", [(None, False), (1_000, False), (None, True), (1_000, True)]
+)
+@pytest.mark.asyncio
+async def test_streaming_pipeline_matches_staged(tmp_path, bucket_size, hot_tier):
+    contract = ContractInfo(name="PoolManager", abi="", address=b"\x11" * 20, genesis_block=100)
+    reader = ConsistentEvmReader(latest=2_600)
+    partitioning = None if bucket_size is None else HivePartitioning(bucket_size=bucket_size)
+
+    def store(path):
+        return ParquetDatasetStore(path, partitioning=partitioning, hot_tier=hot_tier)
+
+    stores = {}
+    for mode in ("staged", "streaming"):
+        deps = PipelineDeps(
+            reader=reader,
+            logs_store=store(tmp_path / mode / "logs"),
+            tx_store=store(tmp_path / mode / "txs"),
+            receipts_store=store(tmp_path / mode / "receipts"),
+        )
+        cfg = PipelineConfig(
+            chain_id=1,
+            protocol="uniswap_v4",
+            contract_info=contract,
+            streaming=mode == "streaming",
+            queue_size=1,
+        )
+        await run_pipeline(cfg=cfg, deps=deps)
+        stores[mode] = deps
+
+    for attr in ("logs_store", "tx_store", "receipts_store"):
+        staged = getattr(stores["staged"], attr)
+        streaming = getattr(stores["streaming"], attr)
+        assert sorted(streaming.list_names()) == sorted(staged.list_names())
+        # hot files are promoted by the end of the run
+        assert not any(e.is_hot for e in staged.list_files() + streaming.list_files())
+        for name in staged.list_names():
+            assert streaming.read_table(name).equals(staged.read_table(name))
+
+    # logs <-> txs <-> receipts files still correspond one to one
+    deps = stores["staged"]
+    logs = _suffixes(deps.logs_store.list_names(), "logs_")
+    assert _suffixes(deps.tx_store.list_names(), "txs_") == logs
+    assert _suffixes(deps.receipts_store.list_names(), "receipts_") == logs
+
+    report = await validate_pipeline_datasets(
+        logs_store=deps.logs_store,
+        tx_store=deps.tx_store,
+        receipts_store=deps.receipts_store,
+        log_schema=LOG_SCHEMA,
+        tx_schema=TX_SCHEMA,
+        receipt_schema=RECEIPT_SCHEMA,
+    )
+    assert report.ok, report.issues
+
+
+@pytest.mark.parametrize("streaming", [False, True])
+@pytest.mark.asyncio
+async def test_pipeline_splits_derived_files_inside_their_input(tmp_path, streaming):
+    contract = ContractInfo(name="PoolManager", abi="", address=b"\x11" * 20, genesis_block=100)
+    deps = PipelineDeps(
+        reader=ConsistentEvmReader(latest=2_600),
+        logs_store=ParquetDatasetStore(tmp_path / "logs"),
+        tx_store=ParquetDatasetStore(tmp_path / "txs"),
+        receipts_store=ParquetDatasetStore(tmp_path / "receipts"),
+    )
+    tiny = FlushPolicy(max_buffer_bytes=1, target_file_bytes=None)
+    cfg = PipelineConfig(
+        chain_id=1,
+        protocol="uniswap_v4",
+        contract_info=contract,
+        streaming=streaming,
+        queue_size=1,
+        txs_flush_policy=tiny,
+        receipts_flush_policy=tiny,
+    )
+    await run_pipeline(cfg=cfg, deps=deps)
+
+    logs = deps.logs_store.list_names()
+    txs = deps.tx_store.list_names()
+    receipts = deps.receipts_store.list_names()
+    assert len(logs) < len(txs) <= len(receipts)
+    # every piece sits inside its input file and every input is complete
+    assert pending_inputs(logs, "logs", txs, "txs") == []
+    assert pending_inputs(txs, "txs", receipts, "receipts") == []
+
+    report = await validate_pipeline_datasets(
+        logs_store=deps.logs_store,
+        tx_store=deps.tx_store,
+        receipts_store=deps.receipts_store,
+        log_schema=LOG_SCHEMA,
+        tx_schema=TX_SCHEMA,
+        receipt_schema=RECEIPT_SCHEMA,
+    )
+    assert report.ok, report.issues
+
+    await run_pipeline(cfg=cfg, deps=deps)
+    assert deps.tx_store.list_names() == txs
+    assert deps.receipts_store.list_names() == receipts
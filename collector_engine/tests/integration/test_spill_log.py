@@ -0,0 +1,34 @@
+import pyarrow as pa
+
+from collector_engine.app.infrastructure.adapters.storage.spill_log import ArrowSpillLog
+
+SCHEMA = pa.schema([("block_number", pa.int64()), ("log_index", pa.int32())])
+
+
+def _rows(*blocks: int) -> list[dict]:
+    return [{"block_number": b, "log_index": 0} for b in blocks]
+
+
+def test_spill_log_replay_skips_committed_batches_and_torn_tail(tmp_path):
+    spill = ArrowSpillLog(tmp_path, SCHEMA, sync=False)
+    spill.append(_rows(10, 11), to_block=12)
+    spill.append([], to_block=20)
+    sealed = spill.checkpoint()
+    spill.append(_rows(21), to_block=25)
+    spill.checkpoint()
+
+    # a crash in the middle of the next append leaves half a batch behind
+    spill.append(_rows(26, 27), to_block=30)
+    segment = max(tmp_path.iterdir())
+    segment.write_bytes(segment.read_bytes()[:-20])
+
+    restarted = ArrowSpillLog(tmp_path, SCHEMA)
+    assert restarted.replay(None) == (_rows(10, 11, 21), 25)
+    # the first file was committed, its segment not released yet
+    assert restarted.replay(11) == (_rows(21), 25)
+
+    restarted.release(sealed)
+    assert restarted.replay(11) == (_rows(21), 25)
+    restarted.release(restarted.checkpoint())
+    assert restarted.replay(None) == ([], None)
+    assert list(tmp_path.iterdir()) == []
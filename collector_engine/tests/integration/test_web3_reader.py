@@ -1,6 +1,7 @@
 import os
 import inspect
 import pytest
+import pytest_asyncio
 
 from collector_engine.app.infrastructure.adapters.evm.web3_reader import Web3EvmReader
 
@@ -29,3 +30,118 @@ async def test_web3_reader_latest_block_optional_rpc():
     reader = Web3EvmReader(url)
     blk = await reader.latest_block_number()
     assert isinstance(blk, int) and blk > 0
+
+
+def _fake_block(number: int) -> dict:
+    return {
+        "number": hex(number),
+        "hash": "0x" + f"{number:064x}",
+        "parentHash": "0x" + f"{max(number - 1, 0):064x}",
+        "timestamp": hex(1_700_000_000 + number),
+        "gasUsed": "0x5208",
+        "gasLimit": "0x1c9c380",
+        "baseFeePerGas": "0x3b9aca00",
+        "transactions": [],
+    }
+
+
+@pytest_asyncio.fixture
+async def batch_rpc_server():
+    """
+    Local JSON-RPC endpoint for eth_getBlockByNumber: answers batches in reverse order,
+    fails for block 13 in a batch.
+    """
+    from aiohttp import web
+    from aiohttp.test_utils import TestServer
+
+    payloads: list = []
+
+    async def handler(request):
+        payload = await request.json()
+        payloads.append(payload)
+        if isinstance(payload, dict):  # single call (web3 provider)
+            block = _fake_block(int(payload["params"][0], 16))
+            return web.json_response({"jsonrpc": "2.0", "id": payload["id"], "result": block})
+        out = []
+        for req in reversed(payload):
+            number = int(req["params"][0], 16)
+            if number == 13:
+                error = {"code": -32000, "message": "boom"}
+                out.append({"jsonrpc": "2.0", "id": req["id"], "error": error})
+            else:
+                out.append({"jsonrpc": "2.0", "id": req["id"], "result": _fake_block(number)})
+        return web.json_response(out)
+
+    app = web.Application()
+    app.router.add_post("/", handler)
+    server = TestServer(app)
+    await server.start_server()
+    yield str(server.make_url("/")), payloads
+    await server.close()
+
+
+@pytest.mark.asyncio
+async def test_web3_reader_batched_blocks_range(batch_rpc_server):
+    url, payloads = batch_rpc_server
+    reader = Web3EvmReader(url, batch_size=4, max_batches_in_flight=2)
+
+    blocks = await reader.get_blocks_range(0, 9)
+    await reader.close()
+
+    assert [b["number"] for b in blocks] == list(range(10))
+    assert blocks[3]["timestamp"] == 1_700_000_003
+    assert [len(p) for p in payloads] == [4, 4, 2]
+
+
+@pytest.mark.asyncio
+async def test_web3_reader_batched_blocks_normalize_like_single_calls(batch_rpc_server):
+    from collector_engine.app.domain.pure.blocks_timestamps import block_to_row
+
+    url, _ = batch_rpc_server
+    reader = Web3EvmReader(url, batch_size=4)
+
+    batched = await reader.get_blocks_range(5, 7)
+    single = [await reader.get_block(n) for n in range(5, 8)]
+    await reader.close()
+
+    assert [block_to_row(1, b) for b in batched] == [block_to_row(1, b) for b in single]
+
+
+@pytest.mark.asyncio
+async def test_web3_reader_batched_keeps_partial_errors(batch_rpc_server):
+    from collector_engine.app.infrastructure.adapters.evm.jsonrpc import JsonRpcBatchError
+
+    url, _ = batch_rpc_server
+    reader = Web3EvmReader(url, batch_size=3)
+
+    with pytest.raises(JsonRpcBatchError) as exc:
+        await reader.get_blocks_range(10, 15)
+    await reader.close()
+
+    assert list(exc.value.errors) == [3]
+    assert exc.value.errors[3].code == -32000
+    assert exc.value.results[3] is None
+    assert [b["number"] for i, b in enumerate(exc.value.results) if i != 3] == [10, 11, 12, 14, 15]
+
+
+@pytest.mark.asyncio
+async def test_web3_reader_close_releases_http_sessions(batch_rpc_server, monkeypatch):
+    import aiohttp
+
+    sessions: list[aiohttp.ClientSession] = []
+    init = aiohttp.ClientSession.__init__
+
+    def recording_init(self, *args, **kwargs):
+        init(self, *args, **kwargs)
+        sessions.append(self)
+
+    monkeypatch.setattr(aiohttp.ClientSession, "__init__", recording_init)
+    url, _ = batch_rpc_server
+    reader = Web3EvmReader(url, batch_size=3)
+
+    await reader.get_block(5)  # web3 provider session
+    await reader.get_blocks_range(0, 2)  # batch client session
+    await reader.close()
+
+    assert len(sessions) == 2
+    assert all(s.closed for s in sessions)
@@ -0,0 +1,68 @@
+import pytest
+
+from collector_engine.app.domain.pure.block_window import (
+    AdaptiveBlockWindow,
+    is_result_limit_error,
+)
+
+
+def test_window_grows_while_responses_are_small():
+    window = AdaptiveBlockWindow(size=1000, max_size=5000, target_results=100)
+
+    window.on_success(blocks=1000, results=0)
+    assert window.size == 2000
+    window.on_success(blocks=2000, results=10)
+    assert window.size == 4000
+    window.on_success(blocks=4000, results=0)
+    assert window.size == 5000  # clamped to max_size
+
+
+def test_window_does_not_grow_on_truncated_range():
+    window = AdaptiveBlockWindow(size=1000, target_results=100)
+
+    window.on_success(blocks=10, results=0)  # last range before to_block
+
+    assert window.size == 1000
+
+
+def test_window_shrinks_proportionally_on_dense_response():
+    window = AdaptiveBlockWindow(size=1000, target_results=100)
+
+    window.on_success(blocks=1000, results=400)
+
+    assert window.size == 250
+
+
+def test_window_bisects_on_limit_error():
+    window = AdaptiveBlockWindow(size=1000, min_size=100)
+
+    window.on_limit_error(1000)
+    assert window.size == 500
+    window.on_limit_error(150)
+    assert window.size == 100
+    assert not window.can_shrink(100)
+
+
+def test_fixed_window():
+    window = AdaptiveBlockWindow(size=10, min_size=10, max_size=10)
+
+    window.on_success(blocks=10, results=0)
+
+    assert window.size == 10
+    assert window.range_from(5, 100) == (5, 14)
+    assert window.range_from(95, 100) == (95, 100)
+    assert not window.can_shrink(10)
+
+
+@pytest.mark.parametrize(
+    "message, expected",
+    [
+        ("{'code': -32005, 'message': 'query returned more than 10000 results'}", True),
+        ("Log response size exceeded. You can make eth_getLogs requests ...", True),
+        ("Too Many Results", True),
+        ("execution reverted", False),
+        ("429 Too Many Requests", False),
+    ],
+)
+def test_is_result_limit_error(message, expected):
+    assert is_result_limit_error(message) is expected
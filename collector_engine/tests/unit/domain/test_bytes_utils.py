@@ -1,3 +1,4 @@
+import pyarrow as pa
 import pytest
 
 from hexbytes import HexBytes
@@ -6,6 +7,7 @@ from collector_engine.app.domain.pure.bytes_utils import (
     b32_validate,
     b256_validate,
     to_bytes,
+    unique_binary_values,
 )
 
 FIELD = "block_hash"
@@ -95,3 +97,18 @@ def test_hex_to_bytes__success(input, expected):
 
     assert result == expected
     assert isinstance(result, bytes)
+
+
+@pytest.mark.parametrize("type_", [pa.binary(32), pa.binary()])
+def test_unique_binary_values(type_):
+    values = [b"\x02" * 32, None, b"\x01" * 32, b"\x02" * 32, b"\x03" * 32]
+    chunked = pa.chunked_array([pa.array(values[:2], type_), pa.array(values[2:], type_)])
+
+    assert unique_binary_values(chunked) == [b"\x02" * 32, b"\x01" * 32, b"\x03" * 32]
+    # sliced array: data buffer offset must be honoured
+    assert unique_binary_values(pa.array(values, type_).slice(2)) == [
+        b"\x01" * 32,
+        b"\x02" * 32,
+        b"\x03" * 32,
+    ]
+    assert unique_binary_values(pa.array([], type_)) == []
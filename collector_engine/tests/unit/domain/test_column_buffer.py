@@ -0,0 +1,130 @@
+from decimal import Decimal
+
+import pyarrow as pa
+import pytest
+
+from collector_engine.app.domain.pure.column_buffer import ColumnBuffer, _Column
+from collector_engine.app.infrastructure.parquet.schema import LOG_SCHEMA, TX_SCHEMA
+
+
+def _log_row(i: int) -> dict:
+    return {
+        "chain_id": 1,
+        "block_number": 100 + i,
+        "block_hash": bytes([i]) * 32,
+        "transaction_hash": bytes([i + 1]) * 32,
+        "log_index": i,
+        "address": b"\x11" * 20,
+        "topic0": b"\x00" * 32,
+        "topic1": None if i % 2 else bytes([i]) * 32,
+        "topic2": None,
+        "topic3": None,
+        "data": bytes(range(i)),
+        "removed": i == 2,
+    }
+
+
+def _tx_row(i: int) -> dict:
+    return {
+        "block_hash": b"\xaa" * 32,
+        "block_number": 100 + i,
+        "from": b"\x01" * 20,
+        "gas": 21_000,
+        "gas_price": Decimal(10**18 + i),
+        "max_fee_per_gas": None,
+        "max_priority_fee_per_gas": None,
+        "hash": bytes([i]) * 32,
+        "input": b"",
+        "nonce": i,
+        "to": None if i == 0 else b"\x02" * 20,
+        "transaction_index": i,
+        "value": Decimal(i),
+        "type": 2,
+        "chain_id": 1,
+        "v": 0,
+        "r": "0x" + "ab" * 32,
+        "s": "0x" + "cd" * 32,
+        "y_parity": None,
+        "access_list": [{"address": b"\x03" * 20, "storage_keys": [b"\x04" * 32]}],
+    }
+
+
+@pytest.mark.parametrize("schema,make_row", [(LOG_SCHEMA, _log_row), (TX_SCHEMA, _tx_row)])
+def test_column_buffer_matches_pa_array(schema, make_row):
+    rows = [make_row(i) for i in range(5)]
+    buffer = ColumnBuffer(schema)
+    buffer.extend(rows)
+
+    expected = pa.Table.from_pylist(rows, schema=schema)
+    table = buffer.to_table()
+    table.validate(full=True)
+
+    assert len(buffer) == 5
+    assert table.equals(expected)
+
+
+def test_column_buffer_tracks_bytes():
+    buffer = ColumnBuffer(LOG_SCHEMA)
+    empty = buffer.nbytes
+
+    buffer.extend([_log_row(3)])
+
+    # ints 4 + 8 + 4, hashes 32 * 2, address 20, topics 32 * 4 (+ 3 null masks),
+    # data 3 + one int32 offset, removed 1
+    assert buffer.nbytes - empty == 16 + 64 + 20 + 128 + 3 + 7 + 1
+
+
+def test_column_buffer_rejects_invalid_values():
+    buffer = ColumnBuffer(pa.schema([pa.field("hash", pa.binary(32), nullable=False)]))
+
+    with pytest.raises(ValueError, match="non-nullable"):
+        buffer.extend([{"hash": None}])
+    with pytest.raises(ValueError, match="expects 32 bytes"):
+        buffer.extend([{"hash": b"\x00" * 20}])
+
+
+def test_column_base_is_abstract():
+    with pytest.raises(TypeError):
+        _Column("x", pa.int64(), True)  # type: ignore[abstract]
+
+
+@pytest.mark.parametrize(
+    "bad",
+    [
+        {"hash": b"\x00" * 20},  # wrong width, after the other columns were appended
+        {"hash": None},  # None in a non-nullable column
+        {},  # missing field
+    ],
+)
+def test_column_buffer_rolls_back_failed_rows(bad):
+    schema = pa.schema(
+        [
+            pa.field("block_number", pa.int64(), nullable=False),
+            pa.field("data", pa.binary()),
+            pa.field("topic1", pa.binary(32)),
+            pa.field("gas_price", pa.decimal128(38, 0)),
+            pa.field("hash", pa.binary(32), nullable=False),
+        ]
+    )
+    good = {
+        "block_number": 1,
+        "data": b"\x01\x02",
+        "topic1": None,
+        "gas_price": Decimal(7),
+        "hash": b"\xaa" * 32,
+    }
+    buffer = ColumnBuffer(schema)
+    buffer.extend([good])
+    expected = ColumnBuffer(schema)
+    expected.extend([good, good])
+
+    with pytest.raises((ValueError, KeyError)):
+        row = {**good, "data": b"\xff" * 9, "topic1": b"\x00" * 32, "gas_price": Decimal(1)}
+        del row["hash"]
+        buffer.extend([good, {**row, **bad}])
+
+    assert len(buffer) == 2
+    assert buffer.nbytes == expected.nbytes
+    table = buffer.to_table()
+    table.validate(full=True)
+    assert table.equals(pa.Table.from_pylist([good, good], schema=schema))
@@ -0,0 +1,42 @@
+import pyarrow as pa
+
+from collector_engine.app.domain.pure.derived_files import (
+    derived_by_input,
+    hashes_by_block,
+    pending_inputs,
+)
+
+LOGS = ["logs_100_199.parquet", "logs_200_250.parquet", "logs_300_300.parquet"]
+
+
+def test_derived_files_are_paired_by_range():
+    txs = [
+        "txs_150_199.parquet",
+        "txs_100_149.parquet",
+        "txs_200_220.parquet",
+        "txs_190_210.parquet",  # crosses two logs files: belongs to none
+    ]
+
+    assert derived_by_input(LOGS, "logs", txs, "txs") == {
+        "logs_100_199.parquet": ["txs_100_149.parquet", "txs_150_199.parquet"],
+        "logs_200_250.parquet": ["txs_200_220.parquet"],
+        "logs_300_300.parquet": [],
+    }
+    # complete once a piece ends at the input's TO block, else resume after the last one
+    assert pending_inputs(LOGS, "logs", txs, "txs") == [
+        ("logs_200_250.parquet", 220),
+        ("logs_300_300.parquet", None),
+    ]
+
+
+def test_hashes_by_block_keeps_block_order_and_skips_derived_blocks():
+    h = [bytes([i]) * 32 for i in range(4)]
+    table = pa.table(
+        {
+            "block_number": pa.array([7, 5, 5, 7, 9], pa.int64()),
+            "transaction_hash": pa.array([h[2], h[0], h[1], h[2], h[3]], pa.binary(32)),
+        }
+    )
+
+    assert hashes_by_block(table, "transaction_hash") == (h, [5, 5, 7, 9])
+    assert hashes_by_block(table, "transaction_hash", after=5) == ([h[2], h[3]], [7, 9])
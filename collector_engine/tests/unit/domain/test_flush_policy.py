@@ -0,0 +1,36 @@
+import pyarrow as pa
+import pytest
+
+from collector_engine.app.domain.pure.column_buffer import ColumnBuffer
+from collector_engine.app.domain.pure.flush_policy import ROWS_ONLY, FlushPolicy
+
+SCHEMA = pa.schema([("block_number", pa.int64()), ("data", pa.binary())])
+
+
+def _buffer(rows: int, data_size: int) -> ColumnBuffer:
+    buffer = ColumnBuffer(SCHEMA)
+    buffer.extend({"block_number": i, "data": b"\x00" * data_size} for i in range(rows))
+    return buffer
+
+
+def test_flush_policy_thresholds():
+    small, dense = _buffer(10, 8), _buffer(10, 1000)  # ~200 B vs ~10 KB
+
+    assert not FlushPolicy().should_flush(ColumnBuffer(SCHEMA), rows_per_file=0)
+    assert FlushPolicy().should_flush(small, rows_per_file=10)  # rows stay a cap
+
+    by_buffer = FlushPolicy(max_buffer_bytes=5000, target_file_bytes=None)
+    assert by_buffer.should_flush(dense, rows_per_file=100)
+    assert not by_buffer.should_flush(small, rows_per_file=100)
+
+    by_file = FlushPolicy(max_buffer_bytes=None, target_file_bytes=2000, encoded_ratio=0.25)
+    assert by_file.estimated_file_bytes(dense) == int(dense.nbytes * 0.25)
+    assert by_file.should_flush(dense, rows_per_file=100)
+    assert not by_file.should_flush(small, rows_per_file=100)
+
+    assert not ROWS_ONLY.should_flush(dense, rows_per_file=100)
+
+
+def test_flush_policy_rejects_invalid_ratio():
+    with pytest.raises(ValueError, match="encoded_ratio"):
+        FlushPolicy(encoded_ratio=0)
@@ -0,0 +1,38 @@
+from collector_engine.app.domain.pure.load_plan import (
+    group_files,
+    partition_starts,
+    split_attachable,
+)
+
+
+def test_group_files_one_file_per_group_by_default():
+    assert group_files([10, 20, 30], target_bytes=0) == [[0], [1], [2]]
+    assert group_files([], target_bytes=0) == []
+
+
+def test_group_files_closes_groups_at_target_bytes():
+    sizes = [40, 30, 50, 200, 10, 5]
+
+    assert group_files(sizes, target_bytes=100) == [[0, 1, 2], [3], [4, 5]]
+
+
+def test_partition_starts():
+    assert partition_starts(1_500, 3_200, width=1_000) == [1_000, 2_000, 3_000]
+    assert partition_starts(2_000, 2_999, width=1_000) == [2_000]
+
+
+def test_split_attachable_keeps_new_single_partition_files():
+    ranges = [
+        (1, 0, 499),  # partition 0 exists
+        (1, 1_000, 1_499),  # new partition 1000
+        (1, 1_500, 1_999),
+        (1, 2_900, 3_100),  # spans two partitions
+        (8453, 1_000, 1_999),  # same range, other chain
+        (8453, 2_000, 2_499),  # new partition, but reached by the next file
+        (8453, 2_900, 3_100),
+    ]
+
+    attachable, others = split_attachable(ranges, width=1_000, existing={(1, 0)})
+
+    assert attachable == {(1, 1_000): [1, 2], (8453, 1_000): [4]}
+    assert others == [0, 3, 5, 6]